@@ -0,0 +1,148 @@
+"""
+Měření výkonu hlavních operací ligy na syntetických ligách rostoucí velikosti.
+
+Spuštění z kořene repozitáře:
+    python -m benchmarks.bench_league --output bench.json
+    python -m benchmarks.bench_league --quick --compare bench.json
+
+Výsledky se zapisují jako JSON (jeden záznam na operaci a velikost ligy), aby šlo porovnávat verze.
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from liga import LeagueEngine, calculate_player_stats, generate_swiss_pairings, load_league, save_league
+from liga.standings import Standings
+from liga.synthetic import generate_league
+
+# (počet hráčů, počet hracích dnů)
+SIZES = [(50, 50), (100, 250), (200, 1000), (500, 2000)]
+QUICK_SIZES = [(30, 20), (100, 100)]
+HISTORY_PAGE_SIZE = 10
+
+
+def measure(fn, repeats):
+    """Časy opakovaných běhů funkce v sekundách"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def leaderboard_frame(players):
+    """Tabulka z nuly, tak jak ji staví stránka Průběžná tabulka"""
+    return Standings(players).frame()
+
+
+def history_page(engine):
+    """Příprava jedné stránky historie: filtr a seřazené tabulky zobrazených dnů (bez cache)"""
+    history = engine.history
+    found = history.find_sessions()
+    return [history.session_frame(i).sort_values('Zisk', ascending=False) for i in found[:HISTORY_PAGE_SIZE]]
+
+
+def round_trip(league):
+    """Uložení a opětovné načtení ligového souboru"""
+    raw = save_league(league['league_name'], league['vklad'], league['players'], league['sessions'])
+    return load_league(io.StringIO(raw))
+
+
+def engine_round_trip(engine):
+    """Serializace enginu a proudové načtení zpět"""
+    return LeagueEngine.from_file(io.BytesIO(engine.to_json().encode('utf-8')))
+
+
+def benchmarks_for(league, engine):
+    """Měřené operace pro jednu ligu: {název: funkce bez argumentů}"""
+    players = league['players']
+    return {
+        'generate_swiss_pairings': lambda: generate_swiss_pairings(players, 3, engine.pair_history),
+        'calculate_player_stats': lambda: calculate_player_stats(players),
+        'leaderboard_frame': lambda: leaderboard_frame(players),
+        'history_page': lambda: history_page(engine),
+        'save_load_round_trip': lambda: round_trip(league),
+        'engine_round_trip': lambda: engine_round_trip(engine),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeats, only=None):
+    """Spustí měření pro všechny velikosti, vrací seznam záznamů"""
+    records = []
+    for num_players, num_days in sizes:
+        league = generate_league(num_players, num_days)
+        engine = LeagueEngine.from_file(io.StringIO(json.dumps(league, ensure_ascii=False)))
+        for name, fn in benchmarks_for(league, engine).items():
+            if only and name not in only:
+                continue
+            times = measure(fn, repeats)
+            records.append({
+                'benchmark': name,
+                'players': num_players,
+                'days': num_days,
+                'repeats': repeats,
+                'min_s': min(times),
+                'median_s': statistics.median(times),
+            })
+            print(f"{name:<26} {num_players:>5} hráčů {num_days:>6} dní  "
+                  f"min {min(times) * 1000:9.2f} ms  medián {statistics.median(times) * 1000:9.2f} ms")
+    return records
+
+
+def compare(records, baseline_path):
+    """Vypíše poměr mediánů proti dřívějšímu výsledku (> 1 = pomalejší)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {
+            (r['benchmark'], r['players'], r['days']): r['median_s'] for r in json.load(f)['results']
+        }
+    for r in records:
+        before = baseline.get((r['benchmark'], r['players'], r['days']))
+        if before:
+            print(f"{r['benchmark']:<26} {r['players']:>5} hráčů {r['days']:>6} dní  "
+                  f"{r['median_s'] / before:6.2f}× proti {baseline_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Měření výkonu Mariášové ligy")
+    parser.add_argument('--output', help="soubor pro výsledky v JSON")
+    parser.add_argument('--repeats', type=int, default=5, help="počet opakování každého měření")
+    parser.add_argument('--quick', action='store_true', help="jen malé ligy")
+    parser.add_argument('--only', nargs='*', help="měřit jen vybrané operace")
+    parser.add_argument('--compare', help="dřívější JSON výsledek pro porovnání")
+    args = parser.parse_args(argv)
+
+    records = run(QUICK_SIZES if args.quick else SIZES, args.repeats, args.only)
+    if args.compare:
+        compare(records, args.compare)
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'results': records,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""Headless jádro Mariášové ligy – lze importovat bez streamlitu."""
+
+from liga.engine import (
+    LeagueBase,
+    LeagueEngine,
+    calculate_player_stats,
+    save_league,
+    load_league,
+)
+from liga.database import ConcurrentUpdateError, DatabaseLeague, LeagueDatabase
+from liga.journal import Journal, JournalInUseError
+from liga.loader import LeagueFileError, stream_league
+from liga.pairing import PairHistory, generate_swiss_pairings
+from liga.rating import Ratings
+
+__all__ = [
+    'ConcurrentUpdateError',
+    'DatabaseLeague',
+    'LeagueBase',
+    'LeagueEngine',
+    'Journal',
+    'JournalInUseError',
+    'LeagueDatabase',
+    'LeagueFileError',
+    'PairHistory',
+    'Ratings',
+    'calculate_player_stats',
+    'generate_swiss_pairings',
+    'save_league',
+    'load_league',
+    'stream_league',
+]
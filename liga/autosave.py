@@ -0,0 +1,175 @@
+"""
+Automatické ukládání ligy na pozadí.
+
+Překreslení stránky jen předá levný snímek stavu (LeagueEngine.snapshot) a hned pokračuje; serializace
+i zápis na disk proběhnou ve vlákně. Série rychlých změn se sloučí do jednoho zápisu: zapisuje se až po
+AUTOSAVE_DELAY sekundách bez další změny (nejpozději po AUTOSAVE_MAX_DELAY). Soubor se zapisuje do
+dočasného souboru, který se atomicky přejmenuje, takže na disku je vždy celý ligový soubor.
+
+Každá relace prohlížeče má v adresáři záloh vlastní soubor (klíč relace), takže si relace s různými ligami
+zálohy nepřepisují. Z neaktivních relací se ponechá jen AUTOSAVE_KEEP nejnovějších záloh; záloha relace,
+která ukládala v posledních AUTOSAVE_ACTIVE_WINDOW sekundách, se nemaže nikdy.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from liga.engine import league_to_dict
+from liga.loader import LeagueFileError, peek_league_name
+
+AUTOSAVE_DELAY = 2.0
+AUTOSAVE_MAX_DELAY = 10.0  # Ani při nepřetržitých změnách se zápis neodkládá déle
+AUTOSAVE_KEEP = 10
+AUTOSAVE_ACTIVE_WINDOW = 24 * 3600.0  # Jak dlouho po posledním uložení se relace považuje za živou
+AUTOSAVE_SUFFIX = '.json'
+
+
+def snapshot_to_json(snapshot):
+    """Ligový soubor (stejný formát jako save_league) ze snímku LeagueEngine.snapshot"""
+    sessions = list(snapshot['history'].iter_sessions())
+    return json.dumps(
+        league_to_dict(snapshot['league_name'], snapshot['vklad'], snapshot['players'], sessions),
+        ensure_ascii=False
+    )
+
+
+def write_atomic(path, text):
+    """Zapíše text do dočasného souboru a atomicky jím nahradí path"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def list_backups(directory):
+    """Zálohy v adresáři od nejnovější: [{'path', 'saved_at' (datetime), 'league_name'}]"""
+    if not os.path.isdir(directory):
+        return []
+    backups = []
+    for name in os.listdir(directory):
+        if not name.endswith(AUTOSAVE_SUFFIX):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            saved_at = datetime.fromtimestamp(os.path.getmtime(path))
+            with open(path, 'rb') as f:
+                league_name = peek_league_name(f)
+        except (OSError, LeagueFileError):
+            continue
+        backups.append({'path': path, 'saved_at': saved_at, 'league_name': league_name})
+    backups.sort(key=lambda backup: backup['saved_at'], reverse=True)
+    return backups
+
+
+class Autosaver:
+    """
+    Vlákno, které ukládá poslední předaný snímek ligy každé relace do jejího souboru v adresáři directory
+    schedule() nikdy nečeká na disk; starší snímky, které se nestihly zapsat, se přeskočí.
+    """
+
+    def __init__(self, directory, delay=AUTOSAVE_DELAY, max_delay=AUTOSAVE_MAX_DELAY, keep=AUTOSAVE_KEEP,
+                 active_window=AUTOSAVE_ACTIVE_WINDOW):
+        self.directory = directory
+        self.delay = delay
+        self.max_delay = max_delay
+        self.keep = keep
+        self.active_window = active_window
+        self._last_saved = {}  # {klíč: kdy relace naposledy uložila} (time.monotonic)
+        self.saved_versions = {}  # {klíč: verze ligy v posledním zapsaném snímku}
+        self.errors = {}  # {klíč: poslední chyba zápisu} – vlákno kvůli chybě neskončí
+        self._cond = threading.Condition()
+        self._pending = {}  # {klíč: [snímek, první nezapsaná změna, poslední změna]} (time.monotonic)
+        self._writing = False
+        self._closed = False
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='liga-autosave', daemon=True)
+        self._thread.start()
+
+    def path(self, key):
+        """Soubor zálohy relace s klíčem key"""
+        return os.path.join(self.directory, key + AUTOSAVE_SUFFIX)
+
+    def schedule(self, key, snapshot):
+        """Předá snímek relace key k uložení – jen ho odloží a probudí vlákno"""
+        with self._cond:
+            now = time.monotonic()
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [snapshot, now, now]
+            else:
+                entry[0], entry[2] = snapshot, now
+            self._cond.notify()
+
+    def _due(self, entry):
+        """Čas, kdy se má čekající snímek zapsat"""
+        return 0 if self._closed else min(entry[2] + self.delay, entry[1] + self.max_delay)
+
+    def _next(self):
+        """Počká na snímek, který je na řadě; vrací (klíč, snímek), nebo None po close()"""
+        with self._cond:
+            while True:
+                if self._pending:
+                    key, entry = min(self._pending.items(), key=lambda item: self._due(item[1]))
+                    wait = self._due(entry) - time.monotonic()
+                    if wait <= 0:
+                        del self._pending[key]
+                        self._writing = True
+                        return key, entry[0]
+                elif self._closed:
+                    return None
+                self._cond.wait(wait if self._pending else None)
+
+    def _run(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            key, snapshot = job
+            try:
+                write_atomic(self.path(key), snapshot_to_json(snapshot))
+                self.saved_versions[key] = snapshot['version']
+                self._last_saved[key] = time.monotonic()
+                self.errors.pop(key, None)
+                self._prune()
+            except Exception as e:  # Chyba disku nesmí ukončit vlákno, zkusí se to při další změně
+                self.errors[key] = e
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _prune(self):
+        """Smaže nejstarší zálohy nad limit keep – kromě záloh relací, které nedávno ukládaly"""
+        now = time.monotonic()
+        for key, saved_at in list(self._last_saved.items()):
+            if now - saved_at >= self.active_window:
+                del self._last_saved[key]
+        active = {self.path(key) for key in self._last_saved}
+        for backup in list_backups(self.directory)[self.keep:]:
+            if backup['path'] in active:
+                continue
+            try:
+                os.remove(backup['path'])
+            except OSError:
+                pass
+
+    def flush(self, timeout=None):
+        """Zapíše čekající snímky hned a počká na dokončení (např. v testech nebo při ukončení)"""
+        with self._cond:
+            past = time.monotonic() - self.max_delay
+            for entry in self._pending.values():
+                entry[1] = entry[2] = past
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def close(self):
+        """Zapíše čekající snímky a ukončí vlákno"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
@@ -0,0 +1,182 @@
+"""
+Hromadný import odehraných hracích dnů z CSV nebo JSON (např. přepsané papírové výsledky).
+
+Všechny řádky se načtou do jedné ploché tabulky a zkontrolují se najednou, vektorově přes všechny dny:
+úplnost a čísla, hráč nejvýš jednou v kole, jeden vklad za den a vyrovnané vklady u každého stolu.
+Chyby se hlásí všechny najednou a liga se změní, jen když je import bez chyb.
+"""
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from liga.export import CSV_ENCODING
+from liga.loader import LeagueFileError
+
+REQUIRED_COLUMNS = ['Datum', 'Stůl', 'Hráč', 'Na stole', 'Dokup']
+# Volitelné: Zisk (jinak se dopočítá z vkladu), Kolo (výchozí 1), Hrací den (jinak jeden den na datum)
+NUMBER_COLUMNS = ['Stůl', 'Kolo', 'Na stole', 'Dokup', 'Zisk']
+IMPORT_COLUMNS = ['Den', 'Datum', 'Hráč', 'Stůl', 'Kolo', 'Na stole', 'Dokup', 'Zisk']
+SOURCE_COLUMN = '_zdroj'  # Popis místa v souboru pro chybová hlášení
+
+
+def read_csv(path, encoding=None):
+    """
+    Řádky výsledků z CSV (stejné sloupce jako export "Všechny výsledky")
+    Bez zadaného kódování se zkusí UTF-8 a pak cp1250 (CSV z českého Excelu); oddělovač ; nebo , se pozná
+    z hlavičky.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    for candidate in ([encoding] if encoding else ['utf-8-sig', CSV_ENCODING]):
+        try:
+            text = raw.decode(candidate)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise LeagueFileError("Soubor není v kódování UTF-8 ani cp1250")
+    header = text.split('\n', 1)[0]
+    separator = ';' if header.count(';') >= header.count(',') else ','
+    frame = pd.read_csv(io.StringIO(text), sep=separator, dtype={'Hráč': str, 'Datum': str}, skipinitialspace=True)
+    frame[SOURCE_COLUMN] = [f"řádek {line}" for line in range(2, len(frame) + 2)]
+    return frame
+
+
+def read_json(path):
+    """Řádky výsledků z JSON – ligový soubor (bere se jen 'sessions') nebo seznam hracích dnů"""
+    with open(path, encoding='utf-8-sig') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise LeagueFileError(f"Neplatný JSON: {e}") from None
+    sessions = data.get('sessions') if isinstance(data, dict) else data
+    if not isinstance(sessions, list):
+        raise LeagueFileError("JSON musí být ligový soubor nebo seznam hracích dnů")
+
+    rows = []
+    for index, session in enumerate(sessions):
+        if not isinstance(session, dict) or not isinstance(session.get('results'), list):
+            raise LeagueFileError(f"Hrací den {index + 1}: chybí datum nebo výsledky")
+        for result in session['results']:
+            if not isinstance(result, dict):
+                raise LeagueFileError(f"Hrací den {index + 1}: neplatný řádek výsledku {result!r}")
+            rows.append(dict(result, **{
+                'Datum': session.get('date'), 'Hrací den': index + 1, SOURCE_COLUMN: f"hrací den {index + 1}"
+            }))
+    return pd.DataFrame(rows, columns=None if rows else REQUIRED_COLUMNS + [SOURCE_COLUMN])
+
+
+def read_results(path, encoding=None):
+    """Načte řádky výsledků ze souboru .csv nebo .json"""
+    if str(path).lower().endswith('.json'):
+        return read_json(path)
+    return read_csv(path, encoding)
+
+
+def _parse_dates(values):
+    """Datum ve tvaru 2024-01-31 nebo 31.1.2024; neplatné hodnoty jsou NaT"""
+    text = values.astype(str).str.replace(' ', '', regex=False)
+    dates = pd.to_datetime(text, format='%Y-%m-%d', errors='coerce')
+    missing = dates.isna()
+    if missing.any():
+        dates[missing] = pd.to_datetime(text[missing], format='%d.%m.%Y', errors='coerce')
+    return dates
+
+
+def prepare_results(frame, vklad, not_before=None):
+    """
+    Zkontroluje všechny načtené řádky najednou a připraví je k importu
+    Chybí-li sloupec Zisk, dopočítá se z vkladu vklad. not_before: datum posledního hracího dne ligy –
+    importované dny musí navazovat, aby historie zůstala chronologická (Elo, vývoj v čase, vrácení dne).
+    Vrací (DataFrame se sloupci IMPORT_COLUMNS seřazený podle dnů, seznam chyb); při chybách je místo
+    DataFrame None.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing:
+        return None, [f"Chybí sloupce: {', '.join(missing)}"]
+    frame = frame.copy()
+    if SOURCE_COLUMN not in frame.columns:
+        frame[SOURCE_COLUMN] = [f"řádek {i + 1}" for i in range(len(frame))]
+    # Jednokolové dny kolo neuvádějí (i v souboru, kde jsou jiné dny vícekolové)
+    frame['Kolo'] = frame['Kolo'].fillna(1) if 'Kolo' in frame.columns else 1
+    has_zisk = 'Zisk' in frame.columns
+    errors = []
+
+    # Jednotlivé řádky: čísla, jména a data
+    for column in NUMBER_COLUMNS:
+        if column not in frame.columns:
+            continue
+        values = pd.to_numeric(frame[column], errors='coerce')
+        bad = values.isna() | (values != values.round())
+        if column != 'Zisk':
+            bad |= values < (1 if column in ('Stůl', 'Kolo') else 0)
+        errors.extend(f"{where}: neplatná hodnota ve sloupci {column}" for where in frame.loc[bad, SOURCE_COLUMN])
+        frame[column] = values.fillna(0).astype(np.int64)
+    frame['Hráč'] = frame['Hráč'].fillna('').astype(str).str.strip()
+    errors.extend(f"{where}: chybí jméno hráče" for where in frame.loc[frame['Hráč'] == '', SOURCE_COLUMN])
+    frame['Datum'] = _parse_dates(frame['Datum'])
+    errors.extend(f"{where}: neplatné datum" for where in frame.loc[frame['Datum'].isna(), SOURCE_COLUMN])
+    if errors:
+        return None, errors
+
+    # Hrací dny podle sloupce Hrací den, jinak jeden den na datum; dny se seřadí podle data
+    frame['_den'] = frame['Hrací den'] if 'Hrací den' in frame.columns else frame['Datum']
+    dates_per_day = frame.groupby('_den', sort=False)['Datum'].nunique()
+    errors.extend(f"Hrací den {key}: řádky s různými daty" for key in dates_per_day.index[dates_per_day > 1])
+    frame = frame.sort_values(['Datum', '_den'], kind='stable')
+    frame['Den'] = pd.factorize(frame['_den'])[0]
+    labels = frame.groupby('Den')['Datum'].first().dt.strftime('%Y-%m-%d')
+
+    def day_label(day):
+        return f"Hrací den {day + 1} ({labels[day]})"
+
+    if not_before is not None:
+        first_day = frame['Den'][frame['Datum'] < pd.Timestamp(not_before)].min()
+        if not pd.isna(first_day):
+            errors.append(
+                f"{day_label(first_day)} a další jsou starší než poslední hrací den ligy ({not_before}), "
+                "importovat lze jen navazující dny"
+            )
+
+    duplicated = frame.duplicated(['Den', 'Kolo', 'Hráč'])
+    errors.extend(
+        f"{day_label(day)}: hráč {player} je uveden vícekrát"
+        for day, player in frame.loc[duplicated, ['Den', 'Hráč']].drop_duplicates().itertuples(index=False)
+    )
+    rounds_per_table = frame.groupby(['Den', 'Stůl'])['Kolo'].nunique()
+    errors.extend(
+        f"{day_label(day)}: stůl {table} je uveden ve více kolech"
+        for day, table in rounds_per_table.index[rounds_per_table > 1]
+    )
+
+    # Vklady: jeden vklad za den a nulový součet zisků u každého stolu
+    if has_zisk:
+        day_vklad = (frame['Na stole'] - frame['Dokup'] - frame['Zisk']).groupby(frame['Den']).nunique()
+        errors.extend(f"{day_label(day)}: zisky neodpovídají jednomu vkladu" for day in day_vklad.index[day_vklad > 1])
+    else:
+        frame['Zisk'] = frame['Na stole'] - frame['Dokup'] - vklad
+    table_sums = frame.groupby(['Den', 'Stůl'])['Zisk'].sum()
+    errors.extend(
+        f"{day_label(day)}: nesedí vklady u stolu {table}: rozdíl {-total} Kč"
+        for (day, table), total in table_sums[table_sums != 0].items()
+    )
+
+    if errors:
+        return None, errors
+    return frame[IMPORT_COLUMNS].reset_index(drop=True), []
+
+
+def import_results(engine, prepared):
+    """Přidá zkontrolované dny (výstup prepare_results) do LeagueEngine jedním průchodem, vrací počet dnů"""
+    if not len(prepared):
+        return 0
+    days = prepared.groupby('Den', sort=True)
+    dates = days['Datum'].first().to_numpy().astype('datetime64[D]')
+    # Velikost skupiny dne = nejmenší stůl (přebývající hráči sedí u prvních stolů), jen 3 nebo 4
+    table_sizes = prepared.groupby(['Den', 'Stůl']).size()
+    group_sizes = table_sizes.groupby(level='Den').min().clip(3, 4).to_numpy()
+    engine.append_sessions(dates, group_sizes, prepared['Den'].to_numpy(), prepared)
+    return len(dates)
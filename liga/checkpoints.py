@@ -0,0 +1,80 @@
+"""
+Součty hráčů odvozené z historie hracích dnů s periodickými kontrolními body.
+
+Historie je jediný zdroj pravdy: celkový zisk a počet odehraných dní se počítají z řádků výsledků.
+Po každých CHECKPOINT_EVERY dnech se uloží kumulativní součty a ratingy (Elo závisí na pořadí dnů),
+takže oprava nebo vrácení hracího dne přepočítá jen dny od nejbližšího předchozího kontrolního bodu.
+"""
+
+import numpy as np
+
+CHECKPOINT_EVERY = 64
+
+
+def row_totals(store, rows, size):
+    """(zisk, počet dní) po id hráčů za řádky rows ze SessionStore; více kol je jeden den"""
+    player = store.column('player')[rows].astype(np.int64)
+    zisk = np.bincount(player, weights=store.column('zisk')[rows], minlength=size).astype(np.int64)
+    day_keys = np.unique(store.column('session')[rows].astype(np.int64) * size + player)
+    days = np.bincount(day_keys % size, minlength=size)
+    return zisk, days
+
+
+class Checkpoints:
+    """
+    Kumulativní součty (zisk, dny) a ratingy po dnech every, 2·every, ...
+    Ratingy (liga.rating.Ratings) patří enginu – kontrolní body je jen přehrávají a ukládají jejich stav.
+    """
+
+    def __init__(self, every=CHECKPOINT_EVERY):
+        self.every = every
+        self._points = []  # [(zisk, dny, ratingy)] po dnech every, 2·every, ...
+
+    def __len__(self):
+        return len(self._points)
+
+    @classmethod
+    def build(cls, store, ratings, every=CHECKPOINT_EVERY):
+        """Přehraje ratingy celé historie po úsecích a cestou uloží kontrolní body"""
+        checkpoints = cls(every)
+        checkpoints._replay_from(store, ratings, 0)
+        return checkpoints
+
+    def _replay_from(self, store, ratings, first_day):
+        """Přehraje dny od first_day (začátek úseku) do konce historie"""
+        for start in range(first_day, len(store), self.every):
+            end = min(start + self.every, len(store))
+            ratings.apply_rows(store, store.sessions_slice(start, end))
+            if end - start == self.every:
+                self._add_point(store, ratings, end)
+
+    def _add_point(self, store, ratings, num_days):
+        zisk, days = self.totals(store, num_days)
+        self._points.append((zisk, days, ratings.state()))
+
+    def totals(self, store, num_days=None):
+        """(zisk, počet dní) po id hráčů po prvních num_days dnech: nejbližší kontrolní bod + dny za ním"""
+        num_days = len(store) if num_days is None else num_days
+        size = max(len(store.names), 1)
+        k = min(num_days // self.every, len(self._points))
+        zisk, days = row_totals(store, store.sessions_slice(k * self.every, num_days), size)
+        if k:
+            point_zisk, point_days, _ = self._points[k - 1]
+            zisk[:len(point_zisk)] += point_zisk
+            days[:len(point_days)] += point_days
+        return zisk, days
+
+    def session_added(self, store, ratings):
+        """Po uložení dne (ratingy už jsou aktualizované) případně přidá kontrolní bod"""
+        if len(store) % self.every == 0 and len(store) // self.every > len(self._points):
+            self._add_point(store, ratings, len(store))
+
+    def rewind(self, store, ratings, session_idx):
+        """
+        Po změně dne session_idx v historii zahodí neplatné kontrolní body, vrátí ratingy
+        do nejbližšího předchozího bodu a přehraje jen dny od něj
+        """
+        k = min(session_idx // self.every, len(self._points))
+        del self._points[k:]
+        ratings.restore(self._points[k - 1][2] if k else None)
+        self._replay_from(store, ratings, k * self.every)
@@ -0,0 +1,698 @@
+"""
+Volitelné úložiště ligy v lokálním SQLite souboru, sdílené všemi relacemi prohlížeče.
+
+Na proces existuje jediné spojení (LeagueDatabase), každá relace prohlížeče nad ním má jen tenkou
+fasádu DatabaseLeague se stejným rozhraním jako LeagueEngine. Statistiky a historie jsou
+indexované dotazy, výsledky dotazů se sdílí mezi relacemi, dokud se liga nezmění.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from liga.engine import (
+    DEFAULT_LEAGUE_NAME,
+    DEFAULT_VKLAD,
+    RESULT_COLUMNS,
+    ROUND_COLUMN,
+    LeagueBase,
+    build_table_results,
+    league_to_dict,
+    table_balance,
+)
+from liga.export import EXPORT_COLUMNS
+from liga.headtohead import HeadToHead
+from liga.pairing import PairHistory
+from liga.rating import Ratings
+from liga.standings import STANDINGS_COLUMNS
+from liga.timeseries import TimeSeries
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    active INTEGER NOT NULL DEFAULT 1,
+    -- Posun celkového zisku a počtu dní oproti součtu z výsledků (hráč odebraný a znovu přidaný začíná od nuly)
+    base_zisk INTEGER NOT NULL DEFAULT 0,
+    base_dnu INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,  -- Index hracího dne od 0
+    date TEXT NOT NULL,
+    group_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    table_no INTEGER NOT NULL,  -- Číslo stolu v rámci dne (napříč koly)
+    na_stole INTEGER NOT NULL,
+    dokup INTEGER NOT NULL,
+    zisk INTEGER NOT NULL,
+    round_no INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (session_id, table_no, player_id)
+);
+-- Rozpracovaný hrací den sdílený všemi zařízeními (nejvýš jeden)
+CREATE TABLE IF NOT EXISTS open_session (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    date TEXT NOT NULL,
+    group_size INTEGER NOT NULL,
+    players TEXT NOT NULL,  -- JSON seznam přítomných hráčů
+    entering INTEGER NOT NULL DEFAULT 0  -- 1 = zadávají se výsledky
+);
+-- Stoly rozpracovaného dne; version se zvyšuje s každým zápisem (optimistické zamykání)
+CREATE TABLE IF NOT EXISTS table_entries (
+    table_no INTEGER PRIMARY KEY,
+    players TEXT NOT NULL,  -- JSON seznam hráčů u stolu
+    results TEXT,  -- JSON řádky výsledků stolu, NULL = zatím nezadáno
+    version INTEGER NOT NULL DEFAULT 0,
+    round_no INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS results_player ON results(player_id, zisk);
+CREATE INDEX IF NOT EXISTS results_table ON results(session_id, table_no);
+CREATE INDEX IF NOT EXISTS sessions_date ON sessions(date);
+"""
+
+STANDINGS_QUERY = """
+SELECT p.name,
+       p.base_zisk + COALESCE(SUM(r.zisk), 0) AS zisk,
+       p.base_dnu + COUNT(DISTINCT r.session_id) AS dny
+FROM players p LEFT JOIN results r ON r.player_id = p.id
+WHERE p.active = 1
+GROUP BY p.id
+ORDER BY zisk DESC, p.id
+"""
+
+
+class ConcurrentUpdateError(RuntimeError):
+    """Zápis vychází ze zastaralého stavu – mezitím data změnil někdo jiný"""
+
+
+class LeagueDatabase:
+    """Jedno SQLite spojení na proces, chráněné zámkem (streamlit obsluhuje relace v různých vláknech)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._lock = threading.RLock()
+        self._cache = {}  # {klíč: (verze, hodnota)} – sdílené výsledky dotazů
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+
+    def _migrate(self):
+        """Doplní kola do databáze založené před zavedením vícekolových dnů"""
+        if 'round_no' not in {row[1] for row in self._conn.execute('PRAGMA table_info(table_entries)')}:
+            self._conn.execute('ALTER TABLE table_entries ADD COLUMN round_no INTEGER NOT NULL DEFAULT 1')
+        if 'round_no' not in {row[1] for row in self._conn.execute('PRAGMA table_info(results)')}:
+            # Starý primární klíč (den, hráč) nepustí hráče do více kol – tabulka se přestaví
+            self._conn.executescript(
+                'BEGIN; ALTER TABLE results RENAME TO results_old; '
+                'DROP INDEX results_player; DROP INDEX results_table;'
+                + SCHEMA +
+                'INSERT INTO results(session_id, player_id, table_no, na_stole, dokup, zisk) '
+                'SELECT session_id, player_id, table_no, na_stole, dokup, zisk FROM results_old ORDER BY rowid; '
+                'DROP TABLE results_old; COMMIT;'
+            )
+
+    @contextmanager
+    def transaction(self):
+        """Zápisová transakce; na konci zvýší verzi ligy"""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute('BEGIN IMMEDIATE')
+            try:
+                yield cur
+                cur.execute(
+                    "INSERT INTO settings(key, value) VALUES ('version', '1') "
+                    "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                )
+                cur.execute('COMMIT')
+            except BaseException:
+                cur.execute('ROLLBACK')
+                raise
+
+    def query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def scalar(self, sql, params=()):
+        rows = self.query(sql, params)
+        return rows[0][0] if rows else None
+
+    def setting(self, key, default=None):
+        value = self.scalar('SELECT value FROM settings WHERE key = ?', (key,))
+        return json.loads(value) if value is not None else default
+
+    @property
+    def version(self):
+        return int(self.scalar("SELECT value FROM settings WHERE key = 'version'") or 0)
+
+    def cached(self, key, compute):
+        """Výsledek dotazu platný do další změny ligy (sdílený všemi relacemi)"""
+        version = self.version
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        value = compute()
+        self._cache[key] = (version, value)
+        return value
+
+
+class DatabaseHistory:
+    """Historie hracích dnů nad databází se stejným rozhraním, jaké UI používá u SessionStore"""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __len__(self):
+        return self._db.scalar('SELECT COUNT(*) FROM sessions')
+
+    @property
+    def names(self):
+        return [row[0] for row in self._db.query('SELECT name FROM players ORDER BY id')]
+
+    def date_range(self):
+        first, last = self._db.query('SELECT MIN(date), MAX(date) FROM sessions')[0]
+        if first is None:
+            return None, None
+        return date.fromisoformat(first), date.fromisoformat(last)
+
+    def find_sessions(self, date_from=None, date_to=None, player=None):
+        """Indexy hracích dnů (od nejnovějšího) podle rozsahu dat a hráče – indexovaný dotaz"""
+        sql, params = 'SELECT s.id FROM sessions s WHERE 1 = 1', []
+        if date_from is not None:
+            sql += ' AND s.date >= ?'
+            params.append(str(date_from))
+        if date_to is not None:
+            sql += ' AND s.date <= ?'
+            params.append(str(date_to))
+        if player is not None:
+            sql += (' AND EXISTS (SELECT 1 FROM results r JOIN players p ON p.id = r.player_id'
+                    ' WHERE r.session_id = s.id AND p.name = ?)')
+            params.append(player)
+        return [row[0] for row in self._db.query(sql + ' ORDER BY s.id DESC', params)]
+
+    def session_date(self, session_idx):
+        return self._db.scalar('SELECT date FROM sessions WHERE id = ?', (int(session_idx),))
+
+    def session_vklad(self, session_idx):
+        """Vklad, se kterým se hrál hrací den"""
+        return self._db.scalar('SELECT na_stole - dokup - zisk FROM results WHERE session_id = ? LIMIT 1',
+                               (int(session_idx),))
+
+    def session_size(self, session_idx):
+        return self._db.scalar('SELECT COUNT(DISTINCT player_id) FROM results WHERE session_id = ?',
+                               (int(session_idx),))
+
+    def session_frame(self, session_idx):
+        """Výsledky jednoho hracího dne v pořadí zadání (u vícekolového dne se sloupcem Kolo)"""
+        rows = self._db.query(
+            'SELECT p.name, r.na_stole, r.dokup, r.zisk, r.table_no, r.round_no FROM results r '
+            'JOIN players p ON p.id = r.player_id WHERE r.session_id = ? ORDER BY r.rowid',
+            (int(session_idx),)
+        )
+        frame = pd.DataFrame(rows, columns=RESULT_COLUMNS + [ROUND_COLUMN])
+        if not len(frame) or frame[ROUND_COLUMN].max() == 1:
+            frame = frame.drop(columns=ROUND_COLUMN)
+        return frame
+
+    def sorted_session_frame(self, session_idx):
+        """Výsledky dne seřazené podle zisku"""
+        return self._db.cached(
+            ('session', int(session_idx)),
+            lambda: self.session_frame(session_idx).sort_values('Zisk', ascending=False)
+        )
+
+    def iter_result_frames(self, chunk_rows):
+        """Plochá tabulka výsledků po dávkách – stránkování podle rowid, bez načtení celé tabulky"""
+        last_rowid = -1
+        while True:
+            rows = self._db.query(
+                'SELECT r.rowid, r.session_id + 1, r.round_no, s.date, r.table_no, p.name, r.na_stole, r.dokup, r.zisk '
+                'FROM results r JOIN sessions s ON s.id = r.session_id JOIN players p ON p.id = r.player_id '
+                'WHERE r.rowid > ? ORDER BY r.rowid LIMIT ?',
+                (last_rowid, chunk_rows)
+            )
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            frame = pd.DataFrame([row[1:] for row in rows], columns=EXPORT_COLUMNS)
+            frame['Datum'] = frame['Datum'].astype('datetime64[s]')
+            yield frame
+
+
+class DatabaseLeague(LeagueBase):
+    """
+    Fasáda ligy nad sdílenou databází pro jednu relaci prohlížeče
+    Rozpracovaný hrací den je také v databázi, takže výsledky jednotlivých stolů mohou zadávat různá zařízení.
+    """
+
+    journal = None
+
+    def __init__(self, db):
+        self.db = db
+        self.history = DatabaseHistory(db)
+
+    # --- Liga ---
+
+    @property
+    def league_name(self):
+        return self.db.setting('league_name', DEFAULT_LEAGUE_NAME)
+
+    @property
+    def vklad(self):
+        return self.db.setting('vklad', DEFAULT_VKLAD)
+
+    @property
+    def version(self):
+        return self.db.version
+
+    def set_settings(self, league_name=None, vklad=None):
+        """Změní název ligy nebo základní vklad"""
+        changes = {}
+        if league_name is not None and league_name != self.league_name:
+            changes['league_name'] = league_name
+        if vklad is not None and vklad != self.vklad:
+            changes['vklad'] = vklad
+        if changes:
+            with self.db.transaction() as cur:
+                cur.executemany(
+                    'INSERT INTO settings(key, value) VALUES (?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+                    [(key, json.dumps(value, ensure_ascii=False)) for key, value in changes.items()]
+                )
+        return bool(changes)
+
+    @staticmethod
+    def _clear(cur, league_name):
+        """Smaže obsah ligy v rámci běžící transakce"""
+        cur.execute('DELETE FROM results')
+        cur.execute('DELETE FROM sessions')
+        cur.execute('DELETE FROM players')
+        cur.execute('DELETE FROM open_session')
+        cur.execute('DELETE FROM table_entries')
+        cur.execute("DELETE FROM settings WHERE key != 'version'")
+        cur.execute("INSERT INTO settings(key, value) VALUES ('league_name', ?)",
+                    (json.dumps(league_name, ensure_ascii=False),))
+
+    def reset(self, league_name="Nová Mariášová Liga"):
+        """Založí novou prázdnou ligu"""
+        with self.db.transaction() as cur:
+            self._clear(cur, league_name)
+
+    def import_league(self, engine):
+        """Nahradí obsah databáze ligou z LeagueEngine (např. načtenou ze souboru)"""
+        store = engine.history
+        player_ids = store.column('player')
+        sums = np.bincount(player_ids, weights=store.column('zisk'), minlength=len(store.names)).astype(np.int64)
+        # Den se hráči počítá jednou, i když hrál více kol
+        num_ids = len(store.names) or 1
+        day_keys = np.unique(store.column('session').astype(np.int64) * num_ids + player_ids)
+        days = np.bincount(day_keys % num_ids, minlength=len(store.names))
+
+        names = list(store.names) + [name for name in engine.players if name not in store.ids]
+        player_rows = []
+        for pid, name in enumerate(names):
+            history_zisk = int(sums[pid]) if pid < len(store.names) else 0
+            history_dnu = int(days[pid]) if pid < len(store.names) else 0
+            data = engine.players.get(name)
+            if data is None:
+                player_rows.append((pid, name, 0, 0, 0))
+            else:
+                player_rows.append((pid, name, 1, data['celkovy_zisk'] - history_zisk, data['pocet_dnu'] - history_dnu))
+
+        with self.db.transaction() as cur:
+            self._clear(cur, engine.league_name)
+            cur.execute("INSERT OR REPLACE INTO settings(key, value) VALUES ('vklad', ?)", (json.dumps(engine.vklad),))
+            cur.executemany('INSERT INTO players(id, name, active, base_zisk, base_dnu) VALUES (?, ?, ?, ?, ?)',
+                            player_rows)
+            cur.executemany('INSERT INTO sessions(id, date, group_size) VALUES (?, ?, ?)',
+                            [(i, store.session_date(i), store.session_group_size(i)) for i in range(len(store))])
+            cur.executemany(
+                'INSERT INTO results(session_id, player_id, table_no, na_stole, dokup, zisk, round_no) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                zip(*(store.column(c).tolist()
+                      for c in ('session', 'player', 'table', 'na_stole', 'dokup', 'zisk', 'round')))
+            )
+
+    def to_dict(self):
+        """Liga jako slovník ve formátu ligového souboru"""
+        players = {
+            name: {'celkovy_zisk': stats['celkovy_zisk'], 'pocet_dnu': stats['pocet_dnu']}
+            for name, stats in self.player_stats().items()
+        }
+        sessions = {}
+        for session_id, session_date, group_size in self.db.query('SELECT id, date, group_size FROM sessions ORDER BY id'):
+            sessions[session_id] = {'date': session_date, 'players': [], 'group_size': group_size,
+                                    'pairings': [], 'results': []}
+        # Kolo se ukládá jen u vícekolových dnů
+        multi_round = dict(self.db.query(
+            'SELECT session_id, MAX(round_no) FROM results GROUP BY session_id HAVING MAX(round_no) > 1'
+        ))
+        for session_id, rounds in multi_round.items():
+            sessions[session_id]['rounds'] = rounds
+        rows = self.db.query(
+            'SELECT r.session_id, p.name, r.na_stole, r.dokup, r.zisk, r.table_no, r.round_no FROM results r '
+            'JOIN players p ON p.id = r.player_id ORDER BY r.session_id, r.rowid'
+        )
+        for session_id, name, na_stole, dokup, zisk, table_no, round_no in rows:
+            session = sessions[session_id]
+            result = dict(zip(RESULT_COLUMNS, (name, na_stole, dokup, zisk, table_no)))
+            if session_id in multi_round:
+                result[ROUND_COLUMN] = round_no
+            session['players'].append(name)
+            session['results'].append(result)
+            while len(session['pairings']) < table_no:
+                session['pairings'].append([])
+            session['pairings'][table_no - 1].append(name)
+        for session_id in multi_round:
+            sessions[session_id]['players'] = list(dict.fromkeys(sessions[session_id]['players']))
+        # Odebraní hráči s výsledky v historii zůstanou v souboru jako neaktivní
+        for name, zisk, dny in self.db.query(
+            'SELECT p.name, SUM(r.zisk), COUNT(DISTINCT r.session_id) FROM players p '
+            'JOIN results r ON r.player_id = p.id WHERE p.active = 0 GROUP BY p.id ORDER BY p.id'
+        ):
+            players[name] = {'celkovy_zisk': zisk, 'pocet_dnu': dny, 'aktivni': False}
+        return league_to_dict(self.league_name, self.vklad, players, list(sessions.values()))
+
+    def to_json(self):
+        """Serializuje ligu do JSON řetězce"""
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    # --- Hráči ---
+
+    def player_names(self):
+        """Jména aktivních hráčů v pořadí přidání"""
+        return [row[0] for row in self.db.query('SELECT name FROM players WHERE active = 1 ORDER BY id')]
+
+    def add_player(self, name):
+        """Přidá hráče (nebo vrátí dříve odebraného, opět od nuly), vyhodí ValueError, pokud už existuje"""
+        with self.db.transaction() as cur:
+            row = cur.execute('SELECT id, active FROM players WHERE name = ?', (name,)).fetchone()
+            if row is None:
+                cur.execute('INSERT INTO players(name) VALUES (?)', (name,))
+            elif row[1]:
+                raise ValueError(f"Hráč {name} již existuje")
+            else:
+                cur.execute(
+                    'UPDATE players SET active = 1, '
+                    'base_zisk = -(SELECT COALESCE(SUM(zisk), 0) FROM results WHERE player_id = ?), '
+                    'base_dnu = -(SELECT COUNT(DISTINCT session_id) FROM results WHERE player_id = ?) WHERE id = ?',
+                    (row[0], row[0], row[0])
+                )
+
+    def remove_player(self, name):
+        """
+        Odstraní hráče z ligy, jeho výsledky v historii zůstanou (hráč bez výsledků se smaže úplně)
+        Hráč rozlosovaný do rozpracovaného dne se jen deaktivuje, aby se jeho výsledky daly uložit.
+        """
+        with self.db.transaction() as cur:
+            cur.execute('UPDATE players SET active = 0 WHERE name = ?', (name,))
+            seated = cur.execute('SELECT players FROM open_session').fetchone()
+            if seated is None or name not in json.loads(seated[0]):
+                cur.execute(
+                    'DELETE FROM players WHERE name = ? '
+                    'AND NOT EXISTS (SELECT 1 FROM results WHERE player_id = players.id)',
+                    (name,)
+                )
+
+    def player_stats(self):
+        """Statistiky všech hráčů jedním agregačním dotazem"""
+        return {
+            name: {'celkovy_zisk': zisk, 'pocet_dnu': dny, 'prumer_zisk': zisk / dny if dny > 0 else 0}
+            for name, zisk, dny in self.db.query(STANDINGS_QUERY)
+        }
+
+    def standings_frame(self):
+        """Průběžná tabulka jako DataFrame, sdílená všemi relacemi do další změny ligy"""
+        def compute():
+            rows = self.db.query(STANDINGS_QUERY)
+            frame = pd.DataFrame(rows, columns=['Hráč', 'Celkový zisk', 'Počet dní'])
+            frame.insert(0, 'Pořadí', range(1, len(frame) + 1))
+            days = frame['Počet dní'].to_numpy()
+            frame['Průměrný zisk'] = np.where(
+                days > 0, (frame['Celkový zisk'] / np.maximum(days, 1)).round(2), 0.0
+            )
+            return frame[STANDINGS_COLUMNS]
+        return self.db.cached('standings', compute)
+
+    def cached(self, key, compute):
+        """Hodnota platná do další změny ligy, sdílená všemi relacemi"""
+        return self.db.cached(key, compute)
+
+    def ratings(self):
+        """Ratingy přehrané z tabulky výsledků, sdílené všemi relacemi do další změny ligy"""
+        def compute():
+            ids = {name: pid for pid, name in self.db.query('SELECT id, name FROM players')}
+            rows = self.db.query('SELECT session_id, player_id, table_no, zisk FROM results')
+            columns = np.array(rows, dtype=np.int64).reshape(-1, 4).T
+            return Ratings.from_rows(ids, *columns)
+        return self.db.cached('ratings', compute)
+
+    def zisk_samples(self):
+        """Zisky aktivních hráčů za hrací dny jedním dotazem"""
+        rows = self.db.query(
+            'SELECT p.name, SUM(r.zisk) FROM results r JOIN players p ON p.id = r.player_id '
+            'WHERE p.active = 1 GROUP BY p.id, r.session_id ORDER BY p.id, r.session_id'
+        )
+        samples = {}
+        for name, zisk in rows:
+            samples.setdefault(name, []).append(zisk)
+        return {name: np.array(values, dtype=np.int64) for name, values in samples.items()}
+
+    def timeseries(self):
+        """Vývoj zisku a pořadí sestavený z tabulky výsledků, sdílený do další změny ligy"""
+        def compute():
+            ids = {name: pid for pid, name in self.db.query('SELECT id, name FROM players')}
+            dates = np.array([row[0] for row in self.db.query('SELECT date FROM sessions ORDER BY id')],
+                             dtype='datetime64[D]')
+            rows = self.db.query('SELECT session_id, player_id, zisk FROM results')
+            session, player, zisk = np.array(rows, dtype=np.int64).reshape(-1, 3).T
+            return TimeSeries.from_rows(ids, dates, session, player, zisk)
+        return self.db.cached('timeseries', compute)
+
+    def head_to_head(self):
+        """Vzájemné výsledky dvojic sestavené z tabulky výsledků, sdílené do další změny ligy"""
+        def compute():
+            ids = {name: pid for pid, name in self.db.query('SELECT id, name FROM players')}
+            rows = self.db.query('SELECT session_id, player_id, table_no, zisk FROM results')
+            return HeadToHead.from_rows(ids, *np.array(rows, dtype=np.int64).reshape(-1, 4).T)
+        return self.db.cached('head_to_head', compute)
+
+    # --- Hrací den ---
+
+    def pairing_inputs(self, present_players, by_rating=False):
+        """Skóre i společné hry se načtou dotazem jen pro přítomné hráče"""
+        stats = self.player_stats()
+        present = list(present_players)
+        marks = ','.join('?' * len(present))
+        # Jen výsledky přítomných hráčů (index results_player), pak spojení podle stolu
+        pair_counts = self.db.query(
+            f'WITH present AS (SELECT id, name FROM players WHERE name IN ({marks})), '
+            f'played AS (SELECT r.session_id, r.table_no, present.id, present.name FROM results r '
+            f'JOIN present ON r.player_id = present.id) '
+            f'SELECT a.name, b.name, COUNT(*) FROM played a '
+            f'JOIN played b ON b.session_id = a.session_id AND b.table_no = a.table_no AND b.id > a.id '
+            f'GROUP BY a.id, b.id',
+            present
+        )
+        history = PairHistory.from_pair_counts(pair_counts)
+        seeds = self.ratings().seeds(present) if by_rating else None
+        return {p: stats[p] for p in present}, history, seeds
+
+    @staticmethod
+    def _insert_results(cur, session_idx, results):
+        """
+        Vloží řádky výsledků hracího dne v rámci běžící transakce
+        Id hráčů se dohledají předem – neznámé jméno vyhodí ValueError a transakce se vrátí, řádek se neztratí.
+        """
+        names = sorted({r['Hráč'] for r in results})
+        ids = dict(cur.execute(
+            f"SELECT name, id FROM players WHERE name IN ({','.join('?' * len(names))})", names
+        ).fetchall())
+        unknown = [name for name in names if name not in ids]
+        if unknown:
+            raise ValueError(f"Neznámý hráč {unknown[0]}")
+        cur.executemany(
+            'INSERT INTO results(session_id, player_id, table_no, na_stole, dokup, zisk, round_no) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(session_idx, ids[r['Hráč']], r['Stůl'], r['Na stole'], r['Dokup'], r['Zisk'], r.get(ROUND_COLUMN, 1))
+             for r in results]
+        )
+
+    @classmethod
+    def _insert_session(cls, cur, session_date, results, group_size):
+        """Vloží odehraný hrací den v rámci běžící transakce"""
+        session_idx = cur.execute('SELECT COALESCE(MAX(id) + 1, 0) FROM sessions').fetchone()[0]
+        cur.execute('INSERT INTO sessions(id, date, group_size) VALUES (?, ?, ?)',
+                    (session_idx, session_date, group_size))
+        cls._insert_results(cur, session_idx, results)
+        cls._close_open_session(cur)
+        return session_idx
+
+    @staticmethod
+    def _close_open_session(cur):
+        """Zruší rozpracovaný den; hráči odebraní během něj, kteří nemají žádné výsledky, se smažou"""
+        cur.execute('DELETE FROM open_session')
+        cur.execute('DELETE FROM table_entries')
+        cur.execute(
+            'DELETE FROM players WHERE active = 0 AND NOT EXISTS (SELECT 1 FROM results WHERE player_id = players.id)'
+        )
+
+    def record_session(self, session_date, results, group_size=3):
+        """Zapíše odehraný hrací den jednou transakcí"""
+        with self.db.transaction() as cur:
+            return self._insert_session(cur, session_date, results, group_size)
+
+    def edit_session(self, session_idx, results):
+        """Opraví výsledky odehraného hracího dne – součty se odvozují dotazem, stačí vyměnit řádky"""
+        with self.db.transaction() as cur:
+            cur.execute('DELETE FROM results WHERE session_id = ?', (int(session_idx),))
+            self._insert_results(cur, int(session_idx), results)
+
+    def undo_session(self, expected_idx=None):
+        """Vrátí (smaže) poslední uložený hrací den; expected_idx: den, který uživatel potvrdil ke smazání"""
+        with self.db.transaction() as cur:
+            session_idx = cur.execute('SELECT MAX(id) FROM sessions').fetchone()[0]
+            if session_idx is None:
+                raise ValueError("Žádný hrací den k vrácení")
+            if expected_idx is not None and session_idx != expected_idx:
+                raise ConcurrentUpdateError("Poslední hrací den se mezitím změnil, nic se nesmazalo")
+            cur.execute('DELETE FROM results WHERE session_id = ?', (session_idx,))
+            cur.execute('DELETE FROM sessions WHERE id = ?', (session_idx,))
+
+    # --- Sdílený rozpracovaný hrací den ---
+
+    @property
+    def current_session(self):
+        """Rozpracovaný hrací den ve stejném tvaru jako u LeagueEngine (nebo None)"""
+        row = self.db.query('SELECT date, group_size, players, entering FROM open_session')
+        if not row:
+            return None
+        session_date, group_size, players, entering = row[0]
+        tables = self.db.query('SELECT players, round_no FROM table_entries ORDER BY table_no')
+        return {
+            'date': session_date,
+            'players': json.loads(players),
+            'group_size': group_size,
+            'pairings': [json.loads(table) for table, _ in tables],
+            'table_rounds': [round_no for _, round_no in tables],
+            'results': {} if entering else None
+        }
+
+    @current_session.setter
+    def current_session(self, session):
+        """
+        Nové rozlosování nahradí rozpracovaný den pro všechna zařízení
+        Má-li rozpracovaný den už zadané stoly, vyhodí ConcurrentUpdateError – zahodit je jde jen výslovně
+        přes discard_session.
+        """
+        with self.db.transaction() as cur:
+            submitted = cur.execute('SELECT COUNT(*) FROM table_entries WHERE results IS NOT NULL').fetchone()[0]
+            if session is not None and submitted:
+                raise ConcurrentUpdateError(
+                    f"Rozpracovaný hrací den už má zadané výsledky stolů ({submitted}), nové rozlosování by je přepsalo"
+                )
+            self._close_open_session(cur)
+            if session is not None:
+                cur.execute(
+                    'INSERT INTO open_session(id, date, group_size, players, entering) VALUES (1, ?, ?, ?, ?)',
+                    (session['date'], session['group_size'], json.dumps(session['players'], ensure_ascii=False),
+                     int(session['results'] is not None))
+                )
+                table_rounds = session.get('table_rounds') or [1] * len(session['pairings'])
+                cur.executemany(
+                    'INSERT INTO table_entries(table_no, players, round_no) VALUES (?, ?, ?)',
+                    [(i + 1, json.dumps(table, ensure_ascii=False), round_no)
+                     for i, (table, round_no) in enumerate(zip(session['pairings'], table_rounds))]
+                )
+
+    def discard_session(self, version=None):
+        """
+        Zahodí rozpracovaný hrací den i se zadanými stoly (po výslovném potvrzení)
+        version: verze ligy, kterou uživatel potvrzoval – pokud se liga mezitím změnila (např. někdo zadal další
+        stůl), vyhodí ConcurrentUpdateError a nic nezahodí
+        """
+        with self.db.transaction() as cur:
+            if version is not None and self.db.version != version:
+                raise ConcurrentUpdateError("Rozpracovaný hrací den se mezitím změnil")
+            self._close_open_session(cur)
+
+    def open_results(self):
+        """Přepne rozpracovaný hrací den do režimu zadávání výsledků"""
+        with self.db.transaction() as cur:
+            cur.execute('UPDATE open_session SET entering = 1')
+
+    def commit_session(self, all_results):
+        """Uloží výsledky celého dne najednou; selže, pokud den mezitím uložil někdo jiný"""
+        with self.db.transaction() as cur:
+            row = cur.execute('SELECT date, group_size FROM open_session WHERE entering = 1').fetchone()
+            if row is None:
+                raise ConcurrentUpdateError("Hrací den už mezitím uložil někdo jiný")
+            return self._insert_session(cur, row[0], all_results, row[1])
+
+    def table_states(self):
+        """Stav stolů rozpracovaného dne: [{'table', 'round', 'players', 'results', 'version'}]"""
+        return [
+            {
+                'table': table_no,
+                'round': round_no,
+                'players': json.loads(players),
+                'results': json.loads(results) if results is not None else None,
+                'version': version
+            }
+            for table_no, round_no, players, results, version in self.db.query(
+                'SELECT table_no, round_no, players, results, version FROM table_entries ORDER BY table_no'
+            )
+        ]
+
+    def submit_table(self, table_no, entries, version):
+        """
+        Zapíše výsledky jednoho stolu z libovolného zařízení
+        entries: seznam trojic (hráč, na_stole, dokup); version: verze stolu, ze které zařízení vycházelo.
+        Stůl se kontroluje samostatně (ValueError při nesouhlasu vkladů), souběžný zápis do stejného stolu
+        vyhodí ConcurrentUpdateError. Jakmile jsou zadané všechny stoly, hrací den se sám uloží.
+        Vrací index uloženého hracího dne, nebo None, pokud ještě chybí další stoly.
+        """
+        vklad = self.vklad
+        results = build_table_results(table_no - 1, entries, vklad)
+        diff = table_balance(results, vklad)
+        if diff != 0:
+            raise ValueError(f"Nesedí vklady u stolu {table_no}: rozdíl {diff} Kč")
+
+        with self.db.transaction() as cur:
+            row = cur.execute('SELECT players, round_no FROM table_entries WHERE table_no = ?', (table_no,)).fetchone()
+            if row is None:
+                raise ConcurrentUpdateError("Rozlosování se mezitím změnilo nebo byl hrací den uložen")
+            if sorted(json.loads(row[0])) != sorted(r['Hráč'] for r in results):
+                raise ValueError(f"Hráči neodpovídají stolu {table_no}")
+            if cur.execute('SELECT MAX(round_no) FROM table_entries').fetchone()[0] > 1:
+                for result in results:
+                    result[ROUND_COLUMN] = row[1]
+            updated = cur.execute(
+                'UPDATE table_entries SET results = ?, version = version + 1 WHERE table_no = ? AND version = ?',
+                (json.dumps(results, ensure_ascii=False), table_no, version)
+            ).rowcount
+            if not updated:
+                raise ConcurrentUpdateError(f"Výsledky stolu {table_no} mezitím zadal někdo jiný")
+
+            # Poslední zadaný stůl uloží celý hrací den
+            pending = cur.execute('SELECT COUNT(*) FROM table_entries WHERE results IS NULL').fetchone()[0]
+            if pending:
+                return None
+            session_date, group_size = cur.execute('SELECT date, group_size FROM open_session').fetchone()
+            all_results = []
+            for (table_results,) in cur.execute('SELECT results FROM table_entries ORDER BY table_no').fetchall():
+                all_results.extend(json.loads(table_results))
+            return self._insert_session(cur, session_date, all_results, group_size)
@@ -0,0 +1,600 @@
+"""Ligová logika bez závislosti na streamlitu: hráči, hrací dny, vklad, rozlosování a výpočet výsledků."""
+
+import json
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from liga.checkpoints import Checkpoints
+from liga.export import render_export
+from liga.headtohead import HeadToHead
+from liga.history import SessionStore
+from liga.journal import Journal
+from liga.loader import stream_league
+from liga.pairing import PairHistory, generate_round_pairings, generate_swiss_pairings
+from liga.projection import project_standings
+from liga.rating import Ratings
+from liga.standings import Standings
+from liga.timeseries import TimeSeries
+
+DEFAULT_LEAGUE_NAME = "Mariášová Liga"
+DEFAULT_VKLAD = 100
+
+# Sloupce jednoho řádku výsledku hracího dne
+RESULT_COLUMNS = ['Hráč', 'Na stole', 'Dokup', 'Zisk', 'Stůl']
+ROUND_COLUMN = 'Kolo'  # Jen u vícekolových hracích dnů
+
+
+# Funkce pro výpočet statistik hráčů
+def calculate_player_stats(players):
+    """Vypočítá statistiky pro všechny hráče"""
+    player_stats = {}
+    for player, data in players.items():
+        total_zisk = data['celkovy_zisk']
+        pocet_dnu = data['pocet_dnu']
+        prumer_zisk = total_zisk / pocet_dnu if pocet_dnu > 0 else 0
+        player_stats[player] = {
+            'celkovy_zisk': total_zisk,
+            'pocet_dnu': pocet_dnu,
+            'prumer_zisk': prumer_zisk
+        }
+    return player_stats
+
+
+# Výpočet výsledku jednoho hráče
+def calculate_zisk(na_stole, dokup, vklad):
+    """Zisk hráče = co mu zůstalo na stole - vklad - dokup"""
+    return na_stole - vklad - dokup
+
+
+def table_balance(table_results, vklad):
+    """Vrátí rozdíl vkladů u stolu (0 = vklady souhlasí)"""
+    sum_na_stole = sum(r['Na stole'] for r in table_results)
+    sum_dokup = sum(r['Dokup'] for r in table_results)
+    return vklad * len(table_results) + sum_dokup - sum_na_stole
+
+
+def build_table_results(table_idx, entries, vklad, round_no=None):
+    """
+    Sestaví řádky výsledků jednoho stolu
+    entries: seznam trojic (hráč, na_stole, dokup); round_no: kolo stolu u vícekolového dne
+    """
+    results = [
+        {
+            'Hráč': player,
+            'Na stole': na_stole,
+            'Dokup': dokup,
+            'Zisk': calculate_zisk(na_stole, dokup, vklad),
+            'Stůl': table_idx + 1
+        }
+        for player, na_stole, dokup in entries
+    ]
+    if round_no is not None:
+        for result in results:
+            result[ROUND_COLUMN] = round_no
+    return results
+
+
+def league_to_dict(league_name, vklad, players, sessions):
+    """Stav ligy jako slovník ve formátu ligového souboru"""
+    return {
+        'league_name': league_name,
+        'vklad': vklad,
+        'players': players,
+        'sessions': sessions
+    }
+
+
+def league_from_dict(league_data):
+    """Argumenty pro LeagueEngine ze slovníku ve formátu ligového souboru"""
+    return {
+        'league_name': league_data.get('league_name', DEFAULT_LEAGUE_NAME),
+        'vklad': league_data.get('vklad', DEFAULT_VKLAD),
+        'players': league_data.get('players', {}),
+        'sessions': league_data.get('sessions', [])
+    }
+
+
+def results_grid(pairings, table_rounds=None):
+    """
+    Prázdná tabulka pro zadání výsledků všech stolů najednou (sloupce Stůl, Hráč, Na stole, Dokup)
+    table_rounds: kolo každého stolu – u vícekolového dne přibude první sloupec Kolo
+    """
+    tables = [table_idx + 1 for table_idx, table in enumerate(pairings) for _ in table]
+    players = [player for table in pairings for player in table]
+    grid = pd.DataFrame({
+        'Stůl': tables,
+        'Hráč': players,
+        'Na stole': np.zeros(len(players), dtype=np.int64),
+        'Dokup': np.zeros(len(players), dtype=np.int64),
+    })
+    if table_rounds and max(table_rounds) > 1:
+        grid.insert(0, ROUND_COLUMN, [round_no for round_no, table in zip(table_rounds, pairings) for _ in table])
+    return grid
+
+
+def evaluate_results(grid, vklad):
+    """
+    Vyhodnotí zadané výsledky všech stolů jedním vektorovým průchodem
+    Vrací (DataFrame řádků s doplněným Zisk a příznaky Vítěz/Poražený, Series rozdílů vkladů podle stolu).
+    """
+    results = grid.copy()
+    results['Na stole'] = results['Na stole'].fillna(0).astype(np.int64)
+    results['Dokup'] = results['Dokup'].fillna(0).astype(np.int64)
+    results['Zisk'] = calculate_zisk(results['Na stole'], results['Dokup'], vklad)
+
+    by_table = results.groupby('Stůl', sort=True)['Zisk']
+    # Součet zisků u stolu je roven záporně vzatému rozdílu vkladů
+    diffs = -by_table.sum()
+    max_zisk = by_table.transform('max')
+    min_zisk = by_table.transform('min')
+    results['Vítěz'] = results['Zisk'] == max_zisk
+    results['Poražený'] = (results['Zisk'] == min_zisk) & ~results['Vítěz']
+    return results, diffs
+
+
+def results_to_records(results):
+    """Řádky vyhodnocených výsledků ve formátu ligového souboru"""
+    columns = RESULT_COLUMNS + [ROUND_COLUMN] if ROUND_COLUMN in results.columns else RESULT_COLUMNS
+    return results[columns].to_dict('records')
+
+
+# Funkce pro uložení ligy
+def save_league(league_name, vklad, players, sessions):
+    """Uloží stav ligy do JSON řetězce"""
+    return json.dumps(league_to_dict(league_name, vklad, players, sessions), ensure_ascii=False)
+
+
+# Funkce pro načtení ligy
+def load_league(uploaded_file):
+    """Načte stav ligy z JSON souboru, vrací slovník s klíči league_name, vklad, players, sessions"""
+    return league_from_dict(json.load(uploaded_file))
+
+
+class LeagueBase:
+    """
+    Společný průběh hracího dne pro ligu v paměti i v databázi
+    Potomek dodává league_name, vklad, history, player_names(), standings_frame(), pairing_inputs(),
+    record_session(), edit_session(), undo_session(), ratings(), zisk_samples(), timeseries(), head_to_head() a cached().
+    """
+
+    current_session = None  # Aktuální sezení, které se právě zadává
+
+    def file_stem(self):
+        """Základ názvu souboru pro exporty"""
+        return self.league_name.replace(' ', '_')
+
+    def player_names(self):
+        """Jména hráčů ligy"""
+        raise NotImplementedError
+
+    def cached(self, key, compute):
+        """Hodnota platná do další změny ligy"""
+        raise NotImplementedError
+
+    def export(self, fmt):
+        """Export ve formátu z liga.export.EXPORT_FORMATS jako bytes – sestaví se až při prvním stažení"""
+        return self.cached(('export', fmt), lambda: render_export(self, fmt))
+
+    def ratings(self):
+        """Ratingy hráčů (liga.rating.Ratings)"""
+        raise NotImplementedError
+
+    def rating_frame(self):
+        """Hráči ligy seřazení podle ratingu"""
+        return self.ratings().frame(self.player_names())
+
+    def zisk_samples(self):
+        """{hráč: pole jeho zisků za odehrané hrací dny} pro hráče ligy"""
+        raise NotImplementedError
+
+    def timeseries(self):
+        """Kumulativní zisk a pořadí po hracích dnech (liga.timeseries.TimeSeries)"""
+        raise NotImplementedError
+
+    def head_to_head(self):
+        """Vzájemné výsledky dvojic hráčů (liga.headtohead.HeadToHead)"""
+        raise NotImplementedError
+
+    def project_standings(self, remaining_days, num_simulations=100_000, workers=None, seed=None):
+        """Monte Carlo projekce konečného pořadí po zbývajících hracích dnech (viz liga.projection)"""
+        standings = self.standings_frame()
+        samples = self.zisk_samples()
+        num_sessions = len(self.history)
+        attendance = {
+            name: len(samples.get(name, ())) / num_sessions if num_sessions else 1.0
+            for name in standings['Hráč']
+        }
+        totals = dict(zip(standings['Hráč'], standings['Celkový zisk'].tolist()))
+        return project_standings(totals, samples, attendance, remaining_days, num_simulations, workers, seed)
+
+    def pairing_inputs(self, present_players, by_rating=False):
+        """({hráč: statistiky}, PairHistory, nasazení nebo None) pro rozlosování přítomných hráčů"""
+        raise NotImplementedError
+
+    def generate_pairings(self, present_players, group_size=3, by_rating=False):
+        """Rozlosuje přítomné hráče ke stolům"""
+        players, history, seeds = self.pairing_inputs(present_players, by_rating)
+        return generate_swiss_pairings(players, group_size, history, seeds)
+
+    def generate_round_pairings(self, present_players, group_size=3, num_rounds=2, by_rating=False):
+        """Rozlosuje přítomné hráče na více kol jednoho dne, vrací seznam kol (seznamů stolů)"""
+        players, history, seeds = self.pairing_inputs(present_players, by_rating)
+        return generate_round_pairings(players, group_size, num_rounds, history, seeds)
+
+    def start_session(self, present_players, group_size=3, session_date=None, by_rating=False, rounds=1):
+        """
+        Vygeneruje rozlosování a založí aktuální hrací den (nasazení podle zisku, nebo ratingu)
+        rounds: počet kol – stoly všech kol se číslují za sebou, table_rounds je kolo každého stolu
+        """
+        if rounds > 1:
+            day_rounds = self.generate_round_pairings(present_players, group_size, rounds, by_rating)
+        else:
+            day_rounds = [self.generate_pairings(present_players, group_size, by_rating)]
+        self.current_session = {
+            'date': session_date or date.today().strftime('%Y-%m-%d'),
+            'players': list(present_players),
+            'group_size': group_size,
+            'pairings': [table for tables in day_rounds for table in tables],
+            'table_rounds': [round_no for round_no, tables in enumerate(day_rounds, start=1) for _ in tables],
+            'results': None
+        }
+        return self.current_session
+
+    def discard_session(self, version=None):
+        """Zahodí rozpracovaný hrací den (version: viz DatabaseLeague.discard_session)"""
+        self.current_session = None
+
+    def open_results(self):
+        """Přepne aktuální hrací den do režimu zadávání výsledků"""
+        self.current_session['results'] = {}
+
+    def evaluate_results(self, grid):
+        """Vyhodnotí tabulku zadaných výsledků aktuálního vkladu"""
+        return evaluate_results(grid, self.vklad)
+
+    def commit_session(self, all_results):
+        """Uloží výsledky aktuálního hracího dne"""
+        session = self.current_session
+        self.current_session = None
+        return self.record_session(session['date'], all_results, session['group_size'])
+
+
+class LeagueEngine(LeagueBase):
+    """Stav jedné ligy a operace nad ním – UI je jen tenká vrstva nad touto třídou"""
+
+    def __init__(self, league_name=DEFAULT_LEAGUE_NAME, vklad=DEFAULT_VKLAD, players=None, sessions=None, history=None):
+        self.league_name = league_name
+        self.vklad = vklad
+        # Sloupcová historie hracích dnů – buď hotová z proudového načtení, nebo ze seznamu slovníků
+        self.history = history if history is not None else SessionStore.from_sessions(sessions or [])
+        self.current_session = None  # Aktuální sezení, které se právě zadává
+        self.pair_history = PairHistory.from_store(self.history)  # Společné hry dvojic hráčů
+        self._ratings = Ratings(self.history.ids)  # Elo ratingy, po uložení dne jen jeho stoly
+        # Kontrolní body součtů a ratingů – oprava dne přepočítá jen dny od nejbližšího bodu
+        self._checkpoints = Checkpoints.build(self.history, self._ratings)
+
+        # Historie je zdroj pravdy: součty aktivních hráčů {jméno: {'celkovy_zisk', 'pocet_dnu'}} jsou
+        # z ní odvozené, _base je posun oproti historii (znovu přidaný hráč začíná od nuly)
+        self.players = {}
+        self._base = {}
+        self._removed = set()  # Odebraní hráči s výsledky v historii – v souboru zůstanou jako neaktivní
+        zisk, days = self._checkpoints.totals(self.history)
+        for name, data in (players or {}).items():
+            if data.get('aktivni', True):
+                history_zisk, history_dnu = self._history_totals(name, zisk, days)
+                self._base[name] = [data['celkovy_zisk'] - history_zisk, data['pocet_dnu'] - history_dnu]
+                self.players[name] = {'celkovy_zisk': data['celkovy_zisk'], 'pocet_dnu': data['pocet_dnu']}
+        # Hráči z historie, kteří nejsou aktivní (neaktivní v souboru, nebo ve starších souborech úplně chybí)
+        self._removed.update(name for name in self.history.names if name not in self.players)
+        self.standings = Standings(self.players)  # Průběžná tabulka udržovaná inkrementálně
+        self._timeseries = None  # Vývoj v čase, sestaví se až při prvním zobrazení grafů
+        self._head_to_head = None  # Vzájemné výsledky dvojic, sestaví se až při prvním zobrazení
+        self.version = 0  # Zvyšuje se s každou změnou ligy, slouží jako klíč cache
+        self.journal = None  # Volitelný deník změn (liga.journal.Journal)
+        self._cache = {}  # {klíč: (verze, hodnota)} – např. hotové exporty
+
+    # --- Liga ---
+
+    def reset(self, league_name="Nová Mariášová Liga"):
+        """Založí novou prázdnou ligu"""
+        journal, version = self.journal, self.version
+        self.__init__(league_name=league_name)
+        self.journal, self.version = journal, version
+        self._record({'type': 'reset', 'league_name': league_name})
+
+    def set_settings(self, league_name=None, vklad=None):
+        """Změní název ligy nebo základní vklad"""
+        changed = False
+        if league_name is not None and league_name != self.league_name:
+            self.league_name = league_name
+            changed = True
+        if vklad is not None and vklad != self.vklad:
+            self.vklad = vklad
+            changed = True
+        if changed:
+            self._record({'type': 'settings', 'league_name': self.league_name, 'vklad': self.vklad})
+        return changed
+
+    def _file_players(self):
+        """Hráči ve formátu ligového souboru (odebraní hráči s historií jako neaktivní)"""
+        players = {name: dict(data) for name, data in self.players.items()}
+        if self._removed:
+            zisk, days = self._checkpoints.totals(self.history)
+            for name in self.history.names:
+                if name in self._removed:
+                    history_zisk, history_dnu = self._history_totals(name, zisk, days)
+                    players[name] = {'celkovy_zisk': history_zisk, 'pocet_dnu': history_dnu, 'aktivni': False}
+        return players
+
+    def to_dict(self):
+        """Liga jako slovník ve formátu ligového souboru"""
+        return league_to_dict(self.league_name, self.vklad, self._file_players(), list(self.history.iter_sessions()))
+
+    def snapshot(self):
+        """
+        Levný snímek stavu pro uložení v jiném vlákně (viz liga.autosave) – kopírují se jen sloupce historie,
+        slovníky hracích dnů se sestaví až při serializaci
+        """
+        return {
+            'league_name': self.league_name,
+            'vklad': self.vklad,
+            'players': self._file_players(),
+            'history': self.history.copy(),
+            'version': self.version,
+        }
+
+    def to_json(self):
+        """Serializuje ligu do JSON řetězce"""
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_file(cls, uploaded_file, progress=None):
+        """
+        Vytvoří engine z ligového JSON souboru – čte se proudově a každý hrací den se kontroluje
+        Při chybě vyhodí liga.loader.LeagueFileError.
+        """
+        data = stream_league(uploaded_file, progress)
+        return cls(history=data.pop('history'), **league_from_dict(data))
+
+    # --- Deník změn ---
+
+    @classmethod
+    def open_journal(cls, directory):
+        """Načte ligu z adresáře deníku (poslední snímek + přehrání událostí) a připojí deník"""
+        journal = Journal(directory)
+        snapshot, events = journal.read()
+        engine = cls(**league_from_dict(snapshot)) if snapshot else cls()
+        for event in events:
+            engine.apply_event(event)
+        engine.journal = journal
+        return engine
+
+    def attach_journal(self, journal):
+        """Připojí deník a zapíše do něj snímek aktuálního stavu jako nový základ"""
+        self.journal = journal
+        journal.write_snapshot(self.to_dict())
+
+    def apply_event(self, event):
+        """Přehraje jednu událost deníku"""
+        kind = event['type']
+        if kind == 'add_player':
+            self.add_player(event['name'])
+        elif kind == 'remove_player':
+            self.remove_player(event['name'])
+        elif kind == 'settings':
+            self.set_settings(event['league_name'], event['vklad'])
+        elif kind == 'session':
+            self.record_session(event['date'], event['results'], event['group_size'])
+        elif kind == 'edit_session':
+            self.edit_session(event['index'], event['results'])
+        elif kind == 'undo_session':
+            self.undo_session()
+        elif kind == 'reset':
+            self.reset(event['league_name'])
+        else:
+            raise ValueError(f"Neznámá událost deníku: {kind}")
+
+    def cached(self, key, compute):
+        """Hodnota platná do další změny ligy (klíčem cache je verze)"""
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] == self.version:
+            return hit[1]
+        value = compute()
+        self._cache[key] = (self.version, value)
+        return value
+
+    def _record(self, event):
+        """Označí změnu ligy a zapíše ji do deníku, je-li připojen"""
+        self.version += 1
+        if self.journal is not None:
+            self.journal.append(event)
+            if self.journal.needs_snapshot():
+                self.journal.write_snapshot(self.to_dict())
+
+    # --- Hráči ---
+
+    def add_player(self, name):
+        """Přidá hráče, vyhodí ValueError, pokud už existuje"""
+        if name in self.players:
+            raise ValueError(f"Hráč {name} již existuje")
+        # Dříve odebraný hráč začíná znovu od nuly, jeho výsledky v historii zůstávají
+        history_zisk, history_dnu = self._history_totals(name, *self._checkpoints.totals(self.history))
+        self._base[name] = [-history_zisk, -history_dnu]
+        self._removed.discard(name)
+        self.players[name] = {'celkovy_zisk': 0, 'pocet_dnu': 0}
+        self.standings.add_player(name)
+        self._record({'type': 'add_player', 'name': name})
+
+    def remove_player(self, name):
+        """Odstraní hráče z ligy; jeho výsledky zůstanou v historii u stolů ostatních hráčů"""
+        del self.players[name]
+        del self._base[name]
+        if name in self.history.ids:
+            self._removed.add(name)
+        self.standings.remove_player(name)
+        self._record({'type': 'remove_player', 'name': name})
+
+    def _history_totals(self, name, zisk, days):
+        """(zisk, počet dní) hráče z polí součtů po id hráčů"""
+        pid = self.history.ids.get(name)
+        if pid is None or pid >= len(zisk):
+            return 0, 0
+        return int(zisk[pid]), int(days[pid])
+
+    def _refresh_totals(self):
+        """Znovu odvodí součty aktivních hráčů a průběžnou tabulku z kontrolních bodů historie"""
+        zisk, days = self._checkpoints.totals(self.history)
+        for name, data in self.players.items():
+            history_zisk, history_dnu = self._history_totals(name, zisk, days)
+            base_zisk, base_dnu = self._base[name]
+            data['celkovy_zisk'] = base_zisk + history_zisk
+            data['pocet_dnu'] = base_dnu + history_dnu
+        self.standings = Standings(self.players)
+
+    def player_names(self):
+        """Jména hráčů ligy v pořadí přidání"""
+        return list(self.players)
+
+    def player_stats(self):
+        """Statistiky všech hráčů"""
+        return calculate_player_stats(self.players)
+
+    def standings_frame(self):
+        """Průběžná tabulka jako DataFrame (z cache, přepočítaná jen po změně)"""
+        return self.standings.frame()
+
+    def ratings(self):
+        """Ratingy hráčů udržované inkrementálně"""
+        return self._ratings
+
+    def zisk_samples(self):
+        """Zisky hráčů za hrací dny – jedno seřazení sloupců historie, bez procházení dnů"""
+        # Řádky více kol jednoho dne se sečtou do jednoho zisku za den
+        num_ids = len(self.history.names) or 1
+        day_keys, inverse = np.unique(
+            self.history.column('session').astype(np.int64) * num_ids + self.history.column('player'),
+            return_inverse=True
+        )
+        day_zisk = np.bincount(inverse, weights=self.history.column('zisk')).astype(np.int64)
+        player = day_keys % num_ids
+        order = np.argsort(player, kind='stable')
+        per_player = np.split(day_zisk[order], np.cumsum(np.bincount(player))[:-1])
+        ids = self.history.ids
+        return {name: per_player[ids[name]] for name in self.players if ids.get(name, len(per_player)) < len(per_player)}
+
+    def timeseries(self):
+        """Vývoj zisku a pořadí; po prvním sestavení se s každým dnem jen prodlouží"""
+        if self._timeseries is None:
+            self._timeseries = TimeSeries.from_store(self.history)
+        return self._timeseries
+
+    def head_to_head(self):
+        """Vzájemné výsledky dvojic; po prvním sestavení se s každým dnem jen doplní"""
+        if self._head_to_head is None:
+            self._head_to_head = HeadToHead.from_store(self.history)
+        return self._head_to_head
+
+    # --- Hrací den ---
+
+    def pairing_inputs(self, present_players, by_rating=False):
+        """Skóre přítomných hráčů a průběžně udržovaná matice společných her"""
+        present_players_with_scores = {p: self.players[p] for p in present_players}
+        seeds = self._ratings.seeds(present_players) if by_rating else None
+        return present_players_with_scores, self.pair_history, seeds
+
+    def record_session(self, session_date, results, group_size=3):
+        """Zapíše odehraný hrací den do historie a aktualizuje zisky, tabulku, ratingy a matici dvojic"""
+        # Aktualizovat celkové zisky hráčů a počet odehraných dní (více kol je stále jeden den)
+        # Hráč odebraný po rozlosování se nepočítá mezi aktivní, jeho výsledky zůstanou v historii
+        active = [result for result in results if result['Hráč'] in self.players]
+        for name in dict.fromkeys(result['Hráč'] for result in active):
+            self.players[name]['pocet_dnu'] += 1
+        for result in active:
+            self.players[result['Hráč']]['celkovy_zisk'] += result['Zisk']
+        self._removed.update(result['Hráč'] for result in results if result['Hráč'] not in self.players)
+
+        session_idx = self.history.append(session_date, results, group_size)
+        for table in self.history.session_tables(session_idx):
+            self.pair_history.add_table(table)
+        self._ratings.apply_session(self.history, session_idx)
+        self._checkpoints.session_added(self.history, self._ratings)
+        if self._timeseries is not None:
+            self._timeseries.append_session(self.history, session_idx)
+        if self._head_to_head is not None:
+            self._head_to_head.apply_session(self.history, session_idx)
+        self.standings.apply_results(active)
+        self._record({'type': 'session', 'date': session_date, 'group_size': group_size, 'results': results})
+        return session_idx
+
+    def append_sessions(self, dates, group_sizes, day, results):
+        """
+        Hromadně přidá mnoho hracích dnů (viz SessionStore.append_days) – noví hráči se přidají do ligy
+        Odvozené struktury se sestaví jednou na konci; s připojeným deníkem se zapíše nový snímek.
+        Dny musí navazovat na historii (ne starší než poslední den), jinak vyhodí ValueError.
+        """
+        latest = self.history.date_range()[1]
+        if latest is not None and len(dates) and np.min(dates) < np.datetime64(latest, 'D'):
+            raise ValueError(f"Importované dny jsou starší než poslední hrací den ligy ({latest})")
+        zisk, days = self._checkpoints.totals(self.history)
+        for name in pd.unique(results['Hráč']):
+            if name not in self.players:
+                # Jako add_player: případné starší výsledky odebraného hráče se nezapočítají
+                history_zisk, history_dnu = self._history_totals(name, zisk, days)
+                self._base[name] = [-history_zisk, -history_dnu]
+                self._removed.discard(name)
+                self.players[name] = {'celkovy_zisk': 0, 'pocet_dnu': 0}
+
+        self.history.append_days(dates, group_sizes, day, results)
+        self.pair_history = PairHistory.from_store(self.history)
+        self._ratings = Ratings(self.history.ids)
+        self._checkpoints = Checkpoints.build(self.history, self._ratings)
+        self._timeseries = None
+        self._head_to_head = None
+        self._refresh_totals()
+        self.version += 1
+        if self.journal is not None:
+            self.journal.write_snapshot(self.to_dict())
+
+    def edit_session(self, session_idx, results):
+        """
+        Opraví výsledky odehraného hracího dne (řádky ve formátu ligového souboru)
+        Součty a ratingy se přepočítají jen od nejbližšího kontrolního bodu před opraveným dnem.
+        """
+        unknown = [r['Hráč'] for r in results if r['Hráč'] not in self.players and r['Hráč'] not in self._removed]
+        if unknown:
+            raise ValueError(f"Neznámý hráč {unknown[0]}")
+        self._rewrite_session(session_idx, results)
+        self._record({'type': 'edit_session', 'index': int(session_idx), 'results': results})
+
+    def undo_session(self, expected_idx=None):
+        """Vrátí (smaže) poslední uložený hrací den; expected_idx: den, který uživatel potvrdil ke smazání"""
+        if not len(self.history):
+            raise ValueError("Žádný hrací den k vrácení")
+        if expected_idx is not None and expected_idx != len(self.history) - 1:
+            raise ValueError("Poslední hrací den se mezitím změnil, nic se nesmazalo")
+        self._rewrite_session(len(self.history) - 1, None)
+        self._record({'type': 'undo_session'})
+
+    def _rewrite_session(self, session_idx, results):
+        """Nahradí řádky hracího dne (None = smaže poslední den) a dopočítá odvozené struktury"""
+        store = self.history
+        # Odečíst stoly původního dne, dokud jsou ještě v historii
+        for table in store.session_tables(session_idx):
+            self.pair_history.add_table(table, -1)
+        if self._head_to_head is not None:
+            self._head_to_head.apply_session(store, session_idx, sign=-1)
+
+        if results is None:
+            store.remove_last_session()
+        else:
+            store.replace_session(session_idx, results)
+            for table in store.session_tables(session_idx):
+                self.pair_history.add_table(table)
+            if self._head_to_head is not None:
+                self._head_to_head.apply_session(store, session_idx)
+
+        self._checkpoints.rewind(store, self._ratings, session_idx)
+        self._timeseries = None  # Vývoj v čase se sestaví znovu až při zobrazení
+        self._refresh_totals()
@@ -0,0 +1,84 @@
+"""
+Exporty tabulky a celé historie výsledků.
+
+Exporty se sestavují až na vyžádání (po kliknutí na stažení) a historie se zapisuje po dávkách
+řádků, takže se nikdy nesestavuje jeden velký DataFrame ze všech hracích dnů.
+"""
+
+import io
+
+# Sloupce plochého exportu výsledků všech hracích dnů
+EXPORT_COLUMNS = ['Hrací den', 'Kolo', 'Datum', 'Stůl', 'Hráč', 'Na stole', 'Dokup', 'Zisk']
+CHUNK_ROWS = 50_000
+CSV_ENCODING = 'cp1250'  # Kódování, které český Excel otevře bez importu
+CSV_SEPARATOR = ';'
+
+# {formát: (popisek, přípona souboru, MIME typ)}
+EXPORT_FORMATS = {
+    'standings_csv': ("Tabulka (CSV)", '_tabulka.csv', 'text/csv'),
+    'results_csv': ("Všechny výsledky (CSV)", '_vysledky.csv', 'text/csv'),
+    'results_parquet': ("Všechny výsledky (Parquet)", '_vysledky.parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def _csv_bytes(frame, header):
+    """Jedna dávka CSV; znaky mimo cp1250 se nahradí otazníkem"""
+    text = frame.to_csv(index=False, header=header, sep=CSV_SEPARATOR)
+    return text.encode(CSV_ENCODING, errors='replace')
+
+
+def iter_standings_csv(standings):
+    """Průběžná tabulka jako CSV (jedna dávka)"""
+    yield _csv_bytes(standings, header=True)
+
+
+def iter_results_csv(frames):
+    """Plochý CSV export výsledků z dávek DataFrame se sloupci EXPORT_COLUMNS"""
+    header = True
+    for frame in frames:
+        yield _csv_bytes(frame, header)
+        header = False
+    if header:
+        # Prázdná historie – aspoň hlavička
+        yield (CSV_SEPARATOR.join(EXPORT_COLUMNS) + '\n').encode(CSV_ENCODING)
+
+
+def write_results_parquet(frames, target):
+    """Sloupcový export výsledků do Parquet souboru, každá dávka jako jedna skupina řádků"""
+    import pyarrow as pa  # Volitelná závislost (instaluje se se streamlitem)
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(target, table.schema, compression='zstd')
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(pa.table({column: pa.array([], pa.string()) for column in EXPORT_COLUMNS}), target)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_export(league, fmt, target, chunk_rows=CHUNK_ROWS):
+    """Zapíše export ligy (LeagueEngine nebo DatabaseLeague) ve formátu fmt do binárního souboru target"""
+    if fmt == 'results_parquet':
+        write_results_parquet(league.history.iter_result_frames(chunk_rows), target)
+        return
+    if fmt == 'standings_csv':
+        chunks = iter_standings_csv(league.standings_frame())
+    elif fmt == 'results_csv':
+        chunks = iter_results_csv(league.history.iter_result_frames(chunk_rows))
+    else:
+        raise ValueError(f"Neznámý formát exportu: {fmt}")
+    for chunk in chunks:
+        target.write(chunk)
+
+
+def render_export(league, fmt, chunk_rows=CHUNK_ROWS):
+    """Export jako bytes (pro tlačítko stažení)"""
+    buffer = io.BytesIO()
+    write_export(league, fmt, buffer, chunk_rows)
+    return buffer.getvalue()
@@ -0,0 +1,138 @@
+"""Vzájemné výsledky dvojic hráčů: společné stoly a rozdíl zisků, uložené řídce podle dvojice id."""
+
+import numpy as np
+import pandas as pd
+
+from liga.history import table_pairs
+
+# Položky záznamu dvojice (i, j), i < j
+GAMES, ZISK_I, ZISK_J, WINS_I, WINS_J = range(5)
+
+RIVAL_COLUMNS = ['Soupeř', 'Společné stoly', 'Můj zisk', 'Zisk soupeře', 'Rozdíl', 'Výhry', 'Prohry']
+
+
+class HeadToHead:
+    """
+    Řídký index {(id_i, id_j): [stoly, zisk i, zisk j, výhry i, výhry j]} jen pro dvojice, které spolu hrály
+    Výhra v dvojici = vyšší zisk u společného stolu. Uložený hrací den se do indexu jen přičte.
+    """
+
+    def __init__(self, ids=None):
+        self.ids = ids if ids is not None else {}  # {jméno: id} – sdílené s úložištěm historie
+        self._pairs = {}
+        self._rivals = {}  # {id: množina id soupeřů}
+
+    @classmethod
+    def from_store(cls, store):
+        """Sestaví index ze SessionStore"""
+        return cls.from_rows(
+            store.ids, store.column('session'), store.column('player'), store.column('table'), store.column('zisk')
+        )
+
+    @classmethod
+    def from_rows(cls, ids, session, player, table, zisk):
+        """Sestaví index ze sloupců řádků výsledků"""
+        index = cls(ids)
+        index._add_rows(np.asarray(session), np.asarray(player), np.asarray(table), np.asarray(zisk))
+        return index
+
+    def _add_rows(self, session, player, table, zisk, sign=1):
+        """
+        Přičte všechny dvojice u stolů v zadaných řádcích – agregace po dvojicích je vektorová
+        sign=-1 dvojice odečte (oprava nebo vrácení hracího dne)
+        """
+        key = session.astype(np.int64) * 65536 + table
+        order = np.argsort(key, kind='stable')
+        key, player, zisk = key[order], player[order].astype(np.int64), zisk[order]
+        a, b, _ = table_pairs(key)
+        if not len(a):
+            return
+        # Orientace dvojice: i je menší id
+        swap = player[a] > player[b]
+        rows_i, rows_j = np.where(swap, b, a), np.where(swap, a, b)
+        pi, pj, zi, zj = player[rows_i], player[rows_j], zisk[rows_i], zisk[rows_j]
+
+        _, first, inverse = np.unique(pi * (int(player.max()) + 1) + pj, return_index=True, return_inverse=True)
+        sums = [
+            np.bincount(inverse),
+            np.bincount(inverse, weights=zi),
+            np.bincount(inverse, weights=zj),
+            np.bincount(inverse, weights=zi > zj),
+            np.bincount(inverse, weights=zj > zi),
+        ]
+        sums = [(sign * s).astype(np.int64).tolist() for s in sums]
+        for i, j, *values in zip(pi[first].tolist(), pj[first].tolist(), *sums):
+            entry = self._pairs.get((i, j))
+            if entry is None:
+                self._pairs[(i, j)] = values
+                self._rivals.setdefault(i, set()).add(j)
+                self._rivals.setdefault(j, set()).add(i)
+            else:
+                for k, value in enumerate(values):
+                    entry[k] += value
+                if not entry[GAMES]:
+                    # Dvojice už spolu nehrála u žádného stolu
+                    del self._pairs[(i, j)]
+                    self._rivals[i].discard(j)
+                    self._rivals[j].discard(i)
+
+    def apply_session(self, store, session_idx, sign=1):
+        """Přičte (sign=-1 odečte) jen stoly jednoho hracího dne"""
+        rows = store.session_slice(session_idx)
+        self._add_rows(
+            store.column('session')[rows], store.column('player')[rows],
+            store.column('table')[rows], store.column('zisk')[rows], sign
+        )
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def pair(self, name, rival):
+        """Výsledky hráče name proti hráči rival z pohledu hráče name (stoly, můj zisk, zisk soupeře, výhry, prohry)"""
+        i, j = self.ids.get(name), self.ids.get(rival)
+        entry = self._pairs.get((min(i, j), max(i, j))) if i is not None and j is not None else None
+        if entry is None:
+            return 0, 0, 0, 0, 0
+        if i < j:
+            return entry[GAMES], entry[ZISK_I], entry[ZISK_J], entry[WINS_I], entry[WINS_J]
+        return entry[GAMES], entry[ZISK_J], entry[ZISK_I], entry[WINS_J], entry[WINS_I]
+
+    def rivals(self, name, names=None):
+        """
+        Soupeři hráče seřazení podle počtu společných stolů
+        names: volitelné omezení na tyto hráče (např. aktuální hráče ligy)
+        """
+        pid = self.ids.get(name)
+        rival_ids = self._rivals.get(pid, set()) if pid is not None else set()
+        lookup = {rid: rname for rname, rid in self.ids.items() if rid in rival_ids}
+        allowed = set(names) if names is not None else None
+        rows = [
+            (rival,) + self.pair(name, rival)
+            for rival in lookup.values() if allowed is None or rival in allowed
+        ]
+        frame = pd.DataFrame(
+            [(r[0], r[1], r[2], r[3], r[2] - r[3], r[4], r[5]) for r in rows], columns=RIVAL_COLUMNS
+        )
+        return frame.sort_values(['Společné stoly', 'Rozdíl'], ascending=False, kind='stable').reset_index(drop=True)
+
+    def never_met(self, name, names):
+        """Hráči z names, se kterými hráč ještě neseděl u stolu"""
+        pid = self.ids.get(name)
+        met = self._rivals.get(pid, set()) if pid is not None else set()
+        return [other for other in names if other != name and self.ids.get(other) not in met]
+
+    def matrix(self, names, value='games'):
+        """
+        Čtvercová matice pro vybrané hráče (řádek = hráč, sloupec = soupeř)
+        value: 'games' = společné stoly, 'net' = rozdíl zisků řádkového hráče proti sloupcovému
+        """
+        names = list(names)
+        values = np.zeros((len(names), len(names)), dtype=np.int64)
+        for r, name in enumerate(names):
+            for c, rival in enumerate(names[r + 1:], start=r + 1):
+                games, mine, theirs, _, _ = self.pair(name, rival)
+                if value == 'net':
+                    values[r, c], values[c, r] = mine - theirs, theirs - mine
+                else:
+                    values[r, c] = values[c, r] = games
+        return pd.DataFrame(values, index=pd.Index(names, name='Hráč'), columns=names)
@@ -0,0 +1,345 @@
+"""Kompaktní sloupcové úložiště historie hracích dnů s celočíselnými id hráčů."""
+
+import numpy as np
+import pandas as pd
+
+# Sloupce řádků výsledků a jejich typy
+ROW_COLUMNS = {
+    'session': np.int32,   # Index hracího dne
+    'player': np.int32,    # Id hráče (viz SessionStore.names)
+    'table': np.int16,     # Číslo stolu (od 1, v rámci dne napříč koly)
+    'round': np.int8,      # Kolo hracího dne (od 1)
+    'na_stole': np.int64,
+    'dokup': np.int64,
+    'zisk': np.int64,
+}
+
+
+def table_pairs(key):
+    """
+    Dvojice řádků u jednoho stolu pro řádky seřazené podle klíče (hrací den, stůl)
+    Vrací (a, b, velikost stolu každého řádku); dvojice jsou seřazené podle a.
+    """
+    if not len(key):
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, empty
+    bounds = np.flatnonzero(np.diff(key)) + 1
+    starts = np.concatenate(([0], bounds))
+    sizes = np.diff(np.concatenate((starts, [len(key)])))
+    row_sizes = np.repeat(sizes, sizes)
+    rows = np.arange(len(key))
+    a_parts, b_parts = [], []
+    for shift in range(1, sizes.max()):
+        same = np.flatnonzero(key[shift:] == key[:-shift])
+        a_parts.append(rows[same])
+        b_parts.append(rows[same + shift])
+    if not a_parts:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, row_sizes
+    a, b = np.concatenate(a_parts), np.concatenate(b_parts)
+    order = np.argsort(a, kind='stable')
+    return a[order], b[order], row_sizes
+
+
+class _Column:
+    """Rostoucí numpy pole s amortizovaným přidáváním"""
+
+    def __init__(self, dtype, capacity=64):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    def _reserve(self, size, keep):
+        """Zajistí kapacitu pro size hodnot, při zvětšení zachová prvních keep hodnot"""
+        if size > len(self._data):
+            grown = np.zeros(max(size, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:keep] = self._data[:keep]
+            self._data = grown
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self.size + len(values)
+        self._reserve(end, self.size)
+        self._data[self.size:end] = values
+        self.size = end
+
+    def splice(self, start, stop, values):
+        """Nahradí hodnoty start..stop novými; následující hodnoty se posunou"""
+        values = np.asarray(values, dtype=self._data.dtype)
+        tail = self._data[stop:self.size].copy()
+        end = start + len(values)
+        self._reserve(end + len(tail), start)
+        self._data[start:end] = values
+        self._data[end:end + len(tail)] = tail
+        self.size = end + len(tail)
+
+    def truncate(self, size):
+        self.size = min(size, self.size)
+
+    @property
+    def values(self):
+        return self._data[:self.size]
+
+
+class SessionStore:
+    """
+    Historie hracích dnů ve sloupcích
+    Řádky výsledků jsou uložené za sebou po hracích dnech, offsets[i]..offsets[i+1] jsou řádky dne i.
+    """
+
+    def __init__(self):
+        self.names = []  # Jména hráčů podle id
+        self.ids = {}  # {jméno: id}
+        self._rows = {column: _Column(dtype) for column, dtype in ROW_COLUMNS.items()}
+        self._dates = _Column('datetime64[D]', 16)
+        self._group_sizes = _Column(np.int8, 16)
+        self._offsets = _Column(np.int64, 17)
+        self._offsets.extend([0])
+        self._categories = None  # Cache kategorií jmen pro pd.Categorical
+        self._sorted_frames = {}  # Cache výsledků dne seřazených podle zisku {index dne: DataFrame}
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        """Sestaví úložiště ze seznamu hracích dnů ve formátu ligového souboru"""
+        store = cls()
+        for session in sessions:
+            store.append(session['date'], session['results'], session.get('group_size', 3))
+        return store
+
+    def __len__(self):
+        return self._dates.size
+
+    def copy(self):
+        """Nezávislá kopie (sloupce se jen zkopírují) – např. pro serializaci v jiném vlákně"""
+        store = SessionStore()
+        store.names = list(self.names)
+        store.ids = dict(self.ids)
+        for column, values in self._rows.items():
+            store._rows[column].extend(values.values)
+        store._dates.extend(self._dates.values)
+        store._group_sizes.extend(self._group_sizes.values)
+        store._offsets.truncate(0)
+        store._offsets.extend(self._offsets.values)
+        return store
+
+    @property
+    def num_rows(self):
+        return self._offsets.values[-1]
+
+    def player_id(self, name):
+        """Vrátí id hráče, neznámého hráče zaregistruje"""
+        pid = self.ids.get(name)
+        if pid is None:
+            pid = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self._categories = None
+        return pid
+
+    def _row_values(self, session_idx, results):
+        """Hodnoty sloupců pro řádky results hracího dne session_idx"""
+        return {
+            'session': np.full(len(results), session_idx),
+            'player': [self.player_id(r['Hráč']) for r in results],
+            'table': [r['Stůl'] for r in results],
+            'round': [r.get('Kolo', 1) for r in results],
+            'na_stole': [r['Na stole'] for r in results],
+            'dokup': [r['Dokup'] for r in results],
+            'zisk': [r['Zisk'] for r in results],
+        }
+
+    def append(self, session_date, results, group_size=3):
+        """Přidá hrací den; results jsou řádky ve formátu {'Hráč', 'Na stole', 'Dokup', 'Zisk', 'Stůl'[, 'Kolo']}"""
+        session_idx = len(self)
+        for column, values in self._row_values(session_idx, results).items():
+            self._rows[column].extend(values)
+        self._dates.extend([session_date])
+        self._group_sizes.extend([group_size])
+        self._offsets.extend([self.num_rows + len(results)])
+        return session_idx
+
+    def append_days(self, dates, group_sizes, day, results):
+        """
+        Přidá najednou více hracích dnů (hromadný import) bez slovníků po řádcích
+        day: pořadí nového dne (0, 1, ...) pro každý řádek, řádky seřazené podle dne
+        results: DataFrame se sloupci Hráč, Stůl, Kolo, Na stole, Dokup, Zisk
+        """
+        first, start = len(self), self.num_rows
+        codes, names = pd.factorize(results['Hráč'])
+        ids = np.array([self.player_id(name) for name in names], dtype=np.int64)
+        self._rows['session'].extend(first + np.asarray(day))
+        self._rows['player'].extend(ids[codes])
+        for column, source in (('table', 'Stůl'), ('round', 'Kolo'), ('na_stole', 'Na stole'),
+                               ('dokup', 'Dokup'), ('zisk', 'Zisk')):
+            self._rows[column].extend(results[source].to_numpy())
+        self._dates.extend(dates)
+        self._group_sizes.extend(group_sizes)
+        self._offsets.extend(start + np.cumsum(np.bincount(day, minlength=len(dates))))
+
+    def replace_session(self, session_idx, results):
+        """Nahradí řádky výsledků hracího dne (oprava); řádky dalších dnů se jen posunou"""
+        rows = self.session_slice(session_idx)
+        for column, values in self._row_values(session_idx, results).items():
+            self._rows[column].splice(rows.start, rows.stop, values)
+        self._offsets.values[session_idx + 1:] += len(results) - (rows.stop - rows.start)
+        self._sorted_frames.pop(session_idx, None)
+
+    def remove_last_session(self):
+        """Odebere poslední hrací den"""
+        session_idx = len(self) - 1
+        start = self._offsets.values[session_idx]
+        for column in self._rows.values():
+            column.truncate(start)
+        self._dates.truncate(session_idx)
+        self._group_sizes.truncate(session_idx)
+        self._offsets.truncate(session_idx + 1)
+        self._sorted_frames.pop(session_idx, None)
+
+    def column(self, name):
+        """Celý sloupec řádků výsledků (pohled, nekopíruje se)"""
+        return self._rows[name].values
+
+    def session_slice(self, session_idx):
+        """Rozsah řádků jednoho hracího dne"""
+        offsets = self._offsets.values
+        return slice(offsets[session_idx], offsets[session_idx + 1])
+
+    def sessions_slice(self, first, last):
+        """Rozsah řádků hracích dnů first..last (bez last)"""
+        offsets = self._offsets.values
+        return slice(offsets[first], offsets[last])
+
+    def session_vklad(self, session_idx):
+        """Vklad, se kterým se hrál hrací den (vklad ligy se mohl od té doby změnit)"""
+        rows = self.session_slice(session_idx)
+        return int(self.column('na_stole')[rows.start] - self.column('dokup')[rows.start]
+                   - self.column('zisk')[rows.start])
+
+    def dates(self):
+        """Data všech hracích dnů (pohled, datetime64[D])"""
+        return self._dates.values
+
+    def session_date(self, session_idx):
+        return str(self._dates.values[session_idx])
+
+    def session_size(self, session_idx):
+        """Počet hráčů hracího dne (hráč hrající více kol se počítá jednou)"""
+        rows = self.session_slice(session_idx)
+        if self.session_rounds(session_idx) == 1:
+            return rows.stop - rows.start
+        return len(np.unique(self.column('player')[rows]))
+
+    def session_rounds(self, session_idx):
+        """Počet kol hracího dne"""
+        rounds = self.column('round')[self.session_slice(session_idx)]
+        return int(rounds.max()) if len(rounds) else 1
+
+    def session_group_size(self, session_idx):
+        return int(self._group_sizes.values[session_idx])
+
+    def player_names(self, ids):
+        """Jména hráčů pro pole id jako pd.Categorical (bez kopírování řetězců)"""
+        if self._categories is None:
+            self._categories = pd.Index(self.names, dtype=object)
+        return pd.Categorical.from_codes(ids, categories=self._categories)
+
+    def session_frame(self, session_idx):
+        """Výsledky jednoho hracího dne jako DataFrame se sloupci ligového souboru"""
+        rows = self.session_slice(session_idx)
+        frame = pd.DataFrame({
+            'Hráč': self.player_names(self.column('player')[rows]),
+            'Na stole': self.column('na_stole')[rows],
+            'Dokup': self.column('dokup')[rows],
+            'Zisk': self.column('zisk')[rows],
+            'Stůl': self.column('table')[rows],
+        })
+        if self.session_rounds(session_idx) > 1:
+            frame['Kolo'] = self.column('round')[rows]
+        return frame
+
+    def sorted_session_frame(self, session_idx):
+        """Výsledky dne seřazené podle zisku; sestaví se jen při prvním zobrazení dne"""
+        frame = self._sorted_frames.get(session_idx)
+        if frame is None:
+            frame = self.session_frame(session_idx).sort_values('Zisk', ascending=False)
+            self._sorted_frames[session_idx] = frame
+        return frame
+
+    def find_sessions(self, date_from=None, date_to=None, player=None):
+        """
+        Indexy hracích dnů (od nejnovějšího) v rozsahu dat včetně, případně jen dny, kdy hrál daný hráč
+        Filtruje se vektorově nad sloupci, bez procházení jednotlivých dnů.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        dates = self._dates.values
+        if date_from is not None:
+            mask &= dates >= np.datetime64(date_from, 'D')
+        if date_to is not None:
+            mask &= dates <= np.datetime64(date_to, 'D')
+        if player is not None:
+            played = np.zeros(len(self), dtype=bool)
+            pid = self.ids.get(player)
+            if pid is not None:
+                played[self.column('session')[self.column('player') == pid]] = True
+            mask &= played
+        return np.flatnonzero(mask)[::-1]
+
+    def date_range(self):
+        """Nejstarší a nejnovější datum v historii (nebo None, None)"""
+        if not len(self):
+            return None, None
+        dates = self._dates.values
+        return dates.min().astype(object), dates.max().astype(object)
+
+    def session_tables(self, session_idx):
+        """Rozlosování hracího dne jako seznam stolů (seznamů jmen) v pořadí zadání"""
+        rows = self.session_slice(session_idx)
+        tables = {}
+        for pid, table in zip(self.column('player')[rows].tolist(), self.column('table')[rows].tolist()):
+            tables.setdefault(table, []).append(self.names[pid])
+        return [tables[t] for t in sorted(tables)]
+
+    def iter_result_frames(self, chunk_rows):
+        """Plochá tabulka výsledků všech dnů po dávkách řádků (sloupce liga.export.EXPORT_COLUMNS)"""
+        dates = self.dates()
+        for start in range(0, self.num_rows, chunk_rows):
+            rows = slice(start, min(start + chunk_rows, self.num_rows))
+            session = self.column('session')[rows]
+            yield pd.DataFrame({
+                'Hrací den': session + 1,
+                'Kolo': self.column('round')[rows],
+                'Datum': dates[session],
+                'Stůl': self.column('table')[rows],
+                'Hráč': self.player_names(self.column('player')[rows]),
+                'Na stole': self.column('na_stole')[rows],
+                'Dokup': self.column('dokup')[rows],
+                'Zisk': self.column('zisk')[rows],
+            })
+
+    def iter_sessions(self):
+        """Hrací dny ve formátu ligového souboru – slovníky se sestavují až při serializaci"""
+        for i in range(len(self)):
+            rows = self.session_slice(i)
+            players = [self.names[pid] for pid in self.column('player')[rows].tolist()]
+            results = [
+                {'Hráč': player, 'Na stole': na_stole, 'Dokup': dokup, 'Zisk': zisk, 'Stůl': table}
+                for player, na_stole, dokup, zisk, table in zip(
+                    players,
+                    self.column('na_stole')[rows].tolist(),
+                    self.column('dokup')[rows].tolist(),
+                    self.column('zisk')[rows].tolist(),
+                    self.column('table')[rows].tolist(),
+                )
+            ]
+            session = {
+                'date': self.session_date(i),
+                'players': list(dict.fromkeys(players)),
+                'group_size': self.session_group_size(i),
+                'pairings': self.session_tables(i),
+                'results': results
+            }
+            rounds = self.session_rounds(i)
+            if rounds > 1:
+                # Kolo se ukládá jen u vícekolových dnů, jednokolové dny mají formát beze změny
+                for result, round_no in zip(results, self.column('round')[rows].tolist()):
+                    result['Kolo'] = round_no
+                session['rounds'] = rounds
+            yield session
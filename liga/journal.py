@@ -0,0 +1,146 @@
+"""
+Perzistence ligy jako deník událostí (append-only JSONL) s periodickými snímky.
+
+Adresář ligy obsahuje:
+  snapshot.json  – celý ligový soubor (formát save_league) + pořadové číslo poslední zahrnuté události
+  journal.jsonl  – události po snímku, jedna na řádek
+
+Načtení = snímek + přehrání událostí s vyšším pořadovým číslem.
+
+Do adresáře smí v procesu zapisovat jen jeden Journal – naposledy načtený (např. nejnovější záložka
+prohlížeče). Starší instance už nezapíše nic a vyhodí JournalInUseError; její ligu je potřeba načíst znovu.
+"""
+
+import json
+import os
+import threading
+
+SNAPSHOT_FILE = 'snapshot.json'
+JOURNAL_FILE = 'journal.jsonl'
+# Po kolika událostech se deník zhutní do nového snímku
+SNAPSHOT_EVERY = 200
+
+_owners = {}  # {absolutní cesta adresáře: Journal, který do něj smí zapisovat}
+_lock = threading.RLock()  # Chrání _owners i samotné zápisy (relace streamlitu běží ve vláknech)
+
+
+class JournalInUseError(Exception):
+    """Deník mezitím načetla jiná relace – tato do něj už nesmí zapisovat"""
+
+
+class Journal:
+    """Deník změn jedné ligy v adresáři `directory`"""
+
+    def __init__(self, directory, snapshot_every=SNAPSHOT_EVERY):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.seq = 0  # Pořadové číslo poslední zapsané události
+        self._since_snapshot = 0
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.directory, SNAPSHOT_FILE)
+
+    @property
+    def journal_path(self):
+        return os.path.join(self.directory, JOURNAL_FILE)
+
+    @property
+    def _key(self):
+        return os.path.abspath(self.directory)
+
+    @property
+    def is_owner(self):
+        """Smí tento Journal zapisovat (adresář mezitím nenačetla jiná instance)"""
+        return _owners.get(self._key) is self
+
+    def _check_owner(self):
+        if not self.is_owner:
+            raise JournalInUseError("Liga byla mezitím otevřena jinde, načtěte stránku znovu")
+
+    def read(self):
+        """
+        Vrátí (data snímku nebo None, seznam událostí po snímku), nastaví pořadové číslo a převezme zápis
+        do adresáře. Nedopsaný konec deníku po pádu se odřízne, aby se na něj nepřipisovaly další události.
+        """
+        with _lock:
+            previous = _owners.get(self._key)
+            if previous is not None and previous is not self:
+                previous.close()
+            _owners[self._key] = self
+
+            snapshot = None
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path, encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            base_seq = snapshot.get('journal_seq', 0) if snapshot else 0
+
+            events = []
+            if os.path.exists(self.journal_path):
+                good_end, complete = 0, True  # Konec posledního celého řádku v bajtech, končí-li '\n'
+                with open(self.journal_path, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            try:
+                                event = json.loads(line)
+                            except json.JSONDecodeError:
+                                # Nedopsaný řádek po pádu – zbytek deníku se zahodí
+                                break
+                            if event['seq'] > base_seq:
+                                events.append(event)
+                        good_end += len(line)
+                        complete = line.endswith(b'\n')
+                if good_end < os.path.getsize(self.journal_path) or not complete:
+                    with open(self.journal_path, 'r+b') as f:
+                        f.truncate(good_end)
+                        if not complete:
+                            f.seek(good_end)
+                            f.write(b'\n')
+                        f.flush()
+                        os.fsync(f.fileno())
+
+            self.seq = events[-1]['seq'] if events else base_seq
+            self._since_snapshot = len(events)
+            return snapshot, events
+
+    def append(self, event):
+        """Připíše událost na konec deníku; cena nezávisí na velikosti ligy"""
+        with _lock:
+            self._check_owner()
+            self.seq += 1
+            event = dict(event, seq=self.seq)
+            if self._file is None:
+                self._file = open(self.journal_path, 'a', encoding='utf-8')
+            self._file.write(json.dumps(event, ensure_ascii=False) + '\n')
+            self._file.flush()
+            self._since_snapshot += 1
+            return self.seq
+
+    def needs_snapshot(self):
+        return self._since_snapshot >= self.snapshot_every
+
+    def write_snapshot(self, league_data):
+        """
+        Atomicky zapíše snímek (slovník ve formátu league_to_dict) a vyprázdní deník
+        Pád mezi zápisem snímku a vyprázdněním nevadí – události se starším pořadovým číslem se přeskočí.
+        """
+        with _lock:
+            self._check_owner()
+            data = dict(league_data, journal_seq=self.seq)
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            self.close()
+            open(self.journal_path, 'w', encoding='utf-8').close()
+            self._since_snapshot = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
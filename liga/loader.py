@@ -0,0 +1,244 @@
+"""
+Proudové načítání ligového souboru s kontrolou každého hracího dne.
+
+Soubor se čte po blocích, hrací dny se dekódují jeden po druhém a rovnou se ukládají
+do sloupcového úložiště – v paměti je vždy jen jeden rozpracovaný záznam.
+Při první chybě se načítání ukončí výjimkou LeagueFileError.
+"""
+
+import codecs
+import json
+from collections import defaultdict
+
+import numpy as np
+
+from liga.history import ROW_COLUMNS, SessionStore
+
+CHUNK_SIZE = 64 * 1024
+# Největší povolená velikost jednoho záznamu (hracího dne, seznamu hráčů) v bufferu
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+RESULT_KEYS = ('Hráč', 'Na stole', 'Dokup', 'Zisk', 'Stůl')
+
+_WHITESPACE = ' \t\r\n'
+# Největší číslo stolu a kola, které se vejde do sloupců SessionStore
+MAX_TABLE = int(np.iinfo(ROW_COLUMNS['table']).max)
+MAX_ROUND = int(np.iinfo(ROW_COLUMNS['round']).max)
+MAX_AMOUNT = int(np.iinfo(ROW_COLUMNS['zisk']).max)
+
+
+class LeagueFileError(ValueError):
+    """Chyba ve struktuře nebo obsahu ligového souboru"""
+
+
+class _Reader:
+    """Minimální proudový parser JSON nad textovými bloky"""
+
+    def __init__(self, stream, chunk_size):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+        self._buf = ''
+        self._pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def _fill(self):
+        """Načte další blok; vrací False na konci souboru"""
+        if self.eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        self.bytes_read += len(chunk)
+        self._buf = self._buf[self._pos:] + self._utf8.decode(chunk, final=not chunk)
+        self._pos = 0
+        if not chunk:
+            self.eof = True
+        if len(self._buf) > MAX_RECORD_SIZE:
+            raise LeagueFileError("Záznam v souboru je příliš velký")
+        return True
+
+    def peek(self):
+        """Další nebílý znak (nebo '' na konci souboru)"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise LeagueFileError(f"Očekáván znak '{char}' na pozici {self.bytes_read}")
+        self._pos += 1
+
+    def value(self):
+        """Dekóduje jednu celou JSON hodnotu"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Chyba těsně u konce bufferu nebo neukončený řetězec = záznam pokračuje v dalším bloku
+                truncated = e.pos >= len(self._buf) - 8 or e.msg.startswith('Unterminated string')
+                if truncated and self._fill():
+                    continue
+                raise LeagueFileError(f"Neplatný JSON: {e}") from None
+            # Číslo na konci bufferu může pokračovat v dalším bloku
+            if end == len(self._buf) and not self.eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def _validate_players(players):
+    if not isinstance(players, dict):
+        raise LeagueFileError("Položka 'players' musí být objekt {jméno: statistiky}")
+    for name, data in players.items():
+        if not isinstance(data, dict) or not isinstance(data.get('celkovy_zisk'), (int, float)) \
+                or not isinstance(data.get('pocet_dnu'), int):
+            raise LeagueFileError(f"Neplatné statistiky hráče {name}")
+
+
+def _validate_setting(key, value):
+    """Název ligy musí být text, vklad kladné celé číslo"""
+    if key == 'league_name' and not isinstance(value, str):
+        raise LeagueFileError("Položka 'league_name' musí být text")
+    if key == 'vklad' and (type(value) is not int or value <= 0):
+        raise LeagueFileError("Položka 'vklad' musí být kladné celé číslo")
+
+
+def _valid_date(value):
+    """Datum hracího dne ve tvaru RRRR-MM-DD (tak ho ukládá SessionStore)"""
+    if not isinstance(value, str):
+        return False
+    try:
+        return not np.isnat(np.datetime64(value, 'D'))
+    except ValueError:
+        return False
+
+
+def validate_session(session, index):
+    """
+    Zkontroluje jeden hrací den: datum, strukturu a rozsah hodnot řádků a vyrovnanost vkladů u každého stolu
+    Vklad se mohl během ligy měnit, proto se kontroluje, že je v rámci dne u všech řádků stejný.
+    Hráči z historie nemusí být v 'players' – starší soubory po odebrání hráče jeho jméno jen v historii mají.
+    """
+    label = f"Hrací den {index + 1}"
+    if not isinstance(session, dict) or 'date' not in session or not isinstance(session.get('results'), list):
+        raise LeagueFileError(f"{label}: chybí datum nebo výsledky")
+    if not _valid_date(session['date']):
+        raise LeagueFileError(f"{label}: neplatné datum {session['date']!r} (očekává se RRRR-MM-DD)")
+    label = f"{label} ({session['date']})"
+    group_size = session.get('group_size', 3)
+    if type(group_size) is not int or not 1 <= group_size <= MAX_ROUND:
+        raise LeagueFileError(f"{label}: neplatná velikost skupiny {group_size!r}")
+
+    seen = set()
+    table_rounds = {}  # Stoly se číslují napříč koly – každé číslo stolu patří jednomu kolu
+    vklady = set()
+    table_sums = defaultdict(int)
+    for row in session['results']:
+        try:
+            player, na_stole, dokup, zisk, table = (row[key] for key in RESULT_KEYS)
+        except (KeyError, TypeError):
+            raise LeagueFileError(f"{label}: neúplný řádek výsledku {row!r}") from None
+        if not isinstance(player, str) or not player:
+            raise LeagueFileError(f"{label}: neplatné jméno hráče {player!r}")
+        round_no = row.get('Kolo', 1)
+        if type(round_no) is not int or not 1 <= round_no <= MAX_ROUND:
+            raise LeagueFileError(f"{label}: neplatné kolo u hráče {player}")
+        # Ve vícekolovém dni hraje hráč v každém kole jednou
+        if (player, round_no) in seen:
+            raise LeagueFileError(f"{label}: hráč {player} je uveden vícekrát")
+        seen.add((player, round_no))
+        if not (type(na_stole) is int and type(dokup) is int and type(zisk) is int and type(table) is int):
+            raise LeagueFileError(f"{label}: nečíselná hodnota u hráče {player}")
+        if not 1 <= table <= MAX_TABLE:
+            raise LeagueFileError(f"{label}: neplatné číslo stolu u hráče {player}")
+        if table_rounds.setdefault(table, round_no) != round_no:
+            raise LeagueFileError(f"{label}: stůl {table} je uveden ve více kolech")
+        if max(abs(na_stole), abs(dokup), abs(zisk)) > MAX_AMOUNT:
+            raise LeagueFileError(f"{label}: příliš velká částka u hráče {player}")
+        vklady.add(na_stole - dokup - zisk)
+        table_sums[table] += zisk
+
+    if len(vklady) > 1:
+        raise LeagueFileError(f"{label}: zisky neodpovídají jednomu vkladu")
+    for table, total in sorted(table_sums.items()):
+        if total != 0:
+            raise LeagueFileError(f"{label}: nesedí vklady u stolu {table}: rozdíl {-total} Kč")
+
+
+def peek_league_name(stream):
+    """Název ligy ze začátku ligového souboru bez čtení historie (None, pokud není první položkou)"""
+    reader = _Reader(stream, 4096)
+    reader.expect('{')
+    if reader.peek() != '"':
+        return None
+    key = reader.value()
+    reader.expect(':')
+    if key != 'league_name':
+        return None
+    value = reader.value()
+    return value if isinstance(value, str) else None
+
+
+def stream_league(uploaded_file, progress=None, chunk_size=CHUNK_SIZE):
+    """
+    Načte ligový soubor po částech a vrátí slovník s nalezenými položkami league_name, vklad, players
+    a s historií jako SessionStore pod klíčem 'history' (pořadí položek v souboru nehraje roli)
+    progress: volitelná funkce progress(načteno_bajtů, počet_dní) – volá se nejvýš jednou za načtený blok
+    """
+    reader = _Reader(uploaded_file, chunk_size)
+    league = {}
+    store = SessionStore()
+    reported = 0  # Počet bajtů při posledním volání progress
+
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+    else:
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if key == 'sessions':
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.expect(']')
+                else:
+                    while True:
+                        session = reader.value()
+                        validate_session(session, len(store))
+                        store.append(session['date'], session['results'], session.get('group_size', 3))
+                        if progress is not None and reader.bytes_read != reported:
+                            reported = reader.bytes_read
+                            progress(reported, len(store))
+                        if reader.peek() == ',':
+                            reader.expect(',')
+                        else:
+                            reader.expect(']')
+                            break
+            else:
+                value = reader.value()
+                if key == 'players':
+                    _validate_players(value)
+                else:
+                    _validate_setting(key, value)
+                if key in ('league_name', 'vklad', 'players'):
+                    league[key] = value
+            if reader.peek() == ',':
+                reader.expect(',')
+            else:
+                reader.expect('}')
+                break
+
+    if reader.peek() != '':
+        raise LeagueFileError("Za koncem ligového objektu následují další data")
+    if progress is not None:
+        progress(reader.bytes_read, len(store))
+
+    return dict(league, history=store)
@@ -0,0 +1,229 @@
+"""Rozlosování ke stolům švýcarským systémem s penalizací opakovaných dvojic."""
+
+import numpy as np
+
+# Váhy cenové funkce: blízkost v pořadí vs. opakované sezení u stejného stolu
+SCORE_WEIGHT = 1.0
+REPEAT_PENALTY = 5.0
+# Opakované setkání v rámci jednoho hracího dne (více kol) se penalizuje mnohem víc než z historie
+DAY_REPEAT_PENALTY = 100.0
+# Kolik následujících stolů se zkouší při výměnách hráčů
+SWAP_WINDOW = 2
+MAX_PASSES = 20
+
+
+class PairHistory:
+    """
+    Matice společných her dvojic hráčů indexovaná celočíselným id hráče
+    counts[i, j] = kolikrát seděli hráči i a j u jednoho stolu (diagonála = počet stolů hráče)
+    """
+
+    def __init__(self):
+        self.ids = {}  # {jméno: id}
+        self._counts = np.zeros((0, 0), dtype=np.int32)
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        """Sestaví matici z historie hracích dnů"""
+        history = cls()
+        for session in sessions:
+            history.add_session(session)
+        return history
+
+    @classmethod
+    def from_store(cls, store):
+        """Sestaví matici ze sloupcového úložiště historie jedním vektorovým průchodem"""
+        history = cls()
+        for name in store.names:
+            history.player_id(name)
+        players = store.column('player').astype(np.intp)
+        # Řádky seskupené po stolech: klíč (hrací den, stůl)
+        key = store.column('session').astype(np.int64) * 65536 + store.column('table')
+        order = np.argsort(key, kind='stable')
+        key, players = key[order], players[order]
+        np.add.at(history._counts, (players, players), 1)
+        # Dvojice u jednoho stolu jsou řádky se stejným klíčem vzdálené nejvýš o velikost stolu - 1
+        bounds = np.flatnonzero(np.diff(key)) + 1
+        max_table = np.diff(np.concatenate(([0], bounds, [len(key)]))).max() if len(key) else 0
+        for shift in range(1, max_table):
+            same = key[shift:] == key[:-shift]
+            a, b = players[shift:][same], players[:-shift][same]
+            np.add.at(history._counts, (a, b), 1)
+            np.add.at(history._counts, (b, a), 1)
+        return history
+
+    @classmethod
+    def from_pair_counts(cls, pair_counts):
+        """Sestaví matici ze seznamu trojic (hráč, hráč, počet společných her)"""
+        history = cls()
+        for a, b, count in pair_counts:
+            i, j = history.player_id(a), history.player_id(b)
+            history._counts[i, j] += count
+            if i != j:
+                history._counts[j, i] += count
+        return history
+
+    @property
+    def counts(self):
+        n = len(self.ids)
+        return self._counts[:n, :n]
+
+    def player_id(self, name):
+        """Vrátí id hráče, neznámého hráče zaregistruje"""
+        pid = self.ids.get(name)
+        if pid is None:
+            pid = self.ids[name] = len(self.ids)
+            if pid >= self._counts.shape[0]:
+                # Zdvojnásobit kapacitu, aby přidávání hráčů nebylo kvadratické
+                capacity = max(16, 2 * self._counts.shape[0])
+                grown = np.zeros((capacity, capacity), dtype=np.int32)
+                size = self._counts.shape[0]
+                grown[:size, :size] = self._counts
+                self._counts = grown
+        return pid
+
+    def add_table(self, table, count=1):
+        """Započítá jeden stůl (seznam jmen); count=-1 ho odečte"""
+        idx = np.fromiter((self.player_id(p) for p in table), dtype=np.intp, count=len(table))
+        self._counts[np.ix_(idx, idx)] += count
+
+    def add_session(self, session):
+        """Započítá všechny stoly jednoho hracího dne"""
+        for table in session['pairings']:
+            self.add_table(table)
+
+    def submatrix(self, names):
+        """Matice společných her pro zadané hráče (v jejich pořadí), bez diagonály"""
+        idx = np.fromiter((self.player_id(p) for p in names), dtype=np.intp, count=len(names))
+        sub = self._counts[np.ix_(idx, idx)].astype(np.float64)
+        np.fill_diagonal(sub, 0)
+        return sub
+
+
+def table_sizes(num_players, group_size):
+    """Velikosti stolů – přebývající hráči se rozdělí do prvních stolů"""
+    num_groups = num_players // group_size
+    sizes = [group_size] * num_groups
+    for i in range(num_players - num_groups * group_size):
+        sizes[i % num_groups] += 1
+    return sizes
+
+
+def round_table_sizes(num_players, group_size):
+    """
+    Velikosti stolů pro hrací den o více kolech – jen stoly po 3 a 4 hráčích
+    Stůl o 5 hráčích vznikne jen tehdy, když to jinak nejde (přesně 5 hráčů).
+    """
+    if num_players < 6:
+        return [num_players]
+    if group_size >= 4:
+        num_tables = -(-num_players // 4)
+        threes = 4 * num_tables - num_players
+        return [4] * (num_tables - threes) + [3] * threes
+    num_tables = num_players // 3
+    fours = num_players - 3 * num_tables
+    return [4] * fours + [3] * (num_tables - fours)
+
+
+def _as_history(previous_pairings):
+    """Převede předchozí párování (PairHistory nebo seznam stolů) na PairHistory"""
+    if previous_pairings is None or isinstance(previous_pairings, PairHistory):
+        return previous_pairings
+    history = PairHistory()
+    for table in previous_pairings:
+        history.add_table(table)
+    return history
+
+
+def _improve(groups, cost):
+    """Lokální hledání: výměny hráčů mezi blízkými stoly, dokud klesá celková cena"""
+    for _ in range(MAX_PASSES):
+        improved = False
+        for t in range(len(groups)):
+            for u in range(t + 1, min(t + 1 + SWAP_WINDOW, len(groups))):
+                a, b = groups[t], groups[u]
+                own_a = cost[np.ix_(a, a)].sum(axis=1)
+                own_b = cost[np.ix_(b, b)].sum(axis=1)
+                cross = cost[np.ix_(a, b)]
+                # Změna ceny po výměně hráče a[i] za b[j]
+                delta = (cross.sum(axis=1)[:, None] + cross.sum(axis=0)[None, :]
+                         - 2 * cross - own_a[:, None] - own_b[None, :])
+                i, j = np.unravel_index(np.argmin(delta), delta.shape)
+                if delta[i, j] < -1e-9:
+                    a[i], b[j] = b[j], a[i]
+                    improved = True
+        if not improved:
+            break
+    return groups
+
+
+# Funkce pro generování rozlosování švýcarským systémem
+def generate_swiss_pairings(players, group_size=3, previous_pairings=None, seeds=None):
+    """
+    Generuje rozlosování pomocí švýcarského systému
+    players: seznam hráčů s jejich celkovými zisky
+    group_size: počet hráčů u stolu (3 nebo 4)
+    previous_pairings: předchozí párování pro kontrolu opakování – PairHistory nebo seznam stolů
+    seeds: volitelné nasazení {hráč: hodnota} (např. rating) místo celkového zisku
+    """
+    # Seřadit hráče podle nasazení, výchozí je celkový zisk (sestupně)
+    if seeds is None:
+        seeds = {p: data['celkovy_zisk'] for p, data in players.items()}
+    player_names = sorted(players, key=lambda p: seeds[p], reverse=True)
+
+    # Výchozí rozlosování: po sobě jdoucí hráči v pořadí
+    groups, start = [], 0
+    for size in table_sizes(len(player_names), group_size):
+        groups.append(list(range(start, start + size)))
+        start += size
+
+    history = _as_history(previous_pairings)
+    if history is not None and len(groups) > 1:
+        # Cena dvojice: vzdálenost v pořadí (v násobcích stolu) + penalizace za společné hry
+        ranks = np.arange(len(player_names), dtype=np.float64) / group_size
+        cost = SCORE_WEIGHT * (ranks[:, None] - ranks[None, :]) ** 2
+        cost += REPEAT_PENALTY * history.submatrix(player_names)
+        groups = _improve(groups, cost)
+
+    return [[player_names[i] for i in sorted(group)] for group in groups]
+
+
+def _seat(player_names, sizes, cost):
+    """Výchozí rozsazení po sobě jdoucích hráčů v pořadí a jeho zlepšení výměnami"""
+    groups, start = [], 0
+    for size in sizes:
+        groups.append(list(range(start, start + size)))
+        start += size
+    if len(groups) > 1:
+        groups = _improve(groups, cost)
+    return groups
+
+
+def generate_round_pairings(players, group_size=3, num_rounds=2, previous_pairings=None, seeds=None):
+    """
+    Rozlosování všech kol hracího dne najednou
+    Každé kolo je švýcarské rozlosování, navíc se silně penalizují dvojice, které spolu už v tomto dni
+    seděly, a slaběji dvojice z historie. Stoly mají jen 3 nebo 4 hráče (viz round_table_sizes).
+    Vrací seznam kol, každé kolo je seznam stolů (seznamů jmen).
+    """
+    if seeds is None:
+        seeds = {p: data['celkovy_zisk'] for p, data in players.items()}
+    player_names = sorted(players, key=lambda p: seeds[p], reverse=True)
+    sizes = round_table_sizes(len(player_names), group_size)
+
+    ranks = np.arange(len(player_names), dtype=np.float64) / group_size
+    base_cost = SCORE_WEIGHT * (ranks[:, None] - ranks[None, :]) ** 2
+    history = _as_history(previous_pairings)
+    if history is not None:
+        base_cost += REPEAT_PENALTY * history.submatrix(player_names)
+    met_today = np.zeros_like(base_cost)
+
+    rounds = []
+    for _ in range(num_rounds):
+        cost = base_cost + DAY_REPEAT_PENALTY * met_today
+        np.fill_diagonal(cost, 0)
+        groups = _seat(player_names, sizes, cost)
+        for group in groups:
+            met_today[np.ix_(group, group)] += 1
+        rounds.append([[player_names[i] for i in sorted(group)] for group in groups])
+    return rounds
@@ -0,0 +1,103 @@
+"""Volitelné měření doby jednotlivých fází překreslení aplikace a cProfile nejpomalejších běhů."""
+
+import cProfile
+import io
+import marshal
+import pstats
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+HISTORY_SIZE = 50  # Kolik posledních běhů se drží pro každý režim
+KEEP_PROFILES = 3  # Kolik nejpomalejších běhů si drží cProfile výpis
+OTHER_PHASE = 'Widgety a ostatní'
+
+
+class RerunProfiler:
+    """
+    Měří fáze jednoho běhu skriptu (phase) a drží klouzavou historii po režimech navigace
+    Vypnutý profiler nic neměří – phase() je pak jen prázdný kontext.
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE, keep_profiles=KEEP_PROFILES):
+        self.enabled = False
+        self.use_cprofile = False
+        self.keep_profiles = keep_profiles
+        self.history = defaultdict(lambda: deque(maxlen=history_size))  # {režim: deque({fáze: s})}
+        self.slowest = []  # [{'total', 'mode', 'text', 'prof'}] seřazené od nejpomalejšího
+        self._phases = None
+        self._start = None
+        self._profile = None
+
+    def start(self):
+        """Začátek běhu skriptu"""
+        if self._profile is not None:
+            # Předchozí běh skončil předčasně (st.rerun) a finish() se nezavolal
+            self._profile.disable()
+            self._profile = None
+        if not self.enabled:
+            self._phases = None
+            return
+        self._phases = {}
+        self._start = time.perf_counter()
+        if self.use_cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    @contextmanager
+    def phase(self, name):
+        """Přičte dobu bloku k fázi `name` aktuálního běhu"""
+        if self._phases is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = self._phases.get(name, 0.0) + time.perf_counter() - start
+
+    def finish(self, mode):
+        """Konec běhu skriptu – uloží časy do historie režimu"""
+        if self._phases is None:
+            return
+        total = time.perf_counter() - self._start
+        phases = dict(self._phases)
+        phases[OTHER_PHASE] = max(total - sum(phases.values()), 0.0)
+        phases['Celkem'] = total
+        self.history[mode].append(phases)
+        self._phases = None
+
+        if self._profile is not None:
+            self._profile.disable()
+            self._keep_profile(total, mode, self._profile)
+            self._profile = None
+
+    def _keep_profile(self, total, mode, profile):
+        if len(self.slowest) >= self.keep_profiles and total <= self.slowest[-1]['total']:
+            return
+        stats = pstats.Stats(profile)
+        text = io.StringIO()
+        stats.stream = text
+        stats.sort_stats('cumulative').print_stats(30)
+        self.slowest.append({
+            'total': total,
+            'mode': mode,
+            'text': text.getvalue(),
+            'prof': marshal.dumps(stats.stats),  # Formát souboru .prof (pstats / snakeviz)
+        })
+        self.slowest.sort(key=lambda p: p['total'], reverse=True)
+        del self.slowest[self.keep_profiles:]
+
+    def summary(self, mode):
+        """Medián, průměr a maximum každé fáze v ms za poslední běhy režimu"""
+        runs = self.history.get(mode)
+        if not runs:
+            return pd.DataFrame()
+        frame = pd.DataFrame(list(runs)).fillna(0.0) * 1000
+        return pd.DataFrame({
+            'Medián (ms)': frame.median(),
+            'Průměr (ms)': frame.mean(),
+            'Max (ms)': frame.max(),
+        }).round(2)
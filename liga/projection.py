@@ -0,0 +1,96 @@
+"""
+Monte Carlo projekce konečného pořadí ligy.
+
+Zbývající hrací dny se simulují najednou pro všechny simulace: každý hráč přijde s pravděpodobností
+své dosavadní docházky a jeho zisk se losuje z jeho vlastních historických zisků (hráč bez historie
+losuje ze zisků celé ligy). Simulace lze rozdělit do dávek a spustit v procesech.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+BATCH_SIZE = 20_000  # Simulací v jedné dávce – omezuje paměť na dávka × počet hráčů
+
+
+def _simulate_ranks(totals, pool, offsets, counts, attendance, remaining_days, num_simulations, seed):
+    """
+    Odsimuluje num_simulations konců sezóny a vrátí počty umístění (hráč × pořadí)
+    pool: zřetězené historické zisky hráčů, offsets/counts: úsek každého hráče v poolu
+    """
+    rng = np.random.default_rng(seed)
+    num_players = len(totals)
+    rank_counts = np.zeros((num_players, num_players), dtype=np.int64)
+    player_rows = np.arange(num_players) * num_players
+    # Zisky jsou celá čísla – odečtený zlomek rozhodne shodu podle aktuálního pořadí hráčů
+    tie_break = np.arange(num_players) / (num_players + 1)
+    chance = np.maximum(attendance, 1e-12).astype(np.float32)
+    last = offsets + counts - 1
+
+    for start in range(0, num_simulations, BATCH_SIZE):
+        size = min(BATCH_SIZE, num_simulations - start)
+        final = np.broadcast_to(totals - tie_break, (size, num_players)).copy()
+        for _ in range(remaining_days):
+            # Jedno náhodné číslo na hráče a den: u < docházka znamená účast a u / docházka
+            # je pak opět rovnoměrné na [0, 1) a vybere zisk z úseku hráče
+            u = rng.random((size, num_players), dtype=np.float32)
+            picks = np.minimum(offsets + (u / chance * counts).astype(np.int64), last)
+            final += np.where(u < chance, pool[picks], 0)
+        # Pořadí v každé simulaci (0 = první)
+        order = np.argsort(-final, axis=1)
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(num_players), axis=1)
+        rank_counts += np.bincount(
+            (player_rows + ranks).ravel(), minlength=num_players * num_players
+        ).reshape(num_players, num_players)
+    return rank_counts
+
+
+def project_standings(totals, samples, attendance, remaining_days, num_simulations=100_000, workers=None, seed=None):
+    """
+    Pravděpodobnosti konečného pořadí hráčů
+    totals: {hráč: aktuální celkový zisk} v pořadí průběžné tabulky
+    samples: {hráč: pole historických zisků za hrací den}
+    attendance: {hráč: pravděpodobnost účasti na hracím dni}
+    workers: počet procesů (None = bez procesů)
+    Vrací DataFrame (index hráč) se sloupci Celkový zisk, Očekávaný zisk a pravděpodobnostmi pořadí 1., 2., ...
+    """
+    names = list(totals)
+    if not names:
+        return pd.DataFrame()
+    total_values = np.array([totals[n] for n in names], dtype=np.float64)
+    everyone = np.concatenate([np.asarray(samples.get(n, ()), dtype=np.float64) for n in names] + [np.zeros(0)])
+    if not len(everyone):
+        everyone = np.zeros(1)
+
+    # Zřetězené úseky zisků; hráč bez historie dostane úsek se zisky celé ligy
+    parts = [np.asarray(samples[n], dtype=np.float64) if len(samples.get(n, ())) else everyone for n in names]
+    counts = np.array([len(p) for p in parts], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    pool = np.concatenate(parts)
+    chance = np.array([attendance.get(n, 1.0) for n in names], dtype=np.float64)
+
+    args = (total_values, pool, offsets, counts, chance, remaining_days)
+    seeds = np.random.SeedSequence(seed)
+    if workers and workers > 1 and num_simulations > BATCH_SIZE:
+        chunks = np.array_split(np.arange(num_simulations), workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool_executor:
+            futures = [
+                pool_executor.submit(_simulate_ranks, *args, len(chunk), child)
+                for chunk, child in zip(chunks, seeds.spawn(workers))
+            ]
+            rank_counts = sum(f.result() for f in futures)
+    else:
+        rank_counts = _simulate_ranks(*args, num_simulations, seeds)
+
+    # Očekávaný konečný zisk bez simulace: průměr zisku za den × očekávaný počet účastí
+    means = np.array([p.mean() for p in parts])
+    frame = pd.DataFrame(
+        rank_counts / num_simulations,
+        index=pd.Index(names, name='Hráč'),
+        columns=[f"{rank}." for rank in range(1, len(names) + 1)]
+    )
+    frame.insert(0, 'Celkový zisk', total_values.astype(np.int64))
+    frame.insert(1, 'Očekávaný zisk', np.round(total_values + means * chance * remaining_days, 1))
+    return frame
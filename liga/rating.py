@@ -0,0 +1,116 @@
+"""
+Elo rating pro stoly více hráčů – každý stůl se počítá jako souboj všech dvojic u něj.
+
+Hráč u stolu o n hráčích dostane K / (n - 1) krát součet (skutečný výsledek - očekávaný) přes
+všechny soupeře u stolu; výsledek dvojice určuje porovnání zisků (výhra 1, remíza 0.5, prohra 0).
+Všechny stoly jednoho hracího dne (i všech jeho kol) se počítají z ratingů před tímto dnem.
+"""
+
+import numpy as np
+import pandas as pd
+
+from liga.history import table_pairs
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+SCALE = 400.0  # Rozdíl ratingů, při kterém je očekávaný výsledek 10 : 1
+
+
+class Ratings:
+    """
+    Ratingy hráčů indexované id hráče ze sloupcového úložiště historie
+    Po uložení hracího dne se přepočítají jen jeho stoly (apply_session); pro import je
+    k dispozici úplné přehrání celé historie (from_store, from_rows).
+    """
+
+    def __init__(self, ids=None):
+        self.ids = ids if ids is not None else {}  # {jméno: id} – sdílené s úložištěm historie
+        self._values = np.full(16, INITIAL_RATING)
+
+    @classmethod
+    def from_store(cls, store):
+        """Přehraje celou historii ze SessionStore"""
+        return cls.from_rows(
+            store.ids, store.column('session'), store.column('player'), store.column('table'), store.column('zisk')
+        )
+
+    @classmethod
+    def from_rows(cls, ids, session, player, table, zisk):
+        """Přehraje historii zadanou sloupci řádků výsledků (v libovolném pořadí)"""
+        ratings = cls(ids)
+        ratings._replay(np.asarray(session), np.asarray(player), np.asarray(table), np.asarray(zisk))
+        return ratings
+
+    def _grow(self, size):
+        if size > len(self._values):
+            grown = np.full(max(size, 2 * len(self._values)), INITIAL_RATING)
+            grown[:len(self._values)] = self._values
+            self._values = grown
+
+    def _replay(self, session, player, table, zisk):
+        """
+        Vektorové přehrání řádků: dvojice u stolů se sestaví jednou pro celou historii,
+        po hracích dnech se pak jen sčítají změny ratingů
+        """
+        key = session.astype(np.int64) * 65536 + table
+        order = np.argsort(key, kind='stable')
+        key, session, player, zisk = key[order], session[order], player[order].astype(np.intp), zisk[order]
+        if len(player):
+            self._grow(int(player.max()) + 1)
+
+        a, b, row_sizes = table_pairs(key)
+        if not len(a):
+            return
+        score = 0.5 * (1.0 + np.sign(zisk[a] - zisk[b]))
+        weight = K_FACTOR / np.maximum(row_sizes - 1, 1)
+        pa, pb, wa, wb = player[a], player[b], weight[a], weight[b]
+
+        # Dvojice jsou seřazené podle řádku a, tedy i podle hracího dne
+        pair_session = session[a]
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(pair_session)) + 1, [len(a)]))
+        values = self._values
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            ia, ib = pa[lo:hi], pb[lo:hi]
+            expected = 1.0 / (1.0 + 10.0 ** ((values[ib] - values[ia]) / SCALE))
+            diff = score[lo:hi] - expected
+            # Změny všech stolů dne (i více kol) se počítají z ratingů před dnem a sčítají se
+            np.add.at(values, ia, wa[lo:hi] * diff)
+            np.add.at(values, ib, -wb[lo:hi] * diff)
+
+    def apply_session(self, store, session_idx):
+        """Započítá jen stoly jednoho (nově uloženého) hracího dne"""
+        self.apply_rows(store, store.session_slice(session_idx))
+
+    def apply_rows(self, store, rows):
+        """Započítá řádky rows ze SessionStore (celé hrací dny v pořadí)"""
+        self._replay(
+            store.column('session')[rows], store.column('player')[rows],
+            store.column('table')[rows], store.column('zisk')[rows]
+        )
+
+    def state(self):
+        """Kopie ratingů pro kontrolní bod"""
+        return self._values.copy()
+
+    def restore(self, values=None):
+        """Vrátí ratingy do stavu kontrolního bodu (None = všichni výchozí rating)"""
+        self._values = np.full(16, INITIAL_RATING)
+        if values is not None:
+            self._grow(len(values))
+            self._values[:len(values)] = values
+
+    def rating(self, name):
+        """Rating hráče (nový hráč bez odehraných dní má výchozí rating)"""
+        pid = self.ids.get(name)
+        return float(self._values[pid]) if pid is not None and pid < len(self._values) else INITIAL_RATING
+
+    def seeds(self, names):
+        """{jméno: rating} pro nasazení do rozlosování"""
+        return {name: self.rating(name) for name in names}
+
+    def frame(self, names):
+        """Tabulka hráčů seřazená podle ratingu"""
+        frame = pd.DataFrame({'Hráč': list(names), 'Rating': [round(self.rating(n), 1) for n in names]})
+        frame = frame.sort_values('Rating', ascending=False, kind='stable').reset_index(drop=True)
+        frame.insert(0, 'Pořadí', range(1, len(frame) + 1))
+        return frame
@@ -0,0 +1,94 @@
+"""Průběžná tabulka udržovaná inkrementálně – po uložení hracího dne se přepočítají jen dotčení hráči."""
+
+from bisect import bisect_left, insort
+
+import pandas as pd
+
+STANDINGS_COLUMNS = ['Pořadí', 'Hráč', 'Celkový zisk', 'Počet dní', 'Průměrný zisk']
+
+
+class Standings:
+    """
+    Seřazené pořadí hráčů podle celkového zisku
+    Klíč řazení je (-zisk, pořadové číslo přidání), takže při shodě zisku drží hráči stabilní pořadí.
+    """
+
+    def __init__(self, players=None):
+        self._rows = {}  # {jméno: [celkovy_zisk, pocet_dnu, pořadové číslo]}
+        self._order = []  # Seřazené klíče (-zisk, pořadové číslo, jméno)
+        self._seq = 0
+        self._frame = None  # Naposledy sestavený DataFrame (None = je třeba sestavit celý)
+        self._dirty = None  # Rozsah pozic (od, do), které je třeba v DataFrame přepsat
+        for name, data in (players or {}).items():
+            self.add_player(name, data['celkovy_zisk'], data['pocet_dnu'])
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _key(self, name):
+        zisk, _, seq = self._rows[name]
+        return (-zisk, seq, name)
+
+    def add_player(self, name, celkovy_zisk=0, pocet_dnu=0):
+        """Zařadí nového hráče do tabulky"""
+        self._rows[name] = [celkovy_zisk, pocet_dnu, self._seq]
+        self._seq += 1
+        insort(self._order, self._key(name))
+        self._frame = None
+
+    def remove_player(self, name):
+        """Vyřadí hráče z tabulky"""
+        del self._order[bisect_left(self._order, self._key(name))]
+        del self._rows[name]
+        self._frame = None
+
+    def apply_results(self, results):
+        """Započítá výsledky jednoho hracího dne – přeřadí jen hráče, kteří hráli"""
+        # Ve vícekolovém dni má hráč více řádků, den se mu ale počítá jednou
+        day_totals = {}
+        for result in results:
+            day_totals[result['Hráč']] = day_totals.get(result['Hráč'], 0) + result['Zisk']
+        for name, zisk in day_totals.items():
+            old_pos = bisect_left(self._order, self._key(name))
+            del self._order[old_pos]
+            row = self._rows[name]
+            row[0] += zisk
+            row[1] += 1
+            new_pos = bisect_left(self._order, self._key(name))
+            self._order.insert(new_pos, self._key(name))
+            # Hráči mezi starou a novou pozicí se posunuli o jedno místo
+            lo, hi = min(old_pos, new_pos), max(old_pos, new_pos)
+            if self._dirty is not None:
+                lo, hi = min(lo, self._dirty[0]), max(hi, self._dirty[1])
+            self._dirty = (lo, hi)
+
+    def rank(self, name):
+        """Pořadí hráče (od 1)"""
+        return bisect_left(self._order, self._key(name)) + 1
+
+    def _columns(self, lo, hi):
+        """Hodnoty sloupců pro pozice lo..hi včetně"""
+        names = [key[2] for key in self._order[lo:hi + 1]]
+        zisky = [self._rows[name][0] for name in names]
+        dny = [self._rows[name][1] for name in names]
+        prumery = [round(z / d, 2) if d > 0 else 0.0 for z, d in zip(zisky, dny)]
+        return names, zisky, dny, prumery
+
+    def frame(self):
+        """Tabulka jako DataFrame ve formátu stránky Průběžná tabulka, sestavená jen po změně"""
+        if self._frame is None:
+            names, zisky, dny, prumery = self._columns(0, len(self._order) - 1)
+            self._frame = pd.DataFrame({
+                'Pořadí': range(1, len(names) + 1),
+                'Hráč': names,
+                'Celkový zisk': zisky,
+                'Počet dní': dny,
+                'Průměrný zisk': pd.Series(prumery, dtype='float64')
+            }, columns=STANDINGS_COLUMNS)
+        elif self._dirty is not None:
+            # Přepsat jen řádky, jejichž pořadí se změnilo
+            lo, hi = self._dirty
+            for column, values in zip(STANDINGS_COLUMNS[1:], self._columns(lo, hi)):
+                self._frame.iloc[lo:hi + 1, self._frame.columns.get_loc(column)] = values
+        self._dirty = None
+        return self._frame
@@ -0,0 +1,62 @@
+"""Generátor syntetických lig pro měření výkonu – výsledky u každého stolu mají vyrovnané vklady."""
+
+import random
+from datetime import date, timedelta
+
+from liga.pairing import round_table_sizes
+
+
+def generate_league(num_players, num_days, vklad=100, attendance=(0.6, 1.0), seed=0):
+    """
+    Vytvoří ligu ve formátu ligového souboru (slovník pro save_league / LeagueEngine)
+    num_players: počet hráčů ligy
+    num_days: počet odehraných hracích dnů (jeden týdně)
+    attendance: rozsah podílu přítomných hráčů v jednom dni
+    """
+    rng = random.Random(seed)
+    names = [f"Hráč {i + 1}" for i in range(num_players)]
+    players = {name: {'celkovy_zisk': 0, 'pocet_dnu': 0} for name in names}
+    start = date(2020, 1, 1)
+    sessions = []
+
+    for day in range(num_days):
+        group_size = rng.choice((3, 4))
+        # Aspoň 6 přítomných, aby šli rozsadit jen ke stolům po 3 a 4 hráčích
+        count = max(6, round(num_players * rng.uniform(*attendance)))
+        present = rng.sample(names, min(count, num_players))
+
+        pairings, results, offset = [], [], 0
+        for table_idx, size in enumerate(round_table_sizes(len(present), group_size)):
+            table = present[offset:offset + size]
+            offset += size
+            pairings.append(table)
+            # Zisky v násobcích 10, poslední hráč dorovná součet na nulu
+            zisky = [rng.randint(-15, 15) * 10 for _ in range(size - 1)]
+            zisky.append(-sum(zisky))
+            for player, zisk in zip(table, zisky):
+                # Kdo prohrál víc než vklad, musel dokupovat
+                dokup = max(0, -(vklad + zisk) + 99) // 100 * 100
+                results.append({
+                    'Hráč': player,
+                    'Na stole': vklad + dokup + zisk,
+                    'Dokup': dokup,
+                    'Zisk': zisk,
+                    'Stůl': table_idx + 1
+                })
+                players[player]['celkovy_zisk'] += zisk
+                players[player]['pocet_dnu'] += 1
+
+        sessions.append({
+            'date': (start + timedelta(days=7 * day)).strftime('%Y-%m-%d'),
+            'players': present,
+            'group_size': group_size,
+            'pairings': pairings,
+            'results': results
+        })
+
+    return {
+        'league_name': f"Syntetická liga {num_players}x{num_days}",
+        'vklad': vklad,
+        'players': players,
+        'sessions': sessions
+    }
@@ -0,0 +1,224 @@
+"""
+Vzhled aplikace z lokálních souborů – textury a logo leží ve složce static/ vedle marias_liga.py.
+
+Streamlit je servíruje jako statické soubory (server.enableStaticServing v .streamlit/config.toml),
+takže je prohlížeč stáhne jen jednou a aplikace se vykreslí i bez připojení k internetu.
+Soubory, které ve static/ chybí (např. v čerstvém klonu), nahradí CSS vzory a vložené SVG logo,
+takže se aplikace nikdy nepřipojuje k cizím serverům. Původní obrázky lze volitelně stáhnout příkazem:
+    python -m liga.theme
+"""
+
+import os
+import urllib.request
+from string import Template
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+STATIC_URL = 'app/static'
+
+# Lokální soubory vzhledu a odkud je stáhnout: {soubor: (zástupný symbol v CSS nebo None, původní adresa)}
+ASSETS = {
+    'card_back_texture.jpg': (
+        'card_back_texture',
+        'https://img41.rajce.idnes.cz/d4102/19/19642/19642596_185bd55429092dbd5dccd20ff2c485cb/images/card_back_texture.jpg?ver=0'
+    ),
+    'paper.jpg': (
+        'paper',
+        'https://img41.rajce.idnes.cz/d4102/19/19642/19642596_185bd55429092dbd5dccd20ff2c485cb/images/paper.jpg?ver=0'
+    ),
+    'marias.png': (None, 'https://marias-turnaj.zya.me/marias.png'),
+}
+LOGO_FILE = 'marias.png'
+
+# Náhrady chybějících souborů – jen CSS a vložené SVG, bez síťového připojení
+FALLBACK_BACKGROUNDS = {
+    # Rub karet: kosočtverečné šrafování (periody v procentech, aby na sebe dlaždice 100x100 navazovaly)
+    'card_back_texture': (
+        "background-image: repeating-linear-gradient(45deg, rgba(255, 255, 255, 0.07) 0 3%, transparent 3% 10%), "
+        "repeating-linear-gradient(-45deg, rgba(0, 0, 0, 0.10) 0 3%, transparent 3% 10%);"
+    ),
+    # Papír: teplý podklad s jemnými vodorovnými vlákny
+    'paper': (
+        "background-image: repeating-linear-gradient(0deg, rgba(120, 90, 50, 0.04) 0 1px, transparent 1px 3px), "
+        "linear-gradient(#fbf6ea, #fbf6ea);"
+    ),
+}
+LOGO_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="240" height="120" viewBox="0 0 240 120">
+<rect x="4" y="4" width="232" height="112" rx="16" fill="#8b5e3c" stroke="#5c3a1e" stroke-width="4"/>
+<text x="120" y="62" font-family="Georgia, serif" font-size="38" font-weight="bold" fill="#fff8ec"
+ text-anchor="middle">Mariáš</text>
+<text x="120" y="96" font-family="Segoe UI, sans-serif" font-size="24" fill="#f2d9b8"
+ text-anchor="middle">&#9829; &#9824; &#9827; &#9830;</text>
+</svg>"""
+
+THEME_CSS = Template("""
+<style>
+/* Odsazení celého hlavního obsahu od horního okraje */
+main > div:has(.block-container) {
+    padding-top: 60px;
+}
+.stApp {
+    $card_back_texture
+    background-color: #8b5e3c;  /* Barva rubu karet pod texturou */
+    background-repeat: repeat;
+    background-size: 100px 100px;
+    background-attachment: fixed;
+    font-family: 'Segoe UI', sans-serif;
+}
+
+/* Pozadí hlavního kontejneru – textura papíru */
+.block-container {
+    $paper
+    background-repeat: repeat;
+    background-size: 300px 300px;
+    background-color: rgba(255, 255, 255, 0.75);
+    border-radius: 16px;
+    padding: 2rem;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+}
+
+h1 {
+    margin-top: 0px;
+    text-align: left;
+    color: #2c2c2c;
+    text-shadow: 1px 1px 1px #fff9;
+}
+
+h2, h3 {
+    color: #2c2c2c;
+    text-shadow: 1px 1px 1px #fff9;
+}
+
+.param-container {
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    gap: 1rem;
+    margin-bottom: 2rem;
+}
+
+.param-container .stNumberInput, 
+.param-container div[data-baseweb="select"] {
+    width: 300px !important;
+}
+
+.stTextInput, .stNumberInput, .stSelectbox {
+    background-color: #ffffffcc;
+    border-radius: 8px;
+}
+
+button[kind="primary"] {
+    background-color: #8b5e3c;
+    color: white;
+    border-radius: 8px;
+    border: none;
+    padding: 0.5rem 1.5rem;
+    font-weight: bold;
+}
+
+button[kind="primary"]:hover {
+    background-color: #5c3a1e;
+}
+
+.player-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 1rem 0;
+}
+
+.player-table th, .player-table td {
+    border: 1px solid #8b5e3c;
+    padding: 8px;
+    text-align: left;
+}
+
+.player-table th {
+    background-color: #8b5e3c;
+    color: white;
+}
+
+.player-table tr:nth-child(even) {
+    background-color: #f2f2f2;
+}
+
+.player-table tr:hover {
+    background-color: #e6e6e6;
+}
+
+.highlight-winner {
+    background-color: #d4edda !important;
+    font-weight: bold;
+}
+
+.highlight-loser {
+    background-color: #f8d7da !important;
+}
+
+.session-table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 1rem 0;
+}
+
+.session-table th, .session-table td {
+    border: 1px solid #8b5e3c;
+    padding: 8px;
+    text-align: center;
+}
+
+.session-table th {
+    background-color: #8b5e3c;
+    color: white;
+}
+</style>
+""")
+
+
+def asset_path(name, static_dir=STATIC_DIR):
+    """Cesta k lokálnímu souboru vzhledu, nebo None, pokud chybí"""
+    path = os.path.join(static_dir, name)
+    return path if os.path.isfile(path) else None
+
+
+def build_css(static_dir=STATIC_DIR):
+    """CSS aplikace s lokálními texturami, chybějící nahradí CSS vzor (stačí sestavit jednou za běh procesu)"""
+    backgrounds = {}
+    for name, (placeholder, _) in ASSETS.items():
+        if placeholder is not None:
+            found = asset_path(name, static_dir)
+            backgrounds[placeholder] = (
+                f"background-image: url('{STATIC_URL}/{name}');" if found else FALLBACK_BACKGROUNDS[placeholder]
+            )
+    return THEME_CSS.substitute(backgrounds)
+
+
+def logo_path(static_dir=STATIC_DIR):
+    """Cesta k logu v hlavičce, nebo None"""
+    return asset_path(LOGO_FILE, static_dir)
+
+
+def logo_source(static_dir=STATIC_DIR):
+    """Logo pro st.image – obsah lokálního souboru, nebo vložené SVG logo, pokud soubor chybí"""
+    path = logo_path(static_dir)
+    if path is None:
+        return LOGO_SVG
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def fetch_assets(static_dir=STATIC_DIR):
+    """Stáhne chybějící soubory vzhledu z původních adres (volitelné, bez nich se použijí náhrady)"""
+    os.makedirs(static_dir, exist_ok=True)
+    for name, (_, url) in ASSETS.items():
+        path = os.path.join(static_dir, name)
+        if os.path.isfile(path):
+            continue
+        with urllib.request.urlopen(url, timeout=30) as response:
+            data = response.read()
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+        print(f"{name}: {len(data)} B")
+
+
+if __name__ == '__main__':
+    fetch_assets()
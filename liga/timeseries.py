@@ -0,0 +1,114 @@
+"""Kumulativní zisk a pořadí hráčů po každém hracím dni (tabulka hrací den × hráč)."""
+
+import numpy as np
+import pandas as pd
+
+
+def _ranks(cumulative, played):
+    """Pořadí (od 1) v každém řádku; hráč, který ještě nehrál, má 0"""
+    joined = played > 0
+    key = np.where(joined, -cumulative, np.iinfo(np.int64).max)
+    order = np.argsort(key, axis=1, kind='stable')
+    ranks = np.empty(order.shape, dtype=np.int32)
+    np.put_along_axis(ranks, order, np.arange(1, order.shape[1] + 1, dtype=np.int32), axis=1)
+    ranks[~joined] = 0
+    return ranks
+
+
+class TimeSeries:
+    """
+    Kumulativní zisk a pořadí hráčů po každém hracím dni, sloupce jsou id hráčů z historie
+    Celá tabulka se sestaví jedním vektorovým průchodem, každý uložený den přidá jen jeden řádek.
+    """
+
+    def __init__(self, ids=None):
+        self.ids = ids if ids is not None else {}  # {jméno: id} – sdílené s úložištěm historie
+        self.days = 0
+        self._dates = np.zeros(16, dtype='datetime64[D]')
+        self._cumulative = np.zeros((16, 16), dtype=np.int64)
+        self._ranks = np.zeros((16, 16), dtype=np.int32)
+        self._played = np.zeros(16, dtype=np.int64)  # Odehrané dny hráčů po posledním řádku
+
+    @classmethod
+    def from_store(cls, store):
+        """Sestaví tabulku ze SessionStore"""
+        return cls.from_rows(
+            store.ids, store.dates(), store.column('session'), store.column('player'), store.column('zisk')
+        )
+
+    @classmethod
+    def from_rows(cls, ids, dates, session, player, zisk):
+        """Sestaví tabulku ze sloupců řádků výsledků a dat hracích dnů"""
+        series = cls(ids)
+        num_days = len(dates)
+        num_players = max(len(ids), int(player.max()) + 1 if len(player) else 0)
+        series._reserve(num_days, num_players)
+        if num_days:
+            # Pivot hrací den × hráč a kumulativní součty po sloupcích
+            gains = np.zeros((num_days, num_players), dtype=np.int64)
+            counts = np.zeros((num_days, num_players), dtype=np.int64)
+            np.add.at(gains, (session, player), zisk)
+            np.add.at(counts, (session, player), 1)
+            cumulative = np.cumsum(gains, axis=0)
+            played = np.cumsum(counts, axis=0)
+            series._cumulative[:num_days, :num_players] = cumulative
+            series._ranks[:num_days, :num_players] = _ranks(cumulative, played)
+            series._played[:num_players] = played[-1]
+            series._dates[:num_days] = dates
+            series.days = num_days
+        return series
+
+    def _reserve(self, num_days, num_players):
+        """Zvětší pole (zdvojnásobením), aby se vešlo num_days řádků a num_players sloupců"""
+        rows, cols = self._cumulative.shape
+        if num_days <= rows and num_players <= cols:
+            return
+        if num_days > rows:
+            rows = max(num_days, 2 * rows)
+        if num_players > cols:
+            cols = max(num_players, 2 * cols)
+        for name in ('_cumulative', '_ranks'):
+            old = getattr(self, name)
+            grown = np.zeros((rows, cols), dtype=old.dtype)
+            grown[:old.shape[0], :old.shape[1]] = old
+            setattr(self, name, grown)
+        dates = np.zeros(rows, dtype='datetime64[D]')
+        dates[:len(self._dates)] = self._dates
+        self._dates = dates
+        played = np.zeros(cols, dtype=np.int64)
+        played[:len(self._played)] = self._played
+        self._played = played
+
+    def append(self, session_date, player, zisk):
+        """Přidá řádek za jeden hrací den (pole id hráčů a jejich zisků)"""
+        day = self.days
+        num_players = max(len(self.ids), int(player.max()) + 1 if len(player) else 0)
+        self._reserve(day + 1, num_players)
+        row = self._cumulative[day - 1].copy() if day else np.zeros(self._cumulative.shape[1], dtype=np.int64)
+        np.add.at(row, player, zisk)
+        np.add.at(self._played, player, 1)
+        cols = self._cumulative.shape[1]
+        self._cumulative[day] = row
+        self._ranks[day] = _ranks(row[None, :], self._played[None, :cols])[0]
+        self._dates[day] = np.datetime64(session_date, 'D')
+        self.days = day + 1
+
+    def append_session(self, store, session_idx):
+        """Přidá řádek za nově uložený hrací den ze SessionStore"""
+        rows = store.session_slice(session_idx)
+        self.append(store.session_date(session_idx), store.column('player')[rows], store.column('zisk')[rows])
+
+    def frame(self, names, kind='zisk'):
+        """
+        Vývoj vybraných hráčů jako DataFrame (index datum hracího dne, sloupec na hráče)
+        kind: 'zisk' = kumulativní zisk, 'rank' = pořadí (před prvním odehraným dnem prázdné)
+        """
+        names = [name for name in names if name in self.ids]
+        idx = np.array([self.ids[name] for name in names], dtype=np.intp)
+        index = pd.DatetimeIndex(self._dates[:self.days], name='Datum')
+        if kind == 'rank':
+            values = self._ranks[:self.days, idx].astype(np.float64)
+            values[values == 0] = np.nan
+        else:
+            values = self._cumulative[:self.days, idx]
+        return pd.DataFrame(values, index=index, columns=names)
@@ -1,249 +1,141 @@
+import os
+import uuid
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-from collections import defaultdict
-import random
-import math
-import json
-import io
+
+from liga import LeagueEngine, LeagueFileError
+from liga.autosave import Autosaver, list_backups
+from liga.database import ConcurrentUpdateError, DatabaseLeague, LeagueDatabase
+from liga.engine import RESULT_COLUMNS, ROUND_COLUMN, evaluate_results, results_grid, results_to_records
+from liga.export import EXPORT_FORMATS
+from liga.profiling import RerunProfiler
+from liga.theme import build_css, logo_source
 
 st.set_page_config(layout="centered", page_title="Mariášová Liga")
-st.markdown(
-    """
-    <style>
-    /* Odsazení celého hlavního obsahu od horního okraje */
-    main > div:has(.block-container) {
-        padding-top: 60px;
-    }
-    .stApp {
-        background-image: url('https://img41.rajce.idnes.cz/d4102/19/19642/19642596_185bd55429092dbd5dccd20ff2c485cb/images/card_back_texture.jpg?ver=0');
-        background-repeat: repeat;
-        background-size: 100px 100px;
-        background-attachment: fixed;
-        font-family: 'Segoe UI', sans-serif;
-    }
-
-    /* Pozadí hlavního kontejneru – textura papíru */
-    .block-container {
-        background-image: url('https://img41.rajce.idnes.cz/d4102/19/19642/19642596_185bd55429092dbd5dccd20ff2c485cb/images/paper.jpg?ver=0');
-        background-repeat: repeat;
-        background-size: 300px 300px;
-        background-color: rgba(255, 255, 255, 0.75);
-        border-radius: 16px;
-        padding: 2rem;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    }
-
-    h1 {
-        margin-top: 0px;
-        text-align: left;
-        color: #2c2c2c;
-        text-shadow: 1px 1px 1px #fff9;
-    }
-
-    h2, h3 {
-        color: #2c2c2c;
-        text-shadow: 1px 1px 1px #fff9;
-    }
-    
-    .param-container {
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        gap: 1rem;
-        margin-bottom: 2rem;
-    }
-
-    .param-container .stNumberInput, 
-    .param-container div[data-baseweb="select"] {
-        width: 300px !important;
-    }
-
-    .stTextInput, .stNumberInput, .stSelectbox {
-        background-color: #ffffffcc;
-        border-radius: 8px;
-    }
-
-    button[kind="primary"] {
-        background-color: #8b5e3c;
-        color: white;
-        border-radius: 8px;
-        border: none;
-        padding: 0.5rem 1.5rem;
-        font-weight: bold;
-    }
-
-    button[kind="primary"]:hover {
-        background-color: #5c3a1e;
-    }
-    
-    .player-table {
-        width: 100%;
-        border-collapse: collapse;
-        margin: 1rem 0;
-    }
-    
-    .player-table th, .player-table td {
-        border: 1px solid #8b5e3c;
-        padding: 8px;
-        text-align: left;
-    }
-    
-    .player-table th {
-        background-color: #8b5e3c;
-        color: white;
-    }
-    
-    .player-table tr:nth-child(even) {
-        background-color: #f2f2f2;
-    }
-    
-    .player-table tr:hover {
-        background-color: #e6e6e6;
-    }
-    
-    .highlight-winner {
-        background-color: #d4edda !important;
-        font-weight: bold;
-    }
-    
-    .highlight-loser {
-        background-color: #f8d7da !important;
-    }
-    
-    .session-table {
-        width: 100%;
-        border-collapse: collapse;
-        margin: 1rem 0;
-    }
-    
-    .session-table th, .session-table td {
-        border: 1px solid #8b5e3c;
-        padding: 8px;
-        text-align: center;
-    }
-    
-    .session-table th {
-        background-color: #8b5e3c;
-        color: white;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
 
-# Inicializace session state
-if 'players' not in st.session_state:
-    st.session_state.players = {}  # Slovník všech hráčů: {jméno: {'celkovy_zisk': 0, 'pocet_dnu': 0}}
-    
-if 'sessions' not in st.session_state:
-    st.session_state.sessions = []  # Seznam sezení: každé sezení je slovník s daty a výsledky
-    
-if 'current_session' not in st.session_state:
-    st.session_state.current_session = None  # Aktuální sezení, které se právě zadává
-    
-if 'vklad' not in st.session_state:
-    st.session_state.vklad = 100  # Výchozí vklad
-
-if 'league_name' not in st.session_state:
-    st.session_state.league_name = "Mariášová Liga"
-
-# Funkce pro výpočet statistik hráčů
-def calculate_player_stats():
-    """Vypočítá statistiky pro všechny hráče"""
-    player_stats = {}
-    for player in st.session_state.players:
-        total_zisk = st.session_state.players[player]['celkovy_zisk']
-        pocet_dnu = st.session_state.players[player]['pocet_dnu']
-        prumer_zisk = total_zisk / pocet_dnu if pocet_dnu > 0 else 0
-        player_stats[player] = {
-            'celkovy_zisk': total_zisk,
-            'pocet_dnu': pocet_dnu,
-            'prumer_zisk': prumer_zisk
-        }
-    return player_stats
-
-# Funkce pro generování rozlosování švýcarským systémem
-def generate_swiss_pairings(players, group_size=3, previous_pairings=None):
-    """
-    Generuje rozlosování pomocí švýcarského systému
-    players: seznam hráčů s jejich celkovými zisky
-    group_size: počet hráčů u stolu (3 nebo 4)
-    previous_pairings: předchozí párování pro kontrolu opakování
-    """
-    # Seřadit hráče podle celkového zisku (sestupně)
-    sorted_players = sorted(players.items(), key=lambda x: x[1]['celkovy_zisk'], reverse=True)
-    player_names = [p[0] for p in sorted_players]
-    
-    # Pokud je počet hráčů nedělitelný, přidáme "dummy" hráče
-    remainder = len(player_names) % group_size
-    if remainder != 0:
-        # Místo dummy hráčů rozdělíme přebývající hráče do existujících skupin
-        groups = []
-        num_groups = len(player_names) // group_size
-        
-        # Rozdělit hráče do skupin podle pořadí
-        for i in range(num_groups):
-            group = player_names[i*group_size:(i+1)*group_size]
-            groups.append(group)
-        
-        # Rozdělit zbylé hráče do existujících skupin
-        remaining_players = player_names[num_groups*group_size:]
-        for i, player in enumerate(remaining_players):
-            groups[i % len(groups)].append(player)
+# Měření doby překreslení po fázích (volitelné) – v postranním panelu se pak zobrazí ladicí panel
+PROFILE_RERUNS = bool(os.environ.get('MARIAS_LIGA_PROFILE'))
+
+
+@st.cache_resource
+def theme_css():
+    """CSS s texturami, sestavené jednou za běh procesu"""
+    return build_css()
+
+
+@st.cache_resource
+def theme_logo():
+    """Logo z lokálního souboru (nebo vložené SVG), načtené jednou za běh procesu"""
+    return logo_source()
+
+
+if 'profiler' not in st.session_state:
+    st.session_state.profiler = RerunProfiler()
+profiler = st.session_state.profiler
+profiler.enabled = PROFILE_RERUNS
+profiler.use_cprofile = st.session_state.get('profile_cprofile', False)
+profiler.start()
+
+with profiler.phase('CSS'):
+    st.markdown(theme_css(), unsafe_allow_html=True)
+
+# Počet hracích dnů na jedné stránce historie
+HISTORY_PAGE_SIZE = 10
+
+# Adresář deníku změn ligy (volitelné) – liga se pak průběžně ukládá a po restartu obnoví
+JOURNAL_DIR = os.environ.get('MARIAS_LIGA_JOURNAL')
+
+# Sdílený SQLite soubor ligy (volitelné) – všechny relace prohlížeče pak pracují se stejnou ligou
+DATABASE_PATH = os.environ.get('MARIAS_LIGA_DB')
+
+# Adresář automatických záloh (volitelné, jen pro ligu v paměti) – po každé změně se liga uloží na pozadí
+AUTOSAVE_DIR = os.environ.get('MARIAS_LIGA_AUTOSAVE') if not (DATABASE_PATH or JOURNAL_DIR) else None
+
+
+@st.cache_resource
+def get_database(path):
+    """Jedno spojení na databázi pro celý proces"""
+    return LeagueDatabase(path)
+
+
+@st.cache_resource
+def get_autosaver(directory):
+    """Jedno ukládací vlákno pro celý proces – každá relace ukládá do vlastního souboru"""
+    return Autosaver(directory)
+
+
+# Inicializace session state – veškerý stav ligy drží headless engine
+if 'engine' not in st.session_state:
+    if DATABASE_PATH:
+        st.session_state.engine = DatabaseLeague(get_database(DATABASE_PATH))
+    elif JOURNAL_DIR:
+        st.session_state.engine = LeagueEngine.open_journal(JOURNAL_DIR)
     else:
-        # Přesný počet skupin
-        num_groups = len(player_names) // group_size
-        groups = [player_names[i*group_size:(i+1)*group_size] for i in range(num_groups)]
-    
-    return groups
-
-# Funkce pro uložení ligy
-def save_league():
-    """Uloží aktuální stav ligy do JSON objektu"""
-    league_data = {
-        'league_name': st.session_state.league_name,
-        'vklad': st.session_state.vklad,
-        'players': st.session_state.players,
-        'sessions': st.session_state.sessions
-    }
-    return json.dumps(league_data, ensure_ascii=False)
-
-# Funkce pro načtení ligy
-def load_league(uploaded_file):
-    """Načte stav ligy z JSON souboru"""
-    try:
-        league_data = json.load(uploaded_file)
-        st.session_state.league_name = league_data.get('league_name', 'Mariášová Liga')
-        st.session_state.vklad = league_data.get('vklad', 100)
-        st.session_state.players = league_data.get('players', {})
-        st.session_state.sessions = league_data.get('sessions', [])
-        st.session_state.current_session = None
-        return True
-    except Exception as e:
-        st.error(f"Chyba při načítání souboru: {e}")
-        return False
-
-# Funkce pro založení nové ligy
-def create_new_league():
-    """Vytvoří novou ligu"""
-    st.session_state.league_name = "Nová Mariášová Liga"
-    st.session_state.vklad = 100
-    st.session_state.players = {}
-    st.session_state.sessions = []
-    st.session_state.current_session = None
+        st.session_state.engine = LeagueEngine()
+        if AUTOSAVE_DIR:
+            # Vlastní soubor zálohy relace; než uživatel odpoví na nabídku obnovení, neukládá se nic
+            st.session_state.autosave_key = uuid.uuid4().hex
+            st.session_state.autosave_offer = list_backups(AUTOSAVE_DIR)
+    st.session_state.autosave_mark = (id(st.session_state.engine), st.session_state.engine.version)
+elif JOURNAL_DIR and not st.session_state.engine.journal.is_owner:
+    # Deník mezitím převzala jiná záložka – liga se načte znovu z disku (i s jejími změnami), rozlosování zůstane
+    current_session = st.session_state.engine.current_session
+    st.session_state.engine = LeagueEngine.open_journal(JOURNAL_DIR)
+    st.session_state.engine.current_session = current_session
+
+if st.session_state.get('autosave_offer'):
+    backups = st.session_state.autosave_offer
+    st.info("Našly se automatické zálohy lig, můžete některou obnovit.")
+    chosen = st.selectbox(
+        "Záloha",
+        range(len(backups)),
+        format_func=lambda i: f"{backups[i]['league_name'] or 'Bez názvu'} – {backups[i]['saved_at']:%d.%m.%Y %H:%M}"
+    )
+    col1, col2 = st.columns(2)
+    if col1.button("Obnovit zálohu", use_container_width=True):
+        try:
+            with open(backups[chosen]['path'], 'rb') as f:
+                restored = LeagueEngine.from_file(f)
+        except (OSError, LeagueFileError) as e:
+            st.error(f"Zálohu se nepodařilo načíst: {e}")
+        else:
+            st.session_state.engine = restored
+            st.session_state.autosave_mark = (id(restored), restored.version)
+            st.session_state.autosave_offer = None
+            st.rerun()
+    if col2.button("Pokračovat bez obnovení", use_container_width=True):
+        st.session_state.autosave_offer = None
+        st.rerun()
+
+engine = st.session_state.engine
+
+# Funkce pro zvýraznění výsledků
+def result_styles(results, columns):
+    """CSS pro řádky výsledků – vítěz stolu zeleně, poražený červeně"""
+    row_style = np.where(
+        results['Vítěz'], "color:green; font-weight:bold",
+        np.where(results['Poražený'], "color:red; font-weight:bold", "")
+    )
+    return pd.DataFrame({column: row_style for column in columns}, index=results.index)
+
+def table_label(table_no, round_no, multi_round):
+    """Popisek stolu – u vícekolového dne i s kolem"""
+    return f"Kolo {round_no} – Stůl {table_no}" if multi_round else f"Stůl {table_no}"
 
 # Hlavička aplikace
-col1, col2 = st.columns([0.7, 0.3])
-with col1:
-    st.header(f"{st.session_state.league_name} - Švýcarský Systém")
-with col2:
-    st.image("https://marias-turnaj.zya.me/marias.png")
+with profiler.phase('Hlavička'):
+    col1, col2 = st.columns([0.7, 0.3])
+    with col1:
+        st.header(f"{engine.league_name} - Švýcarský Systém")
+    with col2:
+        st.image(theme_logo())
 
 # Hlavní navigace aplikace
 app_mode = st.sidebar.selectbox(
     "Navigace",
-    ["Založit/Uložit/Načíst", "Správa hráčů", "Nastavení ligy", "Hrací den - Rozlosování", "Hrací den - Zadání výsledků", "Průběžná tabulka"]
+    ["Založit/Uložit/Načíst", "Správa hráčů", "Nastavení ligy", "Hrací den - Rozlosování", "Hrací den - Zadání výsledků", "Průběžná tabulka", "Vzájemné zápasy", "Projekce konce sezóny"]
 )
 
 # Režim: Založit/Uložit/Načíst
@@ -255,17 +147,17 @@ if app_mode == "Založit/Uložit/Načíst":
     with col1:
         st.markdown("### Založit novou ligu")
         if st.button("Nová liga", use_container_width=True):
-            create_new_league()
+            engine.reset()
             st.success("Nová liga byla vytvořena!")
             st.rerun()
     
     with col2:
         st.markdown("### Uložit aktuální ligu")
-        league_json = save_league()
+        # Soubor se serializuje až po kliknutí na tlačítko
         st.download_button(
             label="Stáhnout ligový soubor",
-            data=league_json,
-            file_name=f"{st.session_state.league_name.replace(' ', '_')}.json",
+            data=engine.to_json,
+            file_name=f"{engine.file_stem()}.json",
             mime="application/json",
             use_container_width=True
         )
@@ -275,7 +167,25 @@ if app_mode == "Založit/Uložit/Načíst":
         uploaded_file = st.file_uploader("Vyberte soubor ligy", type="json", label_visibility="collapsed")
         if uploaded_file is not None:
             if st.button("Načíst ligu", use_container_width=True):
-                if load_league(uploaded_file):
+                progress_bar = st.progress(0.0, text="Načítám ligu…")
+                
+                def show_progress(bytes_read, sessions_loaded):
+                    progress_bar.progress(
+                        min(bytes_read / max(uploaded_file.size, 1), 1.0),
+                        text=f"Načteno hracích dnů: {sessions_loaded}"
+                    )
+                
+                try:
+                    loaded = LeagueEngine.from_file(uploaded_file, progress=show_progress)
+                except Exception as e:
+                    st.error(f"Chyba při načítání souboru: {e}")
+                else:
+                    if isinstance(engine, DatabaseLeague):
+                        engine.import_league(loaded)
+                    else:
+                        if engine.journal is not None:
+                            loaded.attach_journal(engine.journal)
+                        st.session_state.engine = loaded
                     st.success("Liga byla úspěšně načtena!")
                     st.rerun()
 
@@ -289,19 +199,22 @@ elif app_mode == "Správa hráčů":
         st.markdown("### Přidat nového hráče")
         new_player = st.text_input("Jméno hráče")
         if st.button("Přidat hráče") and new_player:
-            if new_player in st.session_state.players:
+            try:
+                engine.add_player(new_player)
+            except ValueError:
                 st.error("Tento hráč již existuje!")
             else:
-                st.session_state.players[new_player] = {'celkovy_zisk': 0, 'pocet_dnu': 0}
                 st.success(f"Hráč {new_player} byl přidán!")
                 st.rerun()
     
     with col2:
         st.markdown("### Odstranit hráče")
-        if st.session_state.players:
-            player_to_remove = st.selectbox("Vyberte hráče k odstranění", list(st.session_state.players.keys()))
+        player_names = engine.player_names()
+        if player_names:
+            player_to_remove = st.selectbox("Vyberte hráče k odstranění", player_names)
+            st.caption("Výsledky hráče zůstanou v historii u stolů ostatních hráčů.")
             if st.button("Odstranit hráče") and player_to_remove:
-                del st.session_state.players[player_to_remove]
+                engine.remove_player(player_to_remove)
                 st.success(f"Hráč {player_to_remove} byl odstraněn!")
                 st.rerun()
         else:
@@ -309,14 +222,10 @@ elif app_mode == "Správa hráčů":
     
     # Zobrazení seznamu hráčů
     st.markdown("### Seznam hráčů v lize")
-    if st.session_state.players:
-        player_stats = calculate_player_stats()
-        df_players = pd.DataFrame({
-            'Hráč': list(player_stats.keys()),
-            'Celkový zisk': [stats['celkovy_zisk'] for stats in player_stats.values()],
-            'Počet dní': [stats['pocet_dnu'] for stats in player_stats.values()],
-            'Průměrný zisk': [round(stats['prumer_zisk'], 2) for stats in player_stats.values()]
-        }).sort_values('Celkový zisk', ascending=False)
+    if engine.player_names():
+        # Průběžná tabulka z cache enginu, bez sloupce pořadí
+        with profiler.phase('Statistiky'):
+            df_players = engine.standings_frame().drop(columns='Pořadí')
         
         st.dataframe(df_players, use_container_width=True, hide_index=True)
     else:
@@ -326,27 +235,89 @@ elif app_mode == "Správa hráčů":
 elif app_mode == "Nastavení ligy":
     st.subheader("Nastavení ligy")
     
-    st.session_state.league_name = st.text_input("Název ligy", value=st.session_state.league_name)
-    st.session_state.vklad = st.number_input(
-        "Základní vklad na hráče (Kč)", 
-        min_value=10, 
-        step=10, 
-        value=st.session_state.vklad
+    engine.set_settings(
+        league_name=st.text_input("Název ligy", value=engine.league_name),
+        vklad=st.number_input(
+            "Základní vklad na hráče (Kč)", 
+            min_value=10, 
+            step=10, 
+            value=engine.vklad
+        )
     )
     
-    st.info(f"Aktuální počet hráčů v lize: {len(st.session_state.players)}")
-    st.info(f"Aktuální základní vklad: {st.session_state.vklad} Kč")
+    st.info(f"Aktuální počet hráčů v lize: {len(engine.player_names())}")
+    st.info(f"Aktuální základní vklad: {engine.vklad} Kč")
+
+    # Oprava odehraného dne – jen pro pořadatele, součty a ratingy se přepočítají od nejbližšího kontrolního bodu
+    history = engine.history
+    if len(history):
+        st.markdown("### Oprava hracího dne")
+        edit_day = st.number_input("Hrací den k opravě", min_value=1, max_value=len(history), value=len(history))
+        edit_idx = int(edit_day) - 1
+        day_vklad = history.session_vklad(edit_idx)
+        day_frame = history.session_frame(edit_idx).astype({'Hráč': object})
+        edit_columns = [c for c in [ROUND_COLUMN, 'Stůl', 'Hráč', 'Na stole', 'Dokup'] if c in day_frame.columns]
+        # Klíč formuláře obsahuje verzi ligy – po uložení opravy se načtou nové hodnoty
+        with st.form(f"edit_form_{edit_idx}_{engine.version}"):
+            st.caption(f"{history.session_date(edit_idx)} · vklad {day_vklad} Kč")
+            edited = st.data_editor(
+                day_frame[edit_columns],
+                column_config={
+                    'Kolo': st.column_config.NumberColumn(disabled=True),
+                    'Stůl': st.column_config.NumberColumn(disabled=True),
+                    'Hráč': st.column_config.TextColumn(disabled=True),
+                    'Na stole': st.column_config.NumberColumn("Na stole (Kč)", min_value=0, step=10),
+                    'Dokup': st.column_config.NumberColumn("Dokup (Kč)", min_value=0, step=10),
+                },
+                num_rows="fixed",
+                hide_index=True,
+                use_container_width=True
+            )
+            confirm_edit = st.checkbox(f"Potvrzuji přepsání výsledků hracího dne {edit_idx + 1}")
+            save_edit = st.form_submit_button("Uložit opravu", type="primary")
+        
+        if save_edit:
+            edited_results, diffs = evaluate_results(edited, day_vklad)
+            unbalanced = diffs[diffs != 0]
+            if not confirm_edit:
+                st.warning("Opravu je potřeba potvrdit zaškrtnutím.")
+            elif not unbalanced.empty:
+                for table, diff in unbalanced.items():
+                    st.error(f"❌ Nesedí vklady u stolu {table}: rozdíl {diff} Kč")
+            else:
+                try:
+                    engine.edit_session(edit_idx, results_to_records(edited_results))
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    st.success(f"Hrací den {edit_idx + 1} byl opraven!")
+                    st.rerun()
+        
+        # Vrácení posledního dne – potvrzuje se konkrétní den, jiný (mezitím přidaný) se nesmaže
+        last_idx = len(history) - 1
+        confirm_undo = st.checkbox(
+            f"Opravdu smazat poslední hrací den {last_idx + 1} ({history.session_date(last_idx)})",
+            key=f"confirm_undo_{last_idx}_{engine.version}"
+        )
+        if st.button("Vrátit poslední hrací den", disabled=not confirm_undo):
+            try:
+                engine.undo_session(last_idx)
+            except (ValueError, ConcurrentUpdateError) as e:
+                st.warning(str(e))
+            else:
+                st.success("Poslední hrací den byl vrácen.")
+                st.rerun()
 
 # Režim: Hrací den - Rozlosování
 elif app_mode == "Hrací den - Rozlosování":
     st.subheader("Hrací den - Rozlosování")
     
-    if not st.session_state.players:
+    all_players = engine.player_names()
+    if not all_players:
         st.warning("Použij'Navigaci'.")
     else:
         # Výběr hráčů přítomných v daném dni
         st.markdown("### Výběr přítomných hráčů")
-        all_players = list(st.session_state.players.keys())
         present_players = st.multiselect(
             "Vyberte hráče přítomné dnes", 
             all_players,
@@ -358,190 +329,344 @@ elif app_mode == "Hrací den - Rozlosování":
         else:
             # Výběr velikosti skupiny
             group_size = st.radio("Počet hráčů u stolu", [3, 4], horizontal=True)
+            # Rating zohledňuje i sílu soupeřů, celkový zisk zvýhodňuje hráče s více odehranými dny
+            seeding = st.radio("Nasazení podle", ["Celkový zisk", "Rating"], horizontal=True)
+            # Ve více kolech se hráči u stolů střídají (stoly po 3 nebo 4 hráčích)
+            num_rounds = st.number_input("Počet kol", min_value=1, max_value=6, value=1, step=1)
             
             if len(present_players) < group_size:
                 st.warning(f"Pro hru potřebujete alespoň {group_size} hráče.")
             else:
-                if st.button("Generovat rozlosování"):
-                    # Získat celkové zisky přítomných hráčů
-                    present_players_with_scores = {p: st.session_state.players[p] for p in present_players}
-                    
-                    # Generovat rozlosování
-                    pairings = generate_swiss_pairings(present_players_with_scores, group_size)
-                    
-                    # Uložit rozlosování do session state
-                    st.session_state.current_session = {
-                        'date': pd.Timestamp.now().strftime('%Y-%m-%d'),
-                        'players': present_players,
-                        'group_size': group_size,
-                        'pairings': pairings,
-                        'results': None
-                    }
-                    
+                def new_draw():
+                    engine.start_session(
+                        present_players, group_size, by_rating=seeding == "Rating", rounds=int(num_rounds)
+                    )
+                    st.session_state.pop("results_grid", None)
                     st.success("Rozlosování bylo vygenerováno!")
                 
+                if st.button("Generovat rozlosování"):
+                    # Generovat rozlosování a založit aktuální hrací den
+                    try:
+                        new_draw()
+                    except ConcurrentUpdateError as e:
+                        # Sdílený den už má zadané stoly – přepsat je jde jen po potvrzení a beze změn mezitím
+                        st.session_state.discard_version = engine.version
+                        st.warning(str(e))
+                
+                if st.session_state.get('discard_version') is not None:
+                    if st.button("Zahodit zadané stoly a losovat znovu", type="primary"):
+                        try:
+                            engine.discard_session(st.session_state.pop('discard_version'))
+                        except ConcurrentUpdateError as e:
+                            st.warning(f"{e}. Zkontrolujte zadané stoly.")
+                        else:
+                            new_draw()
+                
                 # Zobrazit aktuální rozlosování, pokud existuje
-                if st.session_state.current_session and st.session_state.current_session['results'] is None:
+                if engine.current_session and engine.current_session['results'] is None:
                     st.markdown("### Aktuální rozlosování")
-                    st.info(f"Datum: {st.session_state.current_session['date']}")
+                    st.info(f"Datum: {engine.current_session['date']}")
                     st.info(f"Počet hráčů: {len(present_players)}")
                     
-                    for i, table in enumerate(st.session_state.current_session['pairings']):
+                    pairings = engine.current_session['pairings']
+                    table_rounds = engine.current_session.get('table_rounds') or [1] * len(pairings)
+                    for i, (table, round_no) in enumerate(zip(pairings, table_rounds)):
+                        if table_rounds[-1] > 1 and (i == 0 or table_rounds[i - 1] != round_no):
+                            st.markdown(f"#### Kolo {round_no}")
                         st.markdown(f"**Stůl {i+1}:** {', '.join(table)}")
                     
                     if st.button("Přejít k zadávání výsledků"):
-                        st.session_state.current_session['results'] = {}
+                        engine.open_results()
                         st.rerun()
 
 # Režim: Hrací den - Zadání výsledků
 elif app_mode == "Hrací den - Zadání výsledků":
     st.subheader("Hrací den - Zadání výsledků")
     
-    if not st.session_state.current_session or st.session_state.current_session['results'] is None:
+    if not engine.current_session or engine.current_session['results'] is None:
         st.warning("Použij'Navigaci'.")
     else:
-        session = st.session_state.current_session
+        session = engine.current_session
         st.info(f"Datum: {session['date']}")
         st.info(f"Počet hráčů: {len(session['players'])}")
         
-        # Zadávání výsledků pro každý stůl
-        all_results = []
-        valid_session = True
+        # Ve sdílené databázi může každý stůl zadávat výsledky ze svého zařízení
+        entry_mode = "Celý den najednou"
+        if isinstance(engine, DatabaseLeague):
+            entry_mode = st.radio("Způsob zadání", ["Celý den najednou", "Po stolech (více zařízení)"], horizontal=True)
         
-        for table_idx, table_players in enumerate(session['pairings']):
-            st.markdown(f"### Stůl {table_idx + 1}: {', '.join(table_players)}")
+        if entry_mode == "Po stolech (více zařízení)":
+            tables = {t['table']: t for t in engine.table_states()}
+            multi_round = any(t['round'] > 1 for t in tables.values())
+            st.markdown(" · ".join(
+                f"{'✅' if t['results'] else '⏳'} {table_label(n, t['round'], multi_round)}" for n, t in tables.items()
+            ))
+            if st.button("Obnovit stav stolů"):
+                st.rerun()
             
-            sum_na_stole, sum_dokup = 0, 0
-            table_results = []
+            table_no = st.selectbox(
+                "Můj stůl",
+                list(tables),
+                format_func=lambda n: f"{table_label(n, tables[n]['round'], multi_round)}: {', '.join(tables[n]['players'])}"
+            )
+            table = tables[table_no]
+            saved = {r['Hráč']: r for r in table['results'] or []}
             
-            for player in table_players:
+            # Klíče widgetů obsahují verzi stolu – po zápisu z jiného zařízení se načtou nové hodnoty
+            with st.form(f"table_form_{table_no}"):
+                entries = []
+                for player in table['players']:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        na_stole = st.number_input(
+                            f"{player} – na stole (Kč)",
+                            min_value=0,
+                            step=10,
+                            value=saved.get(player, {}).get('Na stole', 0),
+                            key=f"live_stole_{table_no}_{table['version']}_{player}"
+                        )
+                    with col2:
+                        dokup = st.number_input(
+                            f"{player} – dokup (Kč)",
+                            min_value=0,
+                            step=10,
+                            value=saved.get(player, {}).get('Dokup', 0),
+                            key=f"live_dokup_{table_no}_{table['version']}_{player}"
+                        )
+                    entries.append((player, na_stole, dokup))
+                submitted = st.form_submit_button("Odeslat výsledky stolu", type="primary")
+            
+            if submitted:
+                try:
+                    session_idx = engine.submit_table(table_no, entries, table['version'])
+                except ConcurrentUpdateError as e:
+                    st.warning(f"{e}. Obnovte stav stolů a zkontrolujte hodnoty.")
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                else:
+                    if session_idx is None:
+                        st.success("✅ Výsledky stolu uloženy, čeká se na ostatní stoly.")
+                    else:
+                        st.success("Všechny stoly jsou zadané – hrací den byl uložen!")
+                        st.rerun()
+        else:
+            # Zadání výsledků všech stolů najednou – přepočet proběhne až po odeslání formuláře
+            with profiler.phase('DataFrame'):
+                empty_grid = results_grid(session['pairings'], session.get('table_rounds'))
+            with st.form("results_form"):
+                grid = st.data_editor(
+                    empty_grid,
+                    column_config={
+                        'Kolo': st.column_config.NumberColumn(disabled=True),
+                        'Stůl': st.column_config.NumberColumn(disabled=True),
+                        'Hráč': st.column_config.TextColumn(disabled=True),
+                        'Na stole': st.column_config.NumberColumn("Na stole (Kč)", min_value=0, step=10),
+                        'Dokup': st.column_config.NumberColumn("Dokup (Kč)", min_value=0, step=10),
+                    },
+                    num_rows="fixed",
+                    hide_index=True,
+                    use_container_width=True,
+                    key="results_grid"
+                )
                 col1, col2 = st.columns(2)
                 with col1:
-                    na_stole = st.number_input(
-                        f"{player} – na stole (Kč)", 
-                        min_value=0, 
-                        step=10, 
-                        key=f"stole_{table_idx}_{player}"
-                    )
+                    st.form_submit_button("Zkontrolovat vklady")
                 with col2:
-                    dokup = st.number_input(
-                        f"{player} – dokup (Kč)", 
-                        min_value=0, 
-                        step=10, 
-                        key=f"dokup_{table_idx}_{player}"
-                    )
-                
-                sum_na_stole += na_stole
-                sum_dokup += dokup
-                zisk = na_stole - st.session_state.vklad - dokup
-                
-                table_results.append({
-                    'Hráč': player, 
-                    'Na stole': na_stole, 
-                    'Dokup': dokup, 
-                    'Zisk': zisk,
-                    'Stůl': table_idx + 1
-                })
-            
-            # Kontrola správnosti vkladů
-            expected = st.session_state.vklad * len(table_players)
-            diff = expected + sum_dokup - sum_na_stole
-            
-            if diff != 0:
-                st.error(f"❌ Nesedí vklady u stolu {table_idx + 1}: rozdíl {diff} Kč")
-                valid_session = False
-            else:
-                st.success("✅ Vklady souhlasí")
-            
-            # Zobrazení zisků s zvýrazněním vítěze a poraženého
-            df_table = pd.DataFrame(table_results)
-            max_zisk = df_table["Zisk"].max()
-            min_zisk = df_table["Zisk"].min()
-            
-            for _, row in df_table.iterrows():
-                style = ""
-                if row["Zisk"] == max_zisk:
-                    style = "color:green; font-weight:bold"
-                elif row["Zisk"] == min_zisk:
-                    style = "color:red; font-weight:bold"
-                st.markdown(f"<div style='{style}'>{row['Hráč']}: zisk {row['Zisk']} Kč</div>", unsafe_allow_html=True)
-            
-            all_results.extend(table_results)
+                    save = st.form_submit_button("Uložit výsledky hracího dne", type="primary")
         
-        # Tlačítko pro uložení výsledků
-        if st.button("Uložit výsledky hracího dne"):
-            if not valid_session:
-                st.warning("Nelze uložit výsledky, dokud nejsou vklady vyrovnané u všech stolů.")
-            else:
-                # Uložit výsledky do session state
-                st.session_state.current_session['results'] = all_results
-                
-                # Aktualizovat celkové zisky hráčů a počet odehraných dní
-                for result in all_results:
-                    player = result['Hráč']
-                    zisk = result['Zisk']
-                    st.session_state.players[player]['celkovy_zisk'] += zisk
-                    st.session_state.players[player]['pocet_dnu'] += 1
-                
-                # Přidat sezení do historie
-                st.session_state.sessions.append(st.session_state.current_session.copy())
-                
-                # Resetovat aktuální sezení
-                st.session_state.current_session = None
-                
-                st.success("Výsledky byly úspěšně uloženy!")
-                st.rerun()
+            # Kontrola vkladů a označení vítězů a poražených pro všechny stoly jedním průchodem
+            with profiler.phase('Statistiky'):
+                results, diffs = engine.evaluate_results(grid)
+            unbalanced = diffs[diffs != 0]
+            for table, diff in unbalanced.items():
+                st.error(f"❌ Nesedí vklady u stolu {table}: rozdíl {diff} Kč")
+            if unbalanced.empty:
+                st.success("✅ Vklady souhlasí u všech stolů")
+        
+            # Zobrazení zisků se zvýrazněním vítěze a poraženého u každého stolu
+            with profiler.phase('DataFrame'):
+                shown = [ROUND_COLUMN] + RESULT_COLUMNS if ROUND_COLUMN in results.columns else RESULT_COLUMNS
+                styled_results = results[shown].style.apply(lambda df: result_styles(results, df.columns), axis=None)
+            st.dataframe(
+                styled_results,
+                use_container_width=True,
+                hide_index=True
+            )
+        
+            if save:
+                if not unbalanced.empty:
+                    st.warning("Nelze uložit výsledky, dokud nejsou vklady vyrovnané u všech stolů.")
+                else:
+                    # Uložit výsledky, aktualizovat zisky hráčů a přidat den do historie
+                    try:
+                        engine.commit_session(results_to_records(results))
+                    except ConcurrentUpdateError as e:
+                        st.warning(str(e))
+                    except ValueError as e:
+                        st.error(f"❌ {e}")
+                    else:
+                        st.session_state.pop("results_grid", None)
+                        st.success("Výsledky byly úspěšně uloženy!")
+                        st.rerun()
 
 # Režim: Průběžná tabulka
 elif app_mode == "Průběžná tabulka":
     st.subheader("Průběžná tabulka ligy")
     
-    if not st.session_state.players:
+    if not engine.player_names():
         st.warning("Žádní hráči v lize.")
     else:
-        # Vypočítat statistiky hráčů
-        player_stats = calculate_player_stats()
+        # Tabulka s pořadím hráčů – z cache, přepočítaná jen po změně ligy
+        with profiler.phase('Statistiky'):
+            df_leaderboard = engine.standings_frame()
         
-        # Vytvořit datový rámec s pořadím hráčů
-        df_leaderboard = pd.DataFrame({
-            'Hráč': list(player_stats.keys()),
-            'Celkový zisk': [stats['celkovy_zisk'] for stats in player_stats.values()],
-            'Počet dní': [stats['pocet_dnu'] for stats in player_stats.values()],
-            'Průměrný zisk': [round(stats['prumer_zisk'], 2) for stats in player_stats.values()]
-        }).sort_values('Celkový zisk', ascending=False)
-        
-        df_leaderboard['Pořadí'] = range(1, len(df_leaderboard) + 1)
-        df_leaderboard = df_leaderboard[['Pořadí', 'Hráč', 'Celkový zisk', 'Počet dní', 'Průměrný zisk']]
+        # Zobrazení tabulky podle zisku, nebo podle ratingu (Elo pro stoly více hráčů)
+        order_by = st.radio("Pořadí podle", ["Celkový zisk", "Rating"], horizontal=True)
+        if order_by == "Rating":
+            with profiler.phase('Statistiky'):
+                df_ratings = engine.rating_frame()
+            st.dataframe(df_ratings, use_container_width=True, hide_index=True)
+        else:
+            st.dataframe(df_leaderboard, use_container_width=True, hide_index=True)
         
-        # Zobrazení tabulky
-        st.dataframe(df_leaderboard, use_container_width=True, hide_index=True)
+        # Vývoj zisku a pořadí v čase – z předpočítané tabulky, bez procházení historie
+        if len(engine.history):
+            st.markdown("### Vývoj v čase")
+            col1, col2 = st.columns([0.7, 0.3])
+            with col1:
+                trend_players = st.multiselect(
+                    "Hráči v grafu",
+                    df_leaderboard['Hráč'].tolist(),
+                    default=df_leaderboard['Hráč'].head(5).tolist()
+                )
+            with col2:
+                trend_kind = st.radio("Zobrazit", ["Celkový zisk", "Pořadí"])
+            if trend_players:
+                with profiler.phase('DataFrame'):
+                    df_trend = engine.timeseries().frame(trend_players, 'rank' if trend_kind == "Pořadí" else 'zisk')
+                st.line_chart(df_trend)
         
-        # Možnost exportu do CSV
-        csv = df_leaderboard.to_csv(index=False, sep=';', encoding='cp1250')
-        st.download_button(
-            label="Stáhnout tabulku jako CSV",
-            data=csv,
-            file_name=f"{st.session_state.league_name.replace(' ', '_')}_tabulka.csv",
-            mime="text/csv"
-        )
+        # Exporty se sestaví až po kliknutí a drží se v cache do další změny ligy
+        for col, (fmt, (label, suffix, mime)) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.items()):
+            with col:
+                st.download_button(
+                    label=label,
+                    data=lambda fmt=fmt: engine.export(fmt),
+                    file_name=f"{engine.file_stem()}{suffix}",
+                    mime=mime,
+                    use_container_width=True
+                )
     
     # Zobrazení historie sezení
     st.markdown("### Historie hracích dnů")
-    if not st.session_state.sessions:
+    if not len(engine.history):
         st.info("Zatím nebyl odehrán žádný hrací den.")
     else:
-        for i, session in enumerate(reversed(st.session_state.sessions)):
-            with st.expander(f"Hrací den {i+1} - {session['date']} ({len(session['players'])} hráčů)"):
-                # Převést výsledky na DataFrame pro lepší zobrazení
-                df_session = pd.DataFrame(session['results'])
-                df_session = df_session[['Hráč', 'Na stole', 'Dokup', 'Zisk', 'Stůl']]
-                
-                # Seřadit podle zisku
-                df_session = df_session.sort_values('Zisk', ascending=False)
-                
-                st.dataframe(df_session, use_container_width=True, hide_index=True)
+        history = engine.history
+        first_date, last_date = history.date_range()
+        
+        # Filtry historie
+        col1, col2 = st.columns(2)
+        with col1:
+            date_range = st.date_input(
+                "Období",
+                value=(first_date, last_date),
+                min_value=first_date,
+                max_value=last_date
+            )
+        with col2:
+            player_filter = st.selectbox("Hráč", ["Všichni"] + sorted(history.names))
+        
+        # Během výběru rozsahu vrací date_input jen počáteční datum
+        date_from, date_to = (tuple(date_range) + (None, None))[:2]
+        with profiler.phase('Statistiky'):
+            found = history.find_sessions(date_from, date_to, None if player_filter == "Všichni" else player_filter)
+        
+        if not len(found):
+            st.info("Filtru neodpovídá žádný hrací den.")
+        else:
+            # Stránkování – tabulky se sestavují jen pro dny na aktuální stránce
+            num_pages = -(-len(found) // HISTORY_PAGE_SIZE)
+            page = 1
+            if num_pages > 1:
+                page = st.number_input(f"Stránka (celkem {num_pages})", min_value=1, max_value=num_pages, value=1)
+            
+            for session_idx in found[(page - 1) * HISTORY_PAGE_SIZE:page * HISTORY_PAGE_SIZE]:
+                with st.expander(f"Hrací den {session_idx + 1} - {history.session_date(session_idx)} ({history.session_size(session_idx)} hráčů)"):
+                    # Výsledky seřazené podle zisku, z cache sloupcového úložiště
+                    with profiler.phase('DataFrame'):
+                        session_frame = history.sorted_session_frame(session_idx)
+                    st.dataframe(session_frame, use_container_width=True, hide_index=True)
 
-# Informace v postranním panelu
+# Režim: Vzájemné zápasy
+elif app_mode == "Vzájemné zápasy":
+    st.subheader("Vzájemné zápasy hráčů")
+    
+    all_players = engine.player_names()
+    if not len(engine.history) or not all_players:
+        st.info("Zatím nebyl odehrán žádný hrací den.")
+    else:
+        with profiler.phase('Statistiky'):
+            head_to_head = engine.head_to_head()
+        
+        # Soupeři jednoho hráče
+        player = st.selectbox("Hráč", all_players)
+        with profiler.phase('DataFrame'):
+            df_rivals = head_to_head.rivals(player, all_players)
+        st.markdown(f"### Soupeři hráče {player}")
+        st.dataframe(df_rivals, use_container_width=True, hide_index=True)
+        never_met = head_to_head.never_met(player, all_players)
+        if never_met:
+            st.info(f"Ještě spolu neseděli u stolu: {', '.join(never_met)}")
+        
+        # Matice pro vybrané hráče
+        st.markdown("### Matice vzájemných zápasů")
+        col1, col2 = st.columns([0.7, 0.3])
+        with col1:
+            matrix_players = st.multiselect("Hráči v matici", all_players, default=all_players[:8])
+        with col2:
+            matrix_value = st.radio("Hodnota", ["Společné stoly", "Rozdíl zisku"])
+        if matrix_players:
+            with profiler.phase('DataFrame'):
+                df_matrix = head_to_head.matrix(matrix_players, 'net' if matrix_value == "Rozdíl zisku" else 'games')
+            st.dataframe(df_matrix, use_container_width=True)
+            if matrix_value == "Rozdíl zisku":
+                st.caption("Kladné číslo: hráč v řádku vydělal u společných stolů víc než hráč ve sloupci.")
+
+# Režim: Projekce konce sezóny
+elif app_mode == "Projekce konce sezóny":
+    st.subheader("Projekce konečného pořadí")
+    
+    if not engine.player_names():
+        st.warning("Žádní hráči v lize.")
+    else:
+        st.markdown(
+            "Zbývající hrací dny se mnohokrát nasimulují: každý hráč přijde podle své dosavadní docházky "
+            "a jeho zisk se losuje z jeho dosavadních zisků."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            remaining_days = st.number_input("Zbývající hrací dny", min_value=1, max_value=100, value=5)
+        with col2:
+            num_simulations = st.select_slider("Počet simulací", [1_000, 10_000, 100_000, 1_000_000], value=100_000)
+        parallel = st.checkbox("Počítat ve více procesech", value=False)
+        
+        params = (engine.version, remaining_days, num_simulations)
+        if st.button("Spustit projekci", type="primary"):
+            with st.spinner("Simuluji…"), profiler.phase('Statistiky'):
+                st.session_state.projection = (
+                    params,
+                    engine.project_standings(remaining_days, num_simulations, workers=os.cpu_count() if parallel else None)
+                )
+        
+        # Výsledek se drží v session state, dokud se nezmění liga nebo parametry
+        projection = st.session_state.get('projection')
+        if projection is not None and projection[0] == params:
+            frame = projection[1]
+            rank_columns = list(frame.columns[2:])
+            with profiler.phase('DataFrame'):
+                styled_projection = frame.style.format('{:.1%}', subset=rank_columns).format('{:.1f}', subset=['Očekávaný zisk'])
+            st.dataframe(styled_projection, use_container_width=True)
 st.sidebar.markdown("---")
 st.sidebar.info(
     """
@@ -549,8 +674,42 @@ st.sidebar.info(
     
     1. **Založit/Uložit/Načíst**: Správa ligových souborů
     2. **Správa hráčů**: Přidejte nebo odeberte hráče ligy
-    3. **Nastavení ligy**: Nastavte název a základní vklad
+    3. **Nastavení ligy**: Nastavte název a základní vklad, opravte nebo vraťte odehraný den
     4. **Hrací den**: Vygenerujte rozlosování a zadejte výsledky
     5. **Průběžná tabulka**: Prohlédněte si celkové výsledky ligy
+    6. **Vzájemné zápasy**: Jak se hráčům daří proti sobě
+    7. **Projekce konce sezóny**: Pravděpodobnosti konečného pořadí
     """
-)
\ No newline at end of file
+)
+
+# Automatická záloha – překreslení jen předá snímek, zápis proběhne ve vlákně
+if AUTOSAVE_DIR and not st.session_state.get('autosave_offer'):
+    with profiler.phase('Záloha'):
+        autosaver = get_autosaver(AUTOSAVE_DIR)
+        mark = (id(st.session_state.engine), st.session_state.engine.version)
+        if mark != st.session_state.autosave_mark:
+            autosaver.schedule(st.session_state.autosave_key, st.session_state.engine.snapshot())
+            st.session_state.autosave_mark = mark
+    error = autosaver.errors.get(st.session_state.autosave_key)
+    if error is not None:
+        st.sidebar.warning(f"Automatická záloha selhala: {error}")
+
+# Ladicí panel s časy překreslení – samotný panel se už neměří
+profiler.finish(app_mode)
+if PROFILE_RERUNS:
+    with st.sidebar.expander("Ladění výkonu"):
+        st.checkbox("cProfile nejpomalejších běhů", key="profile_cprofile")
+        runs = profiler.history[app_mode]
+        st.caption(f"Poslední běh: {runs[-1]['Celkem'] * 1000:.1f} ms · měřených běhů: {len(runs)}")
+        st.dataframe(profiler.summary(app_mode), use_container_width=True)
+        for i, profile in enumerate(profiler.slowest):
+            st.markdown(f"**{profile['total'] * 1000:.1f} ms** – {profile['mode']}")
+            st.download_button(
+                label="Stáhnout .prof",
+                data=profile['prof'],
+                file_name=f"rerun_{i + 1}.prof",
+                mime="application/octet-stream",
+                key=f"profile_download_{i}"
+            )
+            with st.popover("Výpis"):
+                st.code(profile['text'])
@@ -0,0 +1,113 @@
+"""
+Příkazová řádka Mariášové ligy – bez spouštění streamlitu.
+
+Hromadný import odehraných hracích dnů z CSV nebo JSON do ligového souboru:
+    python marias_liga_cli.py import vysledky.csv --league liga.json
+    python marias_liga_cli.py import dny.json --name "Mariášová Liga" --vklad 100 --output liga.json
+
+Průběžná tabulka ligového souboru:
+    python marias_liga_cli.py standings liga.json
+
+CSV má sloupce Datum, Stůl, Hráč, Na stole, Dokup a volitelně Zisk, Kolo a Hrací den (stejně jako
+export "Všechny výsledky"). Bez sloupce Zisk se zisk dopočítá z vkladu.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from liga import LeagueEngine, LeagueFileError
+from liga.bulk_import import import_results, prepare_results, read_results
+from liga.engine import DEFAULT_LEAGUE_NAME
+
+MAX_ERRORS = 50  # Kolik chyb importu se nejvýš vypíše
+
+
+def load_engine(path):
+    """Načte ligový soubor (proudově, s kontrolou každého dne)"""
+    with open(path, 'rb') as f:
+        return LeagueEngine.from_file(f)
+
+
+def write_league(engine, path):
+    """Zapíše ligový soubor atomicky – rozepsaný soubor nikdy nenahradí původní"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(engine.to_json())
+    os.replace(tmp_path, path)
+
+
+def print_standings(engine):
+    print(engine.standings_frame().to_string(index=False))
+
+
+def cmd_import(args):
+    if args.league and os.path.exists(args.league):
+        engine = load_engine(args.league)
+    else:
+        engine = LeagueEngine(league_name=args.name or DEFAULT_LEAGUE_NAME)
+        if args.vklad is not None:
+            engine.set_settings(vklad=args.vklad)
+    if args.name:
+        engine.set_settings(league_name=args.name)
+
+    start = time.perf_counter()
+    frame = read_results(args.source, args.encoding)
+    prepared, errors = prepare_results(
+        frame, args.vklad if args.vklad is not None else engine.vklad, not_before=engine.history.date_range()[1]
+    )
+    if errors:
+        for error in errors[:MAX_ERRORS]:
+            print(f"❌ {error}", file=sys.stderr)
+        if len(errors) > MAX_ERRORS:
+            print(f"… a dalších {len(errors) - MAX_ERRORS} chyb", file=sys.stderr)
+        print("Import se neprovedl, liga zůstala beze změny.", file=sys.stderr)
+        return 1
+
+    num_days = import_results(engine, prepared)
+    elapsed = time.perf_counter() - start
+    print(f"Importováno hracích dnů: {num_days} ({len(prepared)} řádků) za {elapsed:.2f} s", file=sys.stderr)
+
+    output = args.output or args.league
+    if output:
+        write_league(engine, output)
+        print(f"Liga uložena do {output}", file=sys.stderr)
+    else:
+        print("Není zadán --output ani --league, liga se neuložila.", file=sys.stderr)
+    print_standings(engine)
+    return 0
+
+
+def cmd_standings(args):
+    print_standings(load_engine(args.league))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mariášová liga bez streamlitu")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_import = commands.add_parser('import', help="hromadný import hracích dnů z CSV nebo JSON")
+    parser_import.add_argument('source', help="soubor .csv nebo .json s výsledky")
+    parser_import.add_argument('--league', help="ligový soubor, do kterého se importuje (pokud existuje)")
+    parser_import.add_argument('--output', help="kam uložit výsledný ligový soubor (výchozí = --league)")
+    parser_import.add_argument('--name', help="název ligy")
+    parser_import.add_argument('--vklad', type=int, help="vklad pro dopočet zisků (výchozí = vklad ligy)")
+    parser_import.add_argument('--encoding', help="kódování CSV (výchozí UTF-8, pak cp1250)")
+    parser_import.set_defaults(handler=cmd_import)
+
+    parser_standings = commands.add_parser('standings', help="vypíše průběžnou tabulku ligového souboru")
+    parser_standings.add_argument('league', help="ligový soubor")
+    parser_standings.set_defaults(handler=cmd_standings)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, LeagueFileError) as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
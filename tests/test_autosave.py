@@ -0,0 +1,45 @@
+"""Automatické ukládání ligy na pozadí (liga.autosave)"""
+
+import os
+
+from liga import LeagueEngine
+from liga.autosave import Autosaver, list_backups
+
+
+def test_sessions_keep_separate_backups(tmp_path):
+    saver = Autosaver(str(tmp_path), delay=60)
+    leagues = {}
+    for key in ('prvni', 'druha'):
+        leagues[key] = LeagueEngine(league_name=f"Liga {key}")
+        for i in range(5):
+            leagues[key].add_player(f"{key} {i}")
+            saver.schedule(key, leagues[key].snapshot())
+    saver.close()
+
+    backups = list_backups(str(tmp_path))
+    assert sorted(backup['league_name'] for backup in backups) == ['Liga druha', 'Liga prvni']
+    for key, engine in leagues.items():
+        with open(saver.path(key), 'rb') as f:
+            assert LeagueEngine.from_file(f).to_dict() == engine.to_dict()
+        assert saver.saved_versions[key] == engine.version
+
+
+def save_sessions(saver, keys):
+    for key in keys:
+        saver.schedule(key, LeagueEngine(league_name=f"Liga {key}").snapshot())
+        saver.flush()
+
+
+def test_prune_keeps_backups_of_active_sessions(tmp_path):
+    saver = Autosaver(str(tmp_path), delay=60, keep=2)
+    keys = [f"relace{i}" for i in range(5)]
+    save_sessions(saver, keys)
+    saver.close()
+    assert all(os.path.exists(saver.path(key)) for key in keys)
+
+
+def test_prune_removes_old_inactive_backups(tmp_path):
+    saver = Autosaver(str(tmp_path), delay=60, keep=2, active_window=0)
+    save_sessions(saver, [f"relace{i}" for i in range(5)])
+    saver.close()
+    assert len(list_backups(str(tmp_path))) == 2
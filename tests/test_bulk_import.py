@@ -0,0 +1,66 @@
+"""Hromadný import hracích dnů (liga.bulk_import)"""
+
+import pytest
+
+from liga import LeagueEngine
+from liga.bulk_import import import_results, prepare_results, read_results
+from liga.engine import build_table_results
+
+
+def league_with_mixed_days():
+    engine = LeagueEngine(league_name="Import")
+    for name in 'ABCDEF':
+        engine.add_player(name)
+    engine.record_session('2024-01-01', build_table_results(0, [('A', 150, 0), ('B', 100, 0), ('C', 50, 0)], 100))
+    engine.record_session(
+        '2024-01-08',
+        build_table_results(0, [('A', 130, 0), ('B', 100, 0), ('C', 70, 0)], 100, round_no=1)
+        + build_table_results(1, [('D', 120, 0), ('E', 100, 0), ('F', 80, 0)], 100, round_no=1)
+        + build_table_results(2, [('A', 90, 0), ('D', 110, 0), ('E', 100, 0)], 100, round_no=2)
+        + build_table_results(3, [('B', 100, 0), ('C', 100, 0), ('F', 100, 0)], 100, round_no=2)
+    )
+    return engine
+
+
+def import_file(engine, path):
+    prepared, errors = prepare_results(read_results(str(path)), engine.vklad, engine.history.date_range()[1])
+    assert errors == []
+    return import_results(engine, prepared)
+
+
+def test_league_file_with_mixed_days_round_trips(tmp_path):
+    league = league_with_mixed_days()
+    path = tmp_path / 'liga.json'
+    path.write_text(league.to_json(), encoding='utf-8')
+
+    imported = LeagueEngine(league_name="Import")
+    assert import_file(imported, path) == 2
+    assert imported.to_dict() == league.to_dict()
+
+
+def test_days_older_than_league_are_rejected(tmp_path):
+    source = league_with_mixed_days()
+    path = tmp_path / 'liga.json'
+    path.write_text(source.to_json(), encoding='utf-8')
+
+    target = LeagueEngine()
+    target.add_player('A')
+    target.record_session('2025-06-01', build_table_results(0, [('A', 100, 0)], 100))
+    prepared, errors = prepare_results(read_results(str(path)), 100, target.history.date_range()[1])
+    assert prepared is None
+    assert errors and 'starší než poslední hrací den' in errors[0]
+    with pytest.raises(ValueError):
+        import_results(target, prepare_results(read_results(str(path)), 100)[0])
+    assert [str(d) for d in target.history.dates()] == ['2025-06-01']
+
+
+def test_days_after_league_are_appended(tmp_path):
+    source = league_with_mixed_days()
+    path = tmp_path / 'liga.json'
+    path.write_text(source.to_json(), encoding='utf-8')
+
+    target = LeagueEngine()
+    target.add_player('A')
+    target.record_session('2024-01-01', build_table_results(0, [('A', 100, 0)], 100))
+    assert import_file(target, path) == 2
+    assert [str(d) for d in target.history.dates()] == ['2024-01-01', '2024-01-01', '2024-01-08']
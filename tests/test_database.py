@@ -0,0 +1,64 @@
+"""Sdílená liga v SQLite (liga.database)"""
+
+import pytest
+
+from liga import ConcurrentUpdateError, DatabaseLeague, LeagueDatabase
+from liga.engine import build_table_results
+
+
+@pytest.fixture
+def league(tmp_path):
+    league = DatabaseLeague(LeagueDatabase(str(tmp_path / 'liga.db')))
+    for name in ('A', 'B', 'C'):
+        league.add_player(name)
+    return league
+
+
+def test_player_removed_after_draw_keeps_result(league):
+    league.start_session(['A', 'B', 'C'], 3)
+    league.open_results()
+    league.remove_player('C')
+    league.commit_session(build_table_results(0, [('A', 150, 0), ('B', 100, 0), ('C', 50, 0)], league.vklad))
+
+    assert league.db.scalar('SELECT COUNT(*) FROM results') == 3
+    assert league.to_dict()['players']['C'] == {'celkovy_zisk': -50, 'pocet_dnu': 1, 'aktivni': False}
+
+
+def test_unknown_player_rolls_back_day(league):
+    league.start_session(['A', 'B', 'C'], 3)
+    league.open_results()
+    with pytest.raises(ValueError, match='Neznámý hráč X'):
+        league.commit_session(build_table_results(0, [('A', 150, 0), ('B', 100, 0), ('X', 50, 0)], league.vklad))
+    assert len(league.history) == 0
+    assert league.current_session is not None
+
+
+def test_new_draw_does_not_overwrite_submitted_tables(league):
+    for name in ('D', 'E', 'F'):
+        league.add_player(name)
+    league.start_session(['A', 'B', 'C', 'D', 'E', 'F'], 3)
+    league.open_results()
+    table = league.table_states()[0]
+    league.submit_table(1, [(player, 100, 0) for player in table['players']], table['version'])
+
+    with pytest.raises(ConcurrentUpdateError):
+        league.start_session(['A', 'B', 'C'], 3)
+    version = league.version
+    league.add_player('G')
+    with pytest.raises(ConcurrentUpdateError):
+        league.discard_session(version)
+    assert league.table_states()[0]['results'] is not None
+
+    league.discard_session(league.version)
+    league.start_session(['A', 'B', 'C'], 3)
+    assert len(league.table_states()) == 1
+
+
+def test_undo_refuses_other_day_than_confirmed(league):
+    results = build_table_results(0, [('A', 150, 0), ('B', 100, 0), ('C', 50, 0)], league.vklad)
+    league.record_session('2024-01-01', results)
+    league.record_session('2024-01-08', results)
+    with pytest.raises(ConcurrentUpdateError):
+        league.undo_session(0)
+    league.undo_session(1)
+    assert len(league.history) == 1
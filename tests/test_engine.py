@@ -0,0 +1,72 @@
+"""Liga v paměti (liga.engine)"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from liga import LeagueEngine
+from liga.checkpoints import CHECKPOINT_EVERY
+from liga.engine import build_table_results, league_from_dict
+from liga.synthetic import generate_league
+
+
+def test_player_removed_after_draw_keeps_result():
+    engine = LeagueEngine()
+    for name in ('A', 'B', 'C'):
+        engine.add_player(name)
+    engine.start_session(['A', 'B', 'C'], 3)
+    engine.open_results()
+    engine.remove_player('C')
+    engine.commit_session(build_table_results(0, [('A', 150, 0), ('B', 100, 0), ('C', 50, 0)], engine.vklad))
+
+    assert engine.players == {'A': {'celkovy_zisk': 50, 'pocet_dnu': 1}, 'B': {'celkovy_zisk': 0, 'pocet_dnu': 1}}
+    assert list(engine.standings_frame()['Hráč']) == ['A', 'B']
+    assert engine.to_dict()['players']['C'] == {'celkovy_zisk': -50, 'pocet_dnu': 1, 'aktivni': False}
+    reloaded = LeagueEngine.from_file(io.BytesIO(engine.to_json().encode('utf-8')))
+    assert reloaded.to_dict() == engine.to_dict()
+
+
+def replayed(engine):
+    """Stejná liga přepočítaná celá znovu z ligového souboru"""
+    return LeagueEngine.from_file(io.BytesIO(engine.to_json().encode('utf-8')))
+
+
+def assert_same_league(engine, expected):
+    assert engine.to_dict() == expected.to_dict()
+    pd.testing.assert_frame_equal(engine.standings_frame(), expected.standings_frame())
+    pd.testing.assert_frame_equal(engine.rating_frame(), expected.rating_frame())
+
+
+def test_edit_before_checkpoint_matches_full_replay():
+    engine = LeagueEngine(**league_from_dict(generate_league(12, 2 * CHECKPOINT_EVERY + 10, seed=1)))
+    day = 5
+    results = engine.history.session_frame(day).to_dict('records')
+    # Prohodit výsledky prvních dvou hráčů u prvního stolu
+    first, second = results[0], results[1]
+    for key in ('Na stole', 'Dokup', 'Zisk'):
+        first[key], second[key] = second[key], first[key]
+    engine.edit_session(day, [{key: int(v) if key != 'Hráč' else v for key, v in r.items()} for r in results])
+
+    assert_same_league(engine, replayed(engine))
+
+
+def test_undo_across_checkpoint_matches_full_replay():
+    data = generate_league(12, CHECKPOINT_EVERY + 3, seed=2)
+    engine = LeagueEngine(**league_from_dict(data))
+    for _ in range(5):
+        engine.undo_session()
+
+    # Stejná syntetická liga vygenerovaná jen do dne před vrácenými dny
+    shorter = dict(generate_league(12, CHECKPOINT_EVERY - 2, seed=2), league_name=data['league_name'])
+    expected = LeagueEngine(**league_from_dict(shorter))
+    assert len(engine.history) == CHECKPOINT_EVERY - 2
+    assert_same_league(engine, expected)
+
+
+def test_undo_refuses_other_day_than_confirmed():
+    engine = LeagueEngine(**league_from_dict(generate_league(6, 3)))
+    with pytest.raises(ValueError):
+        engine.undo_session(expected_idx=1)
+    engine.undo_session(expected_idx=2)
+    assert len(engine.history) == 2
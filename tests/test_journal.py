@@ -0,0 +1,58 @@
+"""Obnova deníku změn po pádu (liga.journal)"""
+
+import os
+
+import pytest
+
+from liga import LeagueEngine, JournalInUseError
+from liga.journal import JOURNAL_FILE
+
+
+def player_names(engine):
+    return sorted(engine.players)
+
+
+def test_torn_line_is_cut_before_new_appends(tmp_path):
+    engine = LeagueEngine.open_journal(str(tmp_path))
+    engine.add_player("A")
+    engine.add_player("B")
+    engine.journal.close()
+    # Pád uprostřed zápisu další události
+    with open(tmp_path / JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        f.write('{"type": "add_player", "na')
+
+    recovered = LeagueEngine.open_journal(str(tmp_path))
+    assert player_names(recovered) == ["A", "B"]
+    recovered.add_player("C")
+    recovered.add_player("D")
+    recovered.journal.close()
+
+    reopened = LeagueEngine.open_journal(str(tmp_path))
+    assert player_names(reopened) == ["A", "B", "C", "D"]
+    assert reopened.journal.seq == 4
+
+
+def test_last_line_without_newline_is_kept(tmp_path):
+    engine = LeagueEngine.open_journal(str(tmp_path))
+    engine.add_player("A")
+    engine.journal.close()
+    path = tmp_path / JOURNAL_FILE
+    path.write_bytes(path.read_bytes().rstrip(b'\n'))
+
+    recovered = LeagueEngine.open_journal(str(tmp_path))
+    recovered.add_player("B")
+    recovered.journal.close()
+    assert player_names(LeagueEngine.open_journal(str(tmp_path))) == ["A", "B"]
+
+
+def test_only_latest_instance_writes(tmp_path):
+    first = LeagueEngine.open_journal(str(tmp_path))
+    first.add_player("A")
+    second = LeagueEngine.open_journal(str(tmp_path))
+    assert not first.journal.is_owner
+    with pytest.raises(JournalInUseError):
+        first.add_player("B")
+    second.add_player("C")
+    second.journal.close()
+    assert player_names(LeagueEngine.open_journal(str(tmp_path))) == ["A", "C"]
+    assert os.path.exists(tmp_path / JOURNAL_FILE)
@@ -0,0 +1,62 @@
+"""Načítání ligového souboru (liga.loader)"""
+
+import io
+import json
+
+import pytest
+
+from liga import LeagueEngine, LeagueFileError
+from liga.loader import CHUNK_SIZE
+
+
+def table(players, table_no=1):
+    zisky = [50, 0, -50]
+    return [
+        {'Hráč': name, 'Na stole': 100 + zisk, 'Dokup': 0, 'Zisk': zisk, 'Stůl': table_no}
+        for name, zisk in zip(players, zisky)
+    ]
+
+
+def load(data):
+    return LeagueEngine.from_file(io.BytesIO(json.dumps(data).encode('utf-8')))
+
+
+def test_history_player_missing_from_players_is_inactive():
+    # Starší soubory: odebraný hráč zůstal jen v historii, hrací dny jsou před seznamem hráčů
+    engine = load({
+        'sessions': [{'date': '2020-01-01', 'results': table(['A', 'B', 'C'])}],
+        'players': {'A': {'celkovy_zisk': 50, 'pocet_dnu': 1}, 'B': {'celkovy_zisk': 0, 'pocet_dnu': 1}},
+    })
+    assert sorted(engine.players) == ['A', 'B']
+    assert engine.to_dict()['players']['C'] == {'celkovy_zisk': -50, 'pocet_dnu': 1, 'aktivni': False}
+
+
+@pytest.mark.parametrize('date, results', [
+    ('31.1.2024', table(['A', 'B', 'C'])),
+    ('2020-01-01', table(['A', 'B', 'C'], table_no=40000)),
+])
+def test_invalid_values_raise_league_file_error(date, results):
+    with pytest.raises(LeagueFileError, match='Hrací den 1'):
+        load({'players': {}, 'sessions': [{'date': date, 'results': results}]})
+
+
+@pytest.mark.parametrize('key, value', [('vklad', "sto"), ('vklad', 0), ('league_name', 5)])
+def test_invalid_settings_raise_league_file_error(key, value):
+    with pytest.raises(LeagueFileError, match=key):
+        load({key: value, 'players': {}, 'sessions': []})
+
+
+def test_progress_is_reported_per_chunk():
+    sessions = [{'date': '2020-01-01', 'results': table(['A', 'B', 'C'])} for _ in range(500)]
+    data = json.dumps({'players': {}, 'sessions': sessions}).encode('utf-8')
+    calls = []
+    LeagueEngine.from_file(io.BytesIO(data), progress=lambda done, days: calls.append((done, days)))
+    assert calls[-1] == (len(data), 500)
+    assert len(calls) <= len(data) // CHUNK_SIZE + 2
+
+
+def test_table_reused_in_two_rounds_is_rejected():
+    results = [dict(row, Kolo=1) for row in table(['A', 'B', 'C'])]
+    results += [dict(row, Kolo=2) for row in table(['A', 'B', 'C'])]
+    with pytest.raises(LeagueFileError, match='stůl 1 je uveden ve více kolech'):
+        load({'players': {}, 'sessions': [{'date': '2020-01-01', 'results': results}]})